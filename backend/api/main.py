@@ -1,6 +1,7 @@
 import os
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
 from api.routers import (
     auth_router,
@@ -45,6 +46,16 @@ app.include_router(products_router)
 app.include_router(admin_router)
 
 
+# ── Lifecycle ─────────────────────────────────────────────────────────────────
+
+@app.on_event("shutdown")
+async def close_clients():
+    """Close the pooled async Supabase client of the serving loop."""
+    from src.rag.async_client import close_async_supabase
+
+    await close_async_supabase()
+
+
 # ── Health ────────────────────────────────────────────────────────────────────
 
 @app.get("/", tags=["health"])
@@ -55,3 +66,84 @@ def root():
 @app.get("/health", tags=["health"])
 def health():
     return {"status": "ok"}
+
+
+@app.get("/health/retriever", tags=["health"])
+def retriever_health():
+    """Catalog snapshot and retriever cache counters."""
+    from src.rag.catalog import get_product_catalog
+    from src.rag.phrase_vectors import get_phrase_table
+    from src.rag.response_cache import get_response_cache_stats
+    from src.rag.retriever import get_search_cache_stats
+    from src.utils.util import get_embedding_cache_stats
+
+    phrase_table = get_phrase_table()
+    return {
+        "status": "ok",
+        "catalog": get_product_catalog().stats(),
+        "search_cache": get_search_cache_stats(),
+        "response_cache": get_response_cache_stats(),
+        "embedding_cache": get_embedding_cache_stats(),
+        "phrase_table": phrase_table.stats() if phrase_table else None,
+    }
+
+
+@app.get("/health/llm", tags=["health"])
+def llm_health():
+    """LLM provider layer: circuit breakers, admission control, coalescing, hedging and provider latency.
+
+    ``status`` is "degraded" while any provider's breaker is not closed.
+    """
+    from src.utils.util import (
+        get_llm_admission_stats,
+        get_llm_breaker_stats,
+        get_llm_coalescing_stats,
+        get_llm_hedging_stats,
+    )
+
+    breakers = get_llm_breaker_stats()
+    return {
+        "status": "ok" if all(b["state"] == "closed" for b in breakers.values()) else "degraded",
+        "breakers": breakers,
+        "admission": get_llm_admission_stats(),
+        "coalescing": get_llm_coalescing_stats(),
+        "hedging": get_llm_hedging_stats(),
+    }
+
+
+# ── Metrics ───────────────────────────────────────────────────────────────────
+
+def _register_gauges() -> None:
+    from src.agents.memory_management_agent import get_memory_gate_stats
+    from src.agents.router_agent import get_fast_router_stats
+    from src.rag.response_cache import get_response_cache_stats
+    from src.rag.retriever import get_search_cache_stats
+    from src.utils.metrics import register_gauge_provider
+    from src.utils.util import (
+        get_embedding_cache_stats,
+        get_llm_admission_stats,
+        get_llm_breaker_gauges,
+        get_llm_coalescing_stats,
+        get_llm_hedging_stats,
+    )
+
+    register_gauge_provider("fast_router", get_fast_router_stats)
+    register_gauge_provider("memory_gate", get_memory_gate_stats)
+    register_gauge_provider("search_cache", get_search_cache_stats)
+    register_gauge_provider("response_cache", get_response_cache_stats)
+    register_gauge_provider("embedding_cache", get_embedding_cache_stats)
+    register_gauge_provider("llm_coalescing", get_llm_coalescing_stats)
+    register_gauge_provider("llm_hedging", get_llm_hedging_stats)
+    register_gauge_provider("llm_breaker", get_llm_breaker_gauges)
+    register_gauge_provider("llm_admission", get_llm_admission_stats)
+
+
+_register_gauges()
+
+
+@app.get("/metrics", tags=["health"], response_class=PlainTextResponse)
+def metrics():
+    """Per-node latency histograms, token/retry counters and cache gauges (Prometheus text format)."""
+    from src.utils.metrics import render_prometheus
+
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
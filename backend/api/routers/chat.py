@@ -13,6 +13,9 @@ from src.memory.schemas import UserMemory
 from src.orders import get_active_order
 from src.sessions import get_or_create_session, load_messages, save_messages, append_message, append_messages
 from src.memory.supabase_client import supabase_admin
+from src.utils.metrics import start_request, use_request
+from src.utils.deadline import new_deadline, DEADLINE_REPLY
+from src.utils.util import FINAL_ANSWER_TAG
 
 logger = logging.getLogger(__name__)
 
@@ -26,11 +29,21 @@ _ERROR_FALLBACKS = {
     "Hey there! Sorry, I had a small hiccup. How can I help you today?",
     "Sorry, I had a little trouble with that. Could you try again?",
     "I'm having trouble updating your order right now. Please try again.",
+    DEADLINE_REPLY,
 }
 
 _graph = build_coffee_shop_graph()
 
 
+def _pending_interrupt(snapshot):
+    """Payload of the first interrupted task — memory and router run in parallel,
+    so the interrupted task is not necessarily ``tasks[0]``."""
+    for task in snapshot.tasks or ():
+        if task.interrupts:
+            return task.interrupts[0].value
+    return None
+
+
 @router.post("/upload")
 async def upload_image(file: UploadFile = File(...), current_user: CurrentUser = None):
     """Upload an image to Supabase Storage and return the public URL."""
@@ -83,6 +96,7 @@ async def chat(body: ChatRequest, current_user: CurrentUser):
     import time
     
     start_time = time.time()
+    metrics = start_request("chat")
     user_email = current_user.email
     session_id = body.session_id or str(uuid.uuid4())
 
@@ -113,21 +127,25 @@ async def chat(body: ChatRequest, current_user: CurrentUser):
         messages=messages,
     )
     
+    metrics.record_preload(time.time() - start_time)
     logger.info(f"Pre-graph data loaded in parallel: {(time.time() - start_time)*1000:.2f}ms")
 
     config = {
         "configurable": {
             "thread_id": session_id,
             "user_id": user_email,
-        }
+            # The budget covers the whole turn, pre-graph loads included
+            "deadline": new_deadline("chat", start_time),
+        },
+        "callbacks": [metrics.callback],
     }
 
     try:
         final_state = await _graph.ainvoke(state, config=config)
         
         current_state = await _graph.aget_state(config)
-        if current_state.tasks and current_state.tasks[0].interrupts:
-            payload = current_state.tasks[0].interrupts[0].value
+        payload = _pending_interrupt(current_state)
+        if payload is not None:
             return ChatResponse(session_id=session_id, response=f"__INTERRUPT__:{json.dumps(payload)}")
         
         response = (
@@ -142,10 +160,16 @@ async def chat(body: ChatRequest, current_user: CurrentUser):
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Chatbot error: {str(e)}")
+    finally:
+        metrics.finish()
 
 
 @router.post("/stream")
 async def stream_chat(body: ChatRequest, current_user: CurrentUser):
+    import time
+
+    preload_start = time.time()
+    metrics = start_request("stream")
     user_email = current_user.email
     session_id = body.session_id or str(uuid.uuid4())
 
@@ -177,6 +201,7 @@ async def stream_chat(body: ChatRequest, current_user: CurrentUser):
     
     # Reload for graph context
     messages = load_messages(session_id)
+    metrics.record_preload(time.time() - preload_start)
 
     state = CoffeeAgentState(
         user_input=body.user_input,
@@ -191,16 +216,19 @@ async def stream_chat(body: ChatRequest, current_user: CurrentUser):
         "configurable": {
             "thread_id": session_id,
             "user_id": user_email,
-        }
+            "deadline": new_deadline("stream", preload_start),
+        },
+        "callbacks": [metrics.callback],
     }
 
     async def event_generator():
+        # The generator runs in the response task; rebind this request's metrics there
+        use_request(metrics)
         full_response = ""
         final_state_msg = None
-        answering_agents = {
-            "general_agent"
-        }
-        
+        # Runs of tagged chains that turned out to be tool-calling rounds (details agent)
+        tool_call_runs = set()
+
         try:
             async for event in _graph.astream_events(state, config=config, version="v2"):
                 kind = event["event"]
@@ -215,18 +243,22 @@ async def stream_chat(body: ChatRequest, current_user: CurrentUser):
                         final_state_msg = output.response_message
                 
                 if kind in ("on_chat_model_start", "on_chain_start") and node_name and not node_name.startswith("_") and node_name not in ("graph", "builder"):
-                    yield f"data: {json.dumps({'type': 'status', 'node': node_name})}\n\n"
+                    yield f"data: {json.dumps({'type': 'status', 'node': node_name, 'timings': metrics.breakdown()})}\n\n"
                     
-                elif kind == "on_chat_model_stream" and node_name in answering_agents:
+                elif kind == "on_chat_model_stream" and FINAL_ANSWER_TAG in event.get("tags", ()):
                     chunk = event["data"]["chunk"]
+                    if getattr(chunk, "tool_call_chunks", None):
+                        tool_call_runs.add(event["run_id"])
+                    if event["run_id"] in tool_call_runs:
+                        continue
                     text_chunk = chunk.content if hasattr(chunk, "content") else str(chunk)
                     if text_chunk and isinstance(text_chunk, str):
                         full_response += text_chunk
                         yield f"data: {json.dumps({'type': 'token', 'content': text_chunk})}\n\n"
 
             current_state = await _graph.aget_state(config)
-            if current_state.tasks and current_state.tasks[0].interrupts:
-                payload = current_state.tasks[0].interrupts[0].value
+            payload = _pending_interrupt(current_state)
+            if payload is not None:
                 # SAVE STRUCTURED BUBBLE TO HISTORY
                 # We save with a prefix so /history can identify it as an interrupt type
                 bubble_text = f"[Approval Required] {json.dumps(payload)}"
@@ -237,6 +269,11 @@ async def stream_chat(body: ChatRequest, current_user: CurrentUser):
             if not full_response:
                 full_response = final_state_msg or "Sorry, I had a little trouble with that. Could you try again?"
                 yield f"data: {json.dumps({'type': 'token', 'content': full_response})}\n\n"
+            elif final_state_msg and final_state_msg != full_response:
+                # The streamed text was not the final answer (a run cut off by the
+                # deadline, or text ahead of tool calls) — swap in the real reply
+                full_response = final_state_msg
+                yield f"data: {json.dumps({'type': 'replace', 'content': full_response})}\n\n"
                 
             if full_response not in _ERROR_FALLBACKS and full_response.strip():
                 # SAVE FINAL BOT RESPONSE
@@ -244,16 +281,21 @@ async def stream_chat(body: ChatRequest, current_user: CurrentUser):
             
         except Exception as e:
             yield f"data: {json.dumps({'type': 'error', 'content': str(e)})}\n\n"
+        finally:
+            metrics.finish()
 
     return StreamingResponse(event_generator(), media_type="text/event-stream")
 
 @router.post("/resume", response_model=ChatResponse)
 async def resume_chat(body: ResumeRequest, current_user: CurrentUser):
+    metrics = start_request("resume")
     config = {
         "configurable": {
             "thread_id": body.session_id,
             "user_id": current_user.email,
-        }
+            "deadline": new_deadline("resume"),
+        },
+        "callbacks": [metrics.callback],
     }
     try:
         final_state = await _graph.ainvoke(
@@ -279,4 +321,6 @@ async def resume_chat(body: ResumeRequest, current_user: CurrentUser):
         return ChatResponse(session_id=body.session_id, response=response)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Checkout resume error: {str(e)}")
+    finally:
+        metrics.finish()
 
@@ -0,0 +1 @@
+"""Offline benchmark corpus and fakes for scripts/benchmark_graph.py."""
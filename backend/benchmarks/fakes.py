@@ -0,0 +1,384 @@
+"""Offline stand-ins for the benchmark harness (scripts/benchmark_graph.py).
+
+- ``ScriptedChatModel`` — a real ``BaseChatModel`` (so callbacks, token
+  metadata and ``with_structured_output`` / ``bind_tools`` go through the
+  normal LangChain paths) whose answers come from the corpus turn currently
+  being replayed (``current_turn``).
+- ``InMemorySupabase`` — the subset of the supabase-py query builder and the
+  RPCs the app uses (sessions, profiles, orders, catalog, pgvector match).
+- ``AsyncInMemorySupabase`` — same store behind the ``AsyncSupabaseRest`` API.
+
+The harness installs them by swapping ``ChatGroq`` / ``ChatOpenAI`` and
+``supabase.create_client`` before ``src`` is first imported.
+"""
+
+import asyncio
+import copy
+import itertools
+import json
+import threading
+import time
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.runnables import RunnableLambda
+
+# The corpus turn being replayed in this task (asyncio tasks copy the context,
+# so concurrent conversations never see each other's script)
+current_turn: ContextVar[Optional[Dict[str, Any]]] = ContextVar("bench_current_turn", default=None)
+
+
+# ── Scripted chat model ───────────────────────────────────────────────────────
+
+def _route(turn: Dict[str, Any]) -> str:
+    return turn.get("route", "general_agent")
+
+
+# Structured outputs the corpus doesn't spell out — derived from the turn
+_DEFAULTS: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+    "InputProcessorResponse": lambda t: {
+        "decision": "allowed", "rewritten_input": t.get("user", ""), "response_message": "",
+    },
+    "AgentDecision": lambda t: {"target_agent": _route(t), "response_message": ""},
+    "MemoryIntent": lambda t: {
+        "reasoning": "explicit preference" if t.get("memory") else "no long-term preference",
+        "add_or_update": t.get("memory") or {},
+    },
+    "FrontEndDecision": lambda t: {
+        "decision": "allowed", "rewritten_input": t.get("user", ""), "response_message": "",
+        "target_agent": _route(t), "memory_reasoning": "", "add_or_update": t.get("memory") or {},
+    },
+    "ActionDecision": lambda t: {"action": "create"},
+    "OrderInput": lambda t: {"items": []},
+    "OrderUpdateState": lambda t: {"updates": []},
+}
+
+DEFAULT_REPLY = "Happy to help! ☕"
+
+
+def _approx_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+class ScriptedChatModel(BaseChatModel):
+    """Deterministic chat model driven by ``current_turn``.
+
+    Turn keys it reads: ``llm`` (schema name → structured output), ``tools``
+    (tool calls to emit before the final answer), ``reply`` (plain text).
+    """
+
+    latency_ms: float = 0.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def bind_tools(self, tools, **kwargs):
+        return self.bind(tools=[getattr(t, "name", str(t)) for t in tools], **kwargs)
+
+    def with_structured_output(self, schema, **kwargs):
+        return self.bind(bench_schema=schema.__name__) | RunnableLambda(
+            lambda message: schema.model_validate_json(message.content)
+        )
+
+    def _respond(self, messages, kwargs) -> AIMessage:
+        turn = current_turn.get() or {}
+        schema = kwargs.get("bench_schema")
+        tool_calls = []
+        if schema:
+            payload = (turn.get("llm") or {}).get(schema)
+            if payload is None:
+                payload = _DEFAULTS.get(schema, lambda t: {})(turn)
+            content = json.dumps(payload)
+        elif kwargs.get("tools") and turn.get("tools") and not isinstance(messages[-1], ToolMessage):
+            content = ""
+            tool_calls = [
+                {"name": call["name"], "args": call.get("args", {}), "id": f"call_{i}", "type": "tool_call"}
+                for i, call in enumerate(turn["tools"])
+            ]
+        else:
+            content = turn.get("reply") or DEFAULT_REPLY
+
+        tokens_in = sum(_approx_tokens(str(m.content)) for m in messages)
+        tokens_out = _approx_tokens(content or json.dumps(tool_calls))
+        return AIMessage(
+            content=content,
+            tool_calls=tool_calls,
+            usage_metadata={"input_tokens": tokens_in, "output_tokens": tokens_out, "total_tokens": tokens_in + tokens_out},
+        )
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        return ChatResult(generations=[ChatGeneration(message=self._respond(messages, kwargs))])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        if self.latency_ms:
+            await asyncio.sleep(self.latency_ms / 1000)
+        return ChatResult(generations=[ChatGeneration(message=self._respond(messages, kwargs))])
+
+
+# ── In-memory Supabase ────────────────────────────────────────────────────────
+
+class _Response:
+    def __init__(self, data: Any):
+        self.data = data
+        self.error = None
+        self.count = len(data) if isinstance(data, list) else None
+
+
+class _Query:
+    """Fluent builder mirroring the supabase-py calls used in src/."""
+
+    def __init__(self, store: "InMemorySupabase", table: str):
+        self._store = store
+        self.table = table
+        self.op = "select"
+        self.columns = "*"
+        self.payload: Any = None
+        self.on_conflict = ""
+        self.filters: List[Callable[[Dict[str, Any]], bool]] = []
+        self.order_by: Optional[tuple] = None
+        self.limit_to: Optional[int] = None
+
+    def select(self, columns: str = "*", **_):
+        self.columns = columns
+        return self
+
+    def insert(self, data, **_):
+        self.op, self.payload = "insert", data
+        return self
+
+    def upsert(self, data, on_conflict: str = "", **_):
+        self.op, self.payload, self.on_conflict = "upsert", data, on_conflict
+        return self
+
+    def update(self, data, **_):
+        self.op, self.payload = "update", data
+        return self
+
+    def delete(self, **_):
+        self.op = "delete"
+        return self
+
+    def eq(self, column: str, value):
+        self.filters.append(lambda row: row.get(column) == value)
+        return self
+
+    def neq(self, column: str, value):
+        self.filters.append(lambda row: row.get(column) != value)
+        return self
+
+    def in_(self, column: str, values):
+        allowed = set(values)
+        self.filters.append(lambda row: row.get(column) in allowed)
+        return self
+
+    def order(self, column: str, desc: bool = False, **_):
+        self.order_by = (column, desc)
+        return self
+
+    def limit(self, count: int, **_):
+        self.limit_to = count
+        return self
+
+    def execute(self) -> _Response:
+        return self._store._execute(self)
+
+
+class _Rpc:
+    def __init__(self, store: "InMemorySupabase", fn: str, params: Dict[str, Any]):
+        self._store, self.fn, self.params = store, fn, params
+
+    def execute(self) -> _Response:
+        return _Response(self._store.call_rpc(self.fn, self.params))
+
+
+# Column defaults from supabase_db/schema.sql that the app relies on
+_COLUMN_DEFAULTS: Dict[str, Dict[str, Any]] = {
+    "coffee_shop_sessions": {"messages": []},
+}
+
+
+class InMemorySupabase:
+    """Thread-safe dict-of-tables store with optional per-call latency.
+
+    Rows are deep-copied in and out, like a real round trip would serialise them.
+    """
+
+    def __init__(self, latency_ms: float = 0.0):
+        self.latency_ms = latency_ms
+        self.tables: Dict[str, List[Dict[str, Any]]] = {}
+        self.calls = 0
+        self._ids = itertools.count(1)
+        self._lock = threading.RLock()
+        self._rpcs: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+            "append_chat_messages": self._append_chat_messages,
+            "bump_coffee_catalog_version": self._bump_catalog_version,
+            "match_coffee_products": self._match_products,
+        }
+        self._matrix: Optional[np.ndarray] = None
+
+    # supabase-py entry points
+    def table(self, name: str) -> _Query:
+        return _Query(self, name)
+
+    def rpc(self, fn: str, params: Optional[Dict[str, Any]] = None) -> _Rpc:
+        return _Rpc(self, fn, params or {})
+
+    def _wait(self) -> None:
+        self.calls += 1
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+
+    def _rows(self, table: str) -> List[Dict[str, Any]]:
+        return self.tables.setdefault(table, [])
+
+    def _project(self, row: Dict[str, Any], columns: str) -> Dict[str, Any]:
+        if columns.strip() == "*":
+            return copy.deepcopy(row)
+        return {c: copy.deepcopy(row.get(c)) for c in (c.strip() for c in columns.split(","))}
+
+    def _insert(self, table: str, row: Dict[str, Any]) -> Dict[str, Any]:
+        row = {**copy.deepcopy(_COLUMN_DEFAULTS.get(table, {})), **copy.deepcopy(row)}
+        row.setdefault("id", next(self._ids))
+        self._rows(table).append(row)
+        if table == "coffee_shop_products":
+            self._matrix = None
+        return row
+
+    def _execute(self, query: _Query) -> _Response:
+        self._wait()
+        return self.run_query(query)
+
+    def run_query(self, query: _Query) -> _Response:
+        """Apply ``query`` without the simulated latency."""
+        with self._lock:
+            rows = self._rows(query.table)
+            matched = [r for r in rows if all(f(r) for f in query.filters)]
+
+            if query.op == "select":
+                if query.order_by:
+                    column, desc = query.order_by
+                    matched.sort(key=lambda r: (r.get(column) is None, r.get(column)), reverse=desc)
+                if query.limit_to is not None:
+                    matched = matched[:query.limit_to]
+                return _Response([self._project(r, query.columns) for r in matched])
+
+            if query.op == "delete":
+                gone = {id(r) for r in matched}
+                self.tables[query.table] = [r for r in rows if id(r) not in gone]
+                return _Response(copy.deepcopy(matched))
+
+            if query.op == "update":
+                for row in matched:
+                    row.update(copy.deepcopy(query.payload))
+                return _Response(copy.deepcopy(matched))
+
+            payload = query.payload if isinstance(query.payload, list) else [query.payload]
+            written = []
+            for item in payload:
+                if query.op == "upsert" and query.on_conflict:
+                    keys = [k.strip() for k in query.on_conflict.split(",")]
+                    existing = next((r for r in rows if all(r.get(k) == item.get(k) for k in keys)), None)
+                    if existing is not None:
+                        existing.update(copy.deepcopy(item))
+                        written.append(copy.deepcopy(existing))
+                        continue
+                written.append(copy.deepcopy(self._insert(query.table, item)))
+            return _Response(written)
+
+    def call_rpc(self, fn: str, params: Dict[str, Any]) -> Any:
+        self._wait()
+        return self.run_rpc(fn, params)
+
+    def run_rpc(self, fn: str, params: Dict[str, Any]) -> Any:
+        """Run an RPC handler without the simulated latency."""
+        handler = self._rpcs.get(fn)
+        if handler is None:
+            raise RuntimeError(f"InMemorySupabase: RPC '{fn}' is not implemented")
+        with self._lock:
+            return handler(params)
+
+    # ── RPCs (see supabase_db/schema.sql) ─────────────────────────────────────
+
+    def _append_chat_messages(self, params: Dict[str, Any]) -> None:
+        sessions = self._rows("coffee_shop_sessions")
+        row = next((r for r in sessions if r.get("session_id") == params["p_session_id"]), None)
+        if row is None:
+            row = self._insert("coffee_shop_sessions", {
+                "session_id": params["p_session_id"], "user_email": params["p_user_email"], "messages": [],
+            })
+        row.setdefault("messages", [])
+        row["messages"] = (row["messages"] or []) + copy.deepcopy(params["p_new_messages"])
+        row["last_active"] = datetime.now(timezone.utc).isoformat()
+        return None
+
+    def _bump_catalog_version(self, params: Dict[str, Any]) -> int:
+        meta = self._rows("coffee_shop_catalog_meta")
+        row = next((r for r in meta if r.get("id") == "products"), None)
+        if row is None:
+            row = self._insert("coffee_shop_catalog_meta", {"id": "products", "version": 0})
+        row["version"] += 1
+        return row["version"]
+
+    def _match_products(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        products = [p for p in self._rows("coffee_shop_products") if p.get("embedding") is not None]
+        if not products:
+            return []
+        if self._matrix is None or len(self._matrix) != len(products):
+            matrix = np.asarray([p["embedding"] for p in products], dtype=np.float32)
+            self._matrix = matrix / np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+        query = np.asarray(params["query_embedding"], dtype=np.float32)
+        query /= max(float(np.linalg.norm(query)), 1e-12)
+        scores = self._matrix @ query
+        order = np.argsort(-scores)[: int(params.get("match_count", 5))]
+        threshold = float(params.get("match_threshold", 0.0))
+        return [
+            {**{k: copy.deepcopy(v) for k, v in products[i].items() if k != "embedding"}, "similarity": float(scores[i])}
+            for i in order if scores[i] >= threshold
+        ]
+
+    # ── Seeding ───────────────────────────────────────────────────────────────
+
+    def seed_products(self, products: List[Dict[str, Any]], embeddings) -> None:
+        """Load the catalog the way scripts/seed_products.py does (embeddings over names)."""
+        vectors = embeddings.embed_documents([p["name"] for p in products])
+        with self._lock:
+            self.tables["coffee_shop_products"] = []
+            for product, vector in zip(products, vectors):
+                self._insert("coffee_shop_products", {
+                    **product,
+                    "image_url": f"https://bench.invalid/{product.get('image_path', '')}",
+                    "embedding": list(vector),
+                })
+            self.tables["coffee_shop_catalog_meta"] = [{"id": "products", "version": 1}]
+
+
+class AsyncInMemorySupabase:
+    """``AsyncSupabaseRest`` API over an ``InMemorySupabase`` store."""
+
+    def __init__(self, store: InMemorySupabase):
+        self._store = store
+
+    async def _wait(self) -> None:
+        self._store.calls += 1
+        if self._store.latency_ms:
+            await asyncio.sleep(self._store.latency_ms / 1000)
+
+    async def rpc(self, fn: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        await self._wait()
+        return self._store.run_rpc(fn, params) or []
+
+    async def select_in(self, table: str, column: str, values: List[str], columns: str = "*") -> List[Dict[str, Any]]:
+        await self._wait()
+        return self._store.run_query(self._store.table(table).select(columns).in_(column, values)).data
+
+    async def aclose(self) -> None:
+        return None
+
@@ -0,0 +1,478 @@
+"""
+Offline benchmark of the full chat graph (no Groq / OpenRouter / Supabase / HF)
+
+Builds build_coffee_shop_graph() with scripted fake chat models
+(benchmarks/fakes.py), an in-memory Supabase stand-in and the MemorySaver
+checkpointer, then replays benchmarks/conversations.json the way
+api/routers/chat.py drives the graph (pre-graph loads → graph → save, and
+/resume for HITL interrupts). Reports turns/sec, p50/p95/p99 per node and
+allocations (tracemalloc):
+
+    python scripts/benchmark_graph.py --iterations 20 --concurrency 4
+    python scripts/benchmark_graph.py --llm-latency-ms 300 --db-latency-ms 20
+    python scripts/benchmark_graph.py --output bench.json          # save a baseline
+    python scripts/benchmark_graph.py --baseline bench.json        # exit 1 on regression
+
+LLM and DB latency default to 0, so the numbers are graph + agent overhead.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+import tracemalloc
+import uuid
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+BACKEND = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(BACKEND)
+
+DEFAULT_CORPUS = os.path.join(BACKEND, "benchmarks", "conversations.json")
+BENCH_USER_DOMAIN = "bench.invalid"
+
+# Everything network-bound is replaced; these only let the real modules import.
+# Set before any src import — settings and module-level clients read them once.
+_OFFLINE_ENV = {
+    "EMBEDDING_BACKEND": "hashing",
+    "EMBEDDING_CACHE_PATH": "",
+    "EMBEDDING_PHRASE_TABLE_PATH": "",
+    "MEM0_API_KEY": "",
+    "ROUTER_FAST_PATH_SHADOW_RATE": "0",
+    "MEMORY_GATE_SHADOW_RATE": "0",
+    "LLM_ADMISSION_ENABLED": "false",  # scripted providers have no rate limits to protect
+}
+_DUMMY_CREDENTIALS = {
+    "SUPABASE_URL": f"https://{BENCH_USER_DOMAIN}",
+    "SUPABASE_KEY": "bench.offline.key",
+    "SUPABASE_SERVICE_KEY": "bench.offline.key",
+    "GROQ_API_KEY": "bench-offline",
+    "HF_API_KEY": "bench-offline",
+}
+
+
+def _bootstrap(args):
+    """Import the app with fakes installed. Returns (graph, store, chat-flow helpers)."""
+    os.environ.update(_OFFLINE_ENV)
+    os.environ["FRONT_END_MODE"] = args.front_end
+    os.environ["RETRIEVER_SEARCH_BACKEND"] = args.search_backend
+    # Replays repeat the same questions, so a warm response cache would hide the details agent
+    if not args.response_cache:
+        os.environ["RESPONSE_CACHE_SIZE"] = "0"
+    for key, value in _DUMMY_CREDENTIALS.items():
+        os.environ.setdefault(key, value)
+
+    import importlib
+    import langchain_groq
+    import langchain_openai
+    import supabase
+    from benchmarks.fakes import AsyncInMemorySupabase, InMemorySupabase, ScriptedChatModel
+
+    # src/__init__ pulls in the whole graph and every agent binds its LLM and
+    # Supabase client at import time, so swap the constructors before the first
+    # src import: LLMPool then builds scripted models and supabase_client the store.
+    store = InMemorySupabase(latency_ms=args.db_latency_ms)
+
+    class ScriptedProvider(ScriptedChatModel):
+        """Stands in for ChatGroq / ChatOpenAI (their constructor kwargs are ignored).
+
+        A class rather than a factory, so LLMPool's provider layer (single-flight,
+        circuit breaker) wraps it exactly like the real providers.
+        """
+        latency_ms: float = args.llm_latency_ms
+
+    langchain_groq.ChatGroq = langchain_openai.ChatOpenAI = ScriptedProvider
+    supabase.create_client = lambda *_args, **_kwargs: store
+
+    from langgraph.checkpoint.memory import MemorySaver
+    import src.graph.graph as graph_module
+    import src.rag.retriever as retriever
+    from src.utils.util import get_embedding_model
+    from src.sessions import get_or_create_session, load_messages, save_messages, append_messages
+    from src.memory.memory_manager import get_user_memory
+    from src.orders import get_active_order
+
+    async_store = AsyncInMemorySupabase(store)
+    retriever.get_async_supabase = lambda: async_store
+    with open(os.path.join(BACKEND, "data", "products_data", "products.jsonl")) as f:
+        products = [json.loads(line) for line in f if line.strip()]
+    store.seed_products(products, get_embedding_model())
+
+    async def _no_receipt(*_args, **_kwargs):
+        return None
+
+    # src.agents re-exports the agent functions under the package names, so go through importlib
+    importlib.import_module("src.agents.order_management_agent.agent").send_order_receipt = _no_receipt
+
+    graph_module._checkpointer = MemorySaver()
+    graph = graph_module.build_coffee_shop_graph()
+    flow = {
+        "get_or_create_session": get_or_create_session,
+        "load_messages": load_messages,
+        "save_messages": save_messages,
+        "append_messages": append_messages,
+        "get_user_memory": get_user_memory,
+        "get_active_order": get_active_order,
+    }
+    return graph, store, flow
+
+
+# ── Replay ────────────────────────────────────────────────────────────────────
+
+def _pending_interrupt(snapshot):
+    """Same lookup as api/routers/chat.py — any task may hold the interrupt."""
+    for task in snapshot.tasks or ():
+        if task.interrupts:
+            return task.interrupts[0].value
+    return None
+
+
+def _response_text(final_state) -> str:
+    if isinstance(final_state, dict):
+        return final_state.get("response_message") or ""
+    return getattr(final_state, "response_message", "") or ""
+
+
+class Replayer:
+    """Drives the graph like the /chat and /resume endpoints and records each request."""
+
+    def __init__(self, graph, flow):
+        self.graph = graph
+        self.flow = flow
+        self.records: List[Dict[str, Any]] = []
+        self.failures: List[str] = []
+
+    async def _chat(self, session_id: str, user: str, turn: Dict[str, Any]):
+        from src.graph.state import CoffeeAgentState
+        from src.utils.metrics import start_request
+
+        metrics = start_request("bench_chat")
+        started = time.perf_counter()
+        _, user_memory, (order, final_price), messages = await asyncio.gather(
+            asyncio.to_thread(self.flow["get_or_create_session"], session_id, user),
+            asyncio.to_thread(self.flow["get_user_memory"], user),
+            asyncio.to_thread(self.flow["get_active_order"], user),
+            asyncio.to_thread(self.flow["load_messages"], session_id),
+        )
+        metrics.record_preload(time.perf_counter() - started)
+
+        state = CoffeeAgentState(
+            user_input=turn["user"],
+            user_memory=user_memory or CoffeeAgentState().user_memory,
+            order=order or [],
+            final_price=final_price or 0.0,
+            messages=messages,
+        )
+        config = self._config(session_id, user, metrics, "chat")
+        final_state = await self.graph.ainvoke(state, config=config)
+        payload = _pending_interrupt(await self.graph.aget_state(config))
+        response = _response_text(final_state)
+        if payload is None and response:
+            self.flow["save_messages"](session_id, user, turn["user"], response)
+        return metrics.finish(), payload, response
+
+    async def _resume(self, session_id: str, user: str, value: str):
+        from langgraph.types import Command
+        from src.utils.metrics import start_request
+
+        metrics = start_request("bench_resume")
+        final_state = await self.graph.ainvoke(Command(resume=value), config=self._config(session_id, user, metrics, "resume"))
+        response = _response_text(final_state)
+        self.flow["append_messages"](session_id, user, [
+            {"role": "user", "content": value},
+            {"role": "bot", "content": response},
+        ])
+        return metrics.finish(), response
+
+    @staticmethod
+    def _config(session_id: str, user: str, metrics, endpoint: str) -> Dict[str, Any]:
+        from src.utils.deadline import new_deadline
+
+        return {
+            "configurable": {"thread_id": session_id, "user_id": user, "deadline": new_deadline(endpoint)},
+            "callbacks": [metrics.callback],
+        }
+
+    def _record(self, conversation: str, kind: str, timings: Dict[str, Any]) -> None:
+        self.records.append({"conversation": conversation, "kind": kind, **timings})
+
+    def _check(self, where: str, expect: Dict[str, Any], nodes: Dict[str, Any], interrupt, response: str) -> None:
+        if "agent" in expect and expect["agent"] not in nodes:
+            self.failures.append(f"{where}: expected {expect['agent']}, ran {sorted(nodes)}")
+        if "interrupt" in expect and (interrupt or {}).get("action") != expect["interrupt"]:
+            self.failures.append(f"{where}: expected interrupt {expect['interrupt']}, got {interrupt}")
+        if "contains" in expect and expect["contains"] not in response:
+            self.failures.append(f"{where}: response lacks {expect['contains']!r}: {response[:80]!r}")
+
+    async def conversation(self, conversation: Dict[str, Any], run: int) -> None:
+        from benchmarks.fakes import current_turn
+
+        name = conversation["name"]
+        session_id = str(uuid.uuid4())
+        user = f"{name}-{run}@{BENCH_USER_DOMAIN}"
+        for i, turn in enumerate(conversation["turns"]):
+            current_turn.set(turn)
+            where = f"{name}[{i}]"
+            expect = turn.get("expect") or {}
+            try:
+                timings, payload, response = await self._chat(session_id, user, turn)
+                self._record(name, "chat", timings)
+                if payload is not None and turn.get("resume"):
+                    resumed, response = await self._resume(session_id, user, turn["resume"])
+                    self._record(name, "resume", resumed)
+                    timings["nodes"] = {**timings["nodes"], **resumed["nodes"]}
+                self._check(where, expect, timings["nodes"], payload, response)
+            except Exception as e:
+                self.failures.append(f"{where}: {type(e).__name__}: {e}")
+
+
+async def _replay(replayer: Replayer, conversations, iterations: int, concurrency: int, offset: int = 0) -> float:
+    """Replay every conversation ``iterations`` times; returns wall seconds."""
+    gate = asyncio.Semaphore(concurrency)
+
+    async def _one(conversation, run):
+        async with gate:
+            await replayer.conversation(conversation, run)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        _one(conversation, offset + run)
+        for run in range(iterations) for conversation in conversations
+    ))
+    return time.perf_counter() - started
+
+
+# ── Statistics ────────────────────────────────────────────────────────────────
+
+def _percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(q / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+
+def _summary(values: List[float]) -> Dict[str, float]:
+    if not values:
+        return {"count": 0}
+    return {
+        "count": len(values),
+        "mean": round(sum(values) / len(values), 3),
+        "p50": round(_percentile(values, 50), 3),
+        "p95": round(_percentile(values, 95), 3),
+        "p99": round(_percentile(values, 99), 3),
+        "max": round(max(values), 3),
+    }
+
+
+def summarize(records: List[Dict[str, Any]], wall_seconds: float) -> Dict[str, Any]:
+    per_node: Dict[str, Dict[str, List[float]]] = defaultdict(lambda: defaultdict(list))
+    for record in records:
+        for node, entry in record["nodes"].items():
+            per_node[node]["wall_ms"].append(entry["wall_ms"])
+            per_node[node]["llm_calls"].append(entry["llm_calls"])
+            per_node[node]["tool_calls"].append(entry["tool_calls"])
+
+    return {
+        "requests": len(records),
+        "wall_seconds": round(wall_seconds, 3),
+        "turns_per_second": round(len(records) / wall_seconds, 2) if wall_seconds else 0.0,
+        "request_ms": _summary([r["elapsed_ms"] for r in records]),
+        "preload_ms": _summary([r["preload_ms"] for r in records if r["kind"] == "chat"]),
+        "nodes": {
+            node: {
+                **_summary(series["wall_ms"]),
+                "llm_calls_per_run": round(sum(series["llm_calls"]) / len(series["llm_calls"]), 2),
+                "tool_calls_per_run": round(sum(series["tool_calls"]) / len(series["tool_calls"]), 2),
+            }
+            for node, series in sorted(per_node.items())
+        },
+    }
+
+
+def _short_path(filename: str) -> str:
+    if filename.startswith(BACKEND):
+        return os.path.relpath(filename, BACKEND)
+    return filename.split("site-packages/")[-1]
+
+
+async def measure_allocations(replayer: Replayer, conversations, offset: int, top: int = 10) -> Dict[str, Any]:
+    """One sequential pass under tracemalloc: per-request peak and retained growth."""
+    from benchmarks.fakes import current_turn
+
+    peaks: List[float] = []
+    tracemalloc.start()
+    baseline = tracemalloc.take_snapshot()
+    try:
+        for i, conversation in enumerate(conversations):
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            await replayer.conversation(conversation, offset + i)
+            _, peak = tracemalloc.get_traced_memory()
+            turns = max(1, len(conversation["turns"]))
+            peaks.append((peak - before) / turns / 1024)
+        current_turn.set(None)
+        after = tracemalloc.take_snapshot()
+        retained_kib = tracemalloc.get_traced_memory()[0] / 1024
+    finally:
+        tracemalloc.stop()
+
+    filters = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, "<frozen importlib._bootstrap*>")]
+    growth = after.filter_traces(filters).compare_to(baseline.filter_traces(filters), "lineno")
+    return {
+        "peak_kib_per_turn": _summary(peaks),
+        "traced_kib_after_pass": round(retained_kib, 1),
+        "top_growth": [
+            {"site": f"{_short_path(stat.traceback[0].filename)}:{stat.traceback[0].lineno}",
+             "kib": round(stat.size_diff / 1024, 1), "blocks": stat.count_diff}
+            for stat in growth[:top]
+        ],
+    }
+
+
+# ── Regression check ──────────────────────────────────────────────────────────
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float, floor_ms: float) -> List[str]:
+    """Regressions beyond ``tolerance`` (relative) and ``floor_ms`` (absolute noise floor)."""
+    problems = []
+
+    def _slower(label: str, now: Optional[float], before: Optional[float]) -> None:
+        if now is None or before is None:
+            return
+        if now > before * (1 + tolerance) and now - before > floor_ms:
+            problems.append(f"{label}: p95 {before:.2f}ms -> {now:.2f}ms")
+
+    cur, base = current["timing"], baseline["timing"]
+    if cur["turns_per_second"] < base["turns_per_second"] * (1 - tolerance):
+        problems.append(f"throughput: {base['turns_per_second']} -> {cur['turns_per_second']} turns/s")
+    _slower("request", cur["request_ms"].get("p95"), base["request_ms"].get("p95"))
+    for node, stats in cur["nodes"].items():
+        _slower(f"node {node}", stats.get("p95"), base["nodes"].get(node, {}).get("p95"))
+    return problems
+
+
+# ── Report ────────────────────────────────────────────────────────────────────
+
+def _print_report(result: Dict[str, Any]) -> None:
+    timing = result["timing"]
+    print(f"\n📊 {timing['requests']} requests in {timing['wall_seconds']}s → {timing['turns_per_second']} turns/s")
+    req = timing["request_ms"]
+    print(f"   request   p50 {req['p50']:>8.2f}ms  p95 {req['p95']:>8.2f}ms  p99 {req['p99']:>8.2f}ms")
+    pre = timing["preload_ms"]
+    if pre.get("count"):
+        print(f"   preload   p50 {pre['p50']:>8.2f}ms  p95 {pre['p95']:>8.2f}ms  p99 {pre['p99']:>8.2f}ms")
+
+    print(f"\n{'node':<34}{'runs':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'llm/run':>9}{'tools/run':>10}")
+    for node, stats in timing["nodes"].items():
+        print(
+            f"{node:<34}{stats['count']:>6}{stats['p50']:>10.2f}{stats['p95']:>10.2f}{stats['p99']:>10.2f}"
+            f"{stats['llm_calls_per_run']:>9}{stats['tool_calls_per_run']:>10}"
+        )
+
+    shared = result.get("llm_coalescing")
+    if shared and shared["coalesced"]:
+        total = shared["leaders"] + shared["coalesced"]
+        print(f"\n🔀 LLM single-flight: {shared['coalesced']} of {total} calls shared an in-flight request")
+
+    alloc = result.get("allocations")
+    if alloc:
+        peak = alloc["peak_kib_per_turn"]
+        print(f"\n🧠 Allocation peak per turn: p50 {peak['p50']:.1f} KiB, max {peak['max']:.1f} KiB "
+              f"(traced after pass: {alloc['traced_kib_after_pass']} KiB)")
+        for site in alloc["top_growth"]:
+            print(f"   {site['kib']:>9.1f} KiB  {site['blocks']:>6} blocks  {site['site']}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Offline benchmark of the coffee shop chat graph")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS, help="conversation corpus (JSON)")
+    parser.add_argument("--iterations", type=int, default=10, help="measured replays of the whole corpus")
+    parser.add_argument("--warmup", type=int, default=1, help="unmeasured replays first (imports, caches, catalog)")
+    parser.add_argument("--concurrency", type=int, default=1, help="conversations in flight at once")
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0, help="simulated latency per LLM call")
+    parser.add_argument("--db-latency-ms", type=float, default=0.0, help="simulated latency per Supabase call")
+    parser.add_argument("--front-end", choices=["staged", "fused", "ab"], default="staged", help="FRONT_END_MODE")
+    parser.add_argument("--search-backend", choices=["pgvector", "local"], default="pgvector", help="RETRIEVER_SEARCH_BACKEND")
+    parser.add_argument("--response-cache", action="store_true", help="keep the cross-user response cache on (details turns then hit it)")
+    parser.add_argument("--no-alloc", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--output", help="write the results as JSON (use as a later --baseline)")
+    parser.add_argument("--baseline", help="results JSON to compare against; exit 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown vs. baseline")
+    parser.add_argument("--floor-ms", type=float, default=1.0, help="ignore p95 differences smaller than this")
+    parser.add_argument("--verbose", action="store_true", help="keep the app's INFO logging")
+    return parser.parse_args(argv)
+
+
+async def run(args) -> int:
+    graph, store, flow = _bootstrap(args)
+    with open(args.corpus) as f:
+        conversations = json.load(f)["conversations"]
+    turns = sum(len(c["turns"]) for c in conversations)
+    print(f"☕ Replaying {len(conversations)} conversations ({turns} turns) × {args.iterations} "
+          f"| concurrency={args.concurrency} front_end={args.front_end} "
+          f"llm={args.llm_latency_ms}ms db={args.db_latency_ms}ms")
+
+    if args.warmup:
+        await _replay(Replayer(graph, flow), conversations, args.warmup, args.concurrency, offset=10_000)
+
+    from src.utils.util import get_llm_coalescing_stats
+
+    replayer = Replayer(graph, flow)
+    before = get_llm_coalescing_stats()
+    wall = await _replay(replayer, conversations, args.iterations, args.concurrency)
+    after = get_llm_coalescing_stats()
+    result = {
+        "config": {k: v for k, v in vars(args).items() if k not in ("output", "baseline", "verbose")},
+        "timing": summarize(replayer.records, wall),
+        "supabase_calls": store.calls,
+        "llm_coalescing": {k: after[k] - before[k] for k in ("leaders", "coalesced")},
+        "failures": replayer.failures,
+    }
+    if not args.no_alloc:
+        result["allocations"] = await measure_allocations(Replayer(graph, flow), conversations, offset=20_000)
+
+    _print_report(result)
+    status = 0
+    if replayer.failures:
+        print(f"\n⚠️  {len(replayer.failures)} expectation failures:")
+        for failure in replayer.failures[:20]:
+            print(f"   - {failure}")
+        status = 1
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"\n💾 Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        differing = [
+            k for k in ("concurrency", "llm_latency_ms", "db_latency_ms", "front_end", "search_backend")
+            if baseline.get("config", {}).get(k) != result["config"].get(k)
+        ]
+        if differing:
+            print(f"\n⚠️  Baseline was recorded with different settings: {', '.join(differing)}")
+        problems = compare(result, baseline, args.tolerance, args.floor_ms)
+        if problems:
+            print(f"\n❌ Regressions vs {args.baseline}:")
+            for problem in problems:
+                print(f"   - {problem}")
+            status = 1
+        else:
+            print(f"\n✅ No regressions vs {args.baseline} (tolerance {args.tolerance:.0%})")
+    return status
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+    if not args.verbose:
+        logging.disable(logging.INFO)
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
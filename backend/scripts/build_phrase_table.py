@@ -0,0 +1,59 @@
+"""
+Precompute embeddings for the catalog vocabulary (.npz phrase table)
+
+Product names, categories, ingredients and their word n-grams are embedded
+once so short menu queries ("oat milk", "bakery") skip the live embedding
+call. Run after every catalog change (seed_products.py does it for you):
+    python scripts/build_phrase_table.py [output_path]
+
+Then set:
+    EMBEDDING_PHRASE_TABLE_PATH=artifacts/phrase_vectors.npz
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from supabase import create_client
+from src.config import Config
+from src.rag.phrase_vectors import PhraseVectorTable, catalog_vocabulary
+
+DEFAULT_OUTPUT = os.path.join(os.path.dirname(__file__), "../artifacts/phrase_vectors.npz")
+
+
+def build(products, embeddings, model: str = None, output_path: str = None) -> PhraseVectorTable:
+    """Embed the vocabulary of ``products`` and write the table to disk."""
+    output_path = output_path or Config.EMBEDDING_PHRASE_TABLE_PATH or DEFAULT_OUTPUT
+    phrases = catalog_vocabulary(products)
+    print(f"🧮 Embedding {len(phrases)} catalog phrases...")
+    table = PhraseVectorTable.build(phrases, embeddings, model=model or Config.EMBEDDING_MODEL)
+    table.save(output_path)
+    print(f"✅ Phrase table written to {output_path} ({len(table)} phrases)")
+    return table
+
+
+def main(output_path: str = None):
+    from src.utils.util import get_embedding_model
+
+    supabase = create_client(
+        os.getenv("SUPABASE_URL"),
+        os.getenv("SUPABASE_SERVICE_KEY"),
+    )
+
+    print("📥 Fetching products from Supabase...")
+    res = supabase.table("coffee_shop_products").select("name, category, ingredients").execute()
+    products = res.data or []
+    if not products:
+        print("⚠️  No products found — run scripts/seed_products.py first.")
+        return
+
+    embeddings = get_embedding_model()
+    build(products, embeddings, model=embeddings.model_name, output_path=output_path)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else None)
@@ -0,0 +1,283 @@
+"""
+Offline self-check of the LLM provider layer (no Groq / OpenRouter / Supabase)
+
+Runs fake providers through the classes LLMPool builds (single-flight,
+admission, circuit breaker) and through HedgedChatModel, and checks the
+cancellation guarantees the layer relies on:
+
+- the losing provider call of a hedge is really cancelled — its
+  ``_agenerate`` / ``_astream`` sees CancelledError — for plain and streamed calls
+- a call cut off by the request deadline does not keep running
+- identical concurrent streamed calls reach the provider once, every caller
+  gets every chunk, and a caller leaving early does not cut off the others
+- the circuit breaker does not count a quickly cancelled call, gives a
+  cancelled half-open probe its slot back, and counts a cancelled call that
+  already ran slow as slow
+- a provider over its rate budget hands the call to its fallback at once,
+  and only queues for the budget when there is no other provider
+
+    python scripts/check_llm_layer.py          # exit 1 if any check fails
+"""
+
+import asyncio
+import os
+import sys
+import time
+from typing import List
+
+BACKEND = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(BACKEND)
+
+from scripts.benchmark_graph import _DUMMY_CREDENTIALS, _OFFLINE_ENV  # noqa: E402
+
+
+def _bootstrap():
+    """Import the LLM layer offline (src/__init__ builds the graph and its clients)."""
+    os.environ.update(_OFFLINE_ENV)
+    for key, value in _DUMMY_CREDENTIALS.items():
+        os.environ.setdefault(key, value)
+
+    import supabase
+    from benchmarks.fakes import InMemorySupabase
+
+    store = InMemorySupabase()
+    supabase.create_client = lambda *_args, **_kwargs: store
+
+    from src.utils import util
+    return util
+
+
+util = _bootstrap()
+
+from langchain_core.language_models import BaseChatModel  # noqa: E402
+from langchain_core.messages import AIMessage, AIMessageChunk  # noqa: E402
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult  # noqa: E402
+
+from src.utils.deadline import CONFIG_KEY, DeadlineExceeded, bounded  # noqa: E402
+
+
+class FakeProvider(BaseChatModel):
+    """Answers after ``delay`` seconds and records whether it finished or was cancelled."""
+
+    reply: str = "ok"
+    delay: float = 0.0
+    events: List[str] = []
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-provider"
+
+    async def _wait(self) -> None:
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.events.append("cancelled")
+            raise
+        self.events.append("completed")
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        raise NotImplementedError
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        await self._wait()
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self.reply))])
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        await self._wait()
+        for token in self.reply.split():
+            yield ChatGenerationChunk(message=AIMessageChunk(content=token))
+
+
+def _provider(name: str, **kwargs) -> FakeProvider:
+    return util._provider_class(FakeProvider, name)(events=[], **kwargs)
+
+
+def _drained(name: str, requests_per_minute: int = 1):
+    """A request budget for ``name`` that was just used up."""
+    admission = util._provider_admission[name] = util.ProviderAdmission(name, requests_per_minute=requests_per_minute)
+    admission.requests.take(requests_per_minute)
+    return admission
+
+
+def _hedged(tag: str):
+    slow = _provider(f"{tag}_slow", reply="slow", delay=2.0)
+    fast = _provider(f"{tag}_fast", reply="fast", delay=0.05)
+    model = util.HedgedChatModel(primary=slow, secondary=fast, primary_name=f"{tag}_slow", secondary_name=f"{tag}_fast")
+    return model, slow
+
+
+async def _settle() -> None:
+    await asyncio.sleep(0.1)  # let cancellations reach the provider tasks
+
+
+async def check_hedge_loser_cancelled() -> List[str]:
+    model, slow = _hedged("hedge")
+    reply = await model.ainvoke("hi")
+    await _settle()
+    problems = []
+    if reply.content != "fast":
+        problems.append(f"hedge answered '{reply.content}', expected the fast provider")
+    if slow.events != ["cancelled"]:
+        problems.append(f"losing provider saw {slow.events}, expected ['cancelled']")
+    if util.get_llm_coalescing_stats()["in_flight"]:
+        problems.append("single-flight still holds the losing call")
+    if util.get_circuit_breaker("hedge_slow").stats()["calls"]:
+        problems.append("breaker counted the cancelled loser as a finished call")
+    return problems
+
+
+async def check_streamed_hedge_loser_cancelled() -> List[str]:
+    model, slow = _hedged("stream")
+    tokens = [chunk.content async for chunk in model.astream("hi")]
+    await _settle()
+    problems = []
+    if "".join(tokens) != "fast":
+        problems.append(f"streamed hedge answered {tokens}, expected the fast provider")
+    if slow.events != ["cancelled"]:
+        problems.append(f"losing stream saw {slow.events}, expected ['cancelled']")
+    return problems
+
+
+async def check_streams_coalesced() -> List[str]:
+    model = _provider("coalesce", reply="one two three", delay=0.1)
+
+    async def collect(leave_after: int = None) -> str:
+        tokens = []
+        async for chunk in model.astream("hi"):
+            tokens.append(chunk.content)
+            if leave_after is not None and len(tokens) == leave_after:
+                break
+        return "".join(tokens)
+
+    outputs = await asyncio.gather(collect(), collect(), collect(leave_after=1))
+    await _settle()
+    problems = []
+    if outputs != ["onetwothree", "onetwothree", "one"]:
+        problems.append(f"callers got {outputs}")
+    if model.events != ["completed"]:
+        problems.append(f"provider saw {model.events}, expected one completed call")
+    if util.get_llm_coalescing_stats()["in_flight"]:
+        problems.append("single-flight still holds the stream")
+    return problems
+
+
+async def _cut_off(model) -> List[str]:
+    """Invoke ``model`` under a deadline that leaves it 0.2s (after the 0.5s reserve)."""
+    config = {"configurable": {CONFIG_KEY: time.time() + 0.7}}
+    try:
+        await bounded(model.ainvoke("hi"), config)
+        return ["call finished despite the deadline"]
+    except DeadlineExceeded:
+        pass
+    await _settle()
+    return []
+
+
+async def check_deadline_cancels_call() -> List[str]:
+    model = _provider("deadline", delay=2.0)
+    problems = await _cut_off(model)
+    if model.events != ["cancelled"]:
+        problems.append(f"provider saw {model.events} after the deadline, expected ['cancelled']")
+    return problems
+
+
+async def check_cancelled_probe_released() -> List[str]:
+    model = _provider("probe", delay=2.0)
+    breaker = util.get_circuit_breaker("probe")
+    breaker.state = breaker.HALF_OPEN
+    problems = await _cut_off(model)
+    stats = breaker.stats()
+    if stats["calls"]:
+        problems.append("breaker counted a cancelled probe that was not slow yet")
+    if not breaker.available():
+        problems.append(f"breaker is {stats['state']} with no probe slot after the probe was cancelled")
+    return problems
+
+
+async def check_slow_cancelled_call_counted() -> List[str]:
+    model = _provider("slow_cancel", delay=2.0)
+    slow_after = util.Config.LLM_BREAKER_SLOW_CALL_SECONDS
+    util.Config.LLM_BREAKER_SLOW_CALL_SECONDS = 0.1
+    try:
+        problems = await _cut_off(model)
+    finally:
+        util.Config.LLM_BREAKER_SLOW_CALL_SECONDS = slow_after
+    stats = util.get_circuit_breaker("slow_cancel").stats()
+    if stats["calls"] != 1 or stats["window_slow_rate"] != 1.0:
+        problems.append(f"breaker saw {stats['calls']} calls at slow rate {stats['window_slow_rate']}, expected 1 slow call")
+    return problems
+
+
+async def check_over_budget_fails_over() -> List[str]:
+    primary = _provider("budget_primary", reply="primary", admission_failover=True)
+    fallback = _provider("budget_fallback", reply="fallback")
+    admission = _drained("budget_primary")
+    started = time.monotonic()
+    reply = await primary.with_fallbacks([fallback]).ainvoke("hi")
+    took = time.monotonic() - started
+    problems = []
+    if reply.content != "fallback":
+        problems.append(f"answered '{reply.content}', expected the fallback provider")
+    if took > 1.0:
+        problems.append(f"took {took:.2f}s to fail over")
+    if admission.stats()["answer_failed_over"] != 1:
+        problems.append("the answer call was not counted as failed over")
+    return problems
+
+
+async def check_over_budget_queues_without_fallback() -> List[str]:
+    model = _provider("budget_single", reply="single")
+    admission = _drained("budget_single", requests_per_minute=120)  # next request in 0.5s
+    problems = []
+    started = time.monotonic()
+    try:
+        reply = await model.ainvoke("hi")
+    except util.LLMOverloaded as e:
+        return [f"shed instead of queueing: {e}"]
+    took = time.monotonic() - started
+    if reply.content != "single" or took < 0.4:
+        problems.append(f"answered '{reply.content}' after {took:.2f}s, expected to queue ~0.5s for the budget")
+    if admission.stats()["answer_admitted"] != 1:
+        problems.append("the answer call was not admitted")
+    return problems
+
+
+CHECKS = [
+    ("hedge loser is cancelled", check_hedge_loser_cancelled),
+    ("streamed hedge loser is cancelled", check_streamed_hedge_loser_cancelled),
+    ("deadline cancels the provider call", check_deadline_cancels_call),
+    ("identical streams are coalesced", check_streams_coalesced),
+    ("cancelled half-open probe gives its slot back", check_cancelled_probe_released),
+    ("cancelled slow call counts as slow", check_slow_cancelled_call_counted),
+    ("over budget, a call fails over to the fallback", check_over_budget_fails_over),
+    ("over budget with no fallback, a call queues", check_over_budget_queues_without_fallback),
+]
+
+
+async def run() -> int:
+    # Hedge right away and on every call
+    util.Config.LLM_HEDGE_INITIAL_DELAY_SECONDS = 0.1
+    util._hedge_budget.max_rate = 1.0
+    # Budgets apply only to the providers a check drains
+    util.Config.LLM_ADMISSION_ENABLED = True
+
+    failed = 0
+    for label, check in CHECKS:
+        problems = await check()
+        if problems:
+            failed += 1
+            print(f"❌ {label}")
+            for problem in problems:
+                print(f"   - {problem}")
+        else:
+            print(f"✅ {label}")
+    print(f"\n{len(CHECKS) - failed}/{len(CHECKS)} checks passed")
+    return 1 if failed else 0
+
+
+def main() -> int:
+    return asyncio.run(run())
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,54 @@
+"""
+Export product embeddings from Supabase into a local vector snapshot (.npz)
+
+The snapshot feeds the in-process search backend without touching Supabase
+at startup. Run after seeding:
+    python scripts/export_vector_snapshot.py [output_path]
+
+Then set:
+    RETRIEVER_SEARCH_BACKEND=local
+    RETRIEVER_VECTOR_SNAPSHOT_PATH=artifacts/product_vectors.npz
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from supabase import create_client
+from src.rag.catalog import fetch_catalog_version
+from src.rag.vector_index import LocalVectorIndex
+
+DEFAULT_OUTPUT = os.path.join(os.path.dirname(__file__), "../artifacts/product_vectors.npz")
+
+
+def export(output_path: str = DEFAULT_OUTPUT):
+    supabase = create_client(
+        os.getenv("SUPABASE_URL"),
+        os.getenv("SUPABASE_SERVICE_KEY"),
+    )
+
+    print("📥 Fetching products with embeddings from Supabase...")
+    res = supabase.table("coffee_shop_products").select("*").execute()
+    products = res.data or []
+    if not products:
+        print("⚠️  No products found — run scripts/seed_products.py first.")
+        return
+
+    # Recorded so the app can tell when a later reseed made the snapshot stale
+    try:
+        version = fetch_catalog_version(supabase)
+    except Exception as e:
+        print(f"⚠️  Could not read the catalog version ({e}) — the app will rebuild from the catalog")
+        version = None
+
+    index = LocalVectorIndex.from_products(products, version=version if version is not None else -1)
+    index.save(output_path)
+    print(f"✅ Exported {len(index)} vectors ({index.matrix.shape[1]}-dim, catalog version {version}) to {output_path}")
+
+
+if __name__ == "__main__":
+    export(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_OUTPUT)
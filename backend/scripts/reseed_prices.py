@@ -7,6 +7,7 @@ Run from the backend/ directory:
 What it does:
 1. Deletes all existing Pinecone vectors and re-upserts with new INR prices
 2. Upserts all products into Supabase coffee_shop_products table
+3. Bumps the catalog version so running servers drop cached prices
 """
 
 import sys
@@ -17,6 +18,7 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from src.rag.vector_db_setup import VectorDBSetup
+from src.rag.catalog import bump_catalog_version
 from supabase import create_client
 
 DATA_FILE = os.path.join(os.path.dirname(__file__), "../data/products_data/products.jsonl")
@@ -82,6 +84,9 @@ def reseed_supabase():
 
     if res.data:
         print(f"✅ Supabase updated — {len(res.data)} products upserted with INR prices")
+        version = bump_catalog_version(supabase)
+        if version is not None:
+            print(f"🔄 Catalog version bumped to {version} — servers will reload the menu")
     else:
         print("⚠️  Upsert returned no data — check if coffee_shop_products table exists")
         print("    If missing, create it via Supabase SQL Editor:")
@@ -17,6 +17,8 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from langchain_huggingface import HuggingFaceEndpointEmbeddings
+from src.rag.catalog import bump_catalog_version
+from scripts.build_phrase_table import build as build_phrase_table
 
 # Seed script needs service role key to bypass RLS
 supabase = create_client(
@@ -79,6 +81,17 @@ def seed():
 
     if res.data:
         print(f"✅ Seeded {len(res.data)} products successfully with embeddings.")
+        version = bump_catalog_version(supabase)
+        if version is not None:
+            print(f"🔄 Catalog version bumped to {version} — servers will reload the menu")
+        try:
+            # Phrase vectors stand in for query embeddings, so use the configured
+            # query embedder (EMBEDDING_MODEL / EMBEDDING_BACKEND) and tag the table with it
+            from src.utils.util import get_embedding_model
+            query_embeddings = get_embedding_model()
+            build_phrase_table(products, query_embeddings, model=query_embeddings.model_name)
+        except Exception as e:
+            print(f"⚠️  Phrase table not rebuilt ({e}) — run scripts/build_phrase_table.py")
     else:
         print("⚠️  Upsert returned no data — check Supabase logs and if 'embedding' column exists.")
 
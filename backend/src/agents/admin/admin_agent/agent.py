@@ -4,7 +4,7 @@ import json
 import re
 from typing import List, Dict, Any, Optional, TypedDict
 from pydantic import BaseModel, Field
-from src.utils.util import llm, get_embedding_model
+from src.utils.util import llm, get_embedding_model, llm_priority
 from src.memory.supabase_client import supabase_admin as supabase
 from langchain_core.messages import SystemMessage, HumanMessage
 from langgraph.graph import StateGraph, END
@@ -333,7 +333,8 @@ def create_admin_graph():
     
     return workflow.compile()
 
-admin_graph = create_admin_graph()
+# BI queries yield the LLM budget to customer chat turns
+admin_graph = llm_priority(create_admin_graph(), "admin")
 
 async def invoke_admin_agent(query: str, history: List[Dict] = None) -> Dict[str, Any]:
     """Main Agent Loop powered by LangGraph"""
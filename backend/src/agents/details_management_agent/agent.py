@@ -1,12 +1,18 @@
 """Details Agent - Handles product and shop information queries."""
 
+import asyncio
 import logging
-from langchain_core.messages import AIMessage, ToolMessage
+from typing import Awaitable, Callable, Tuple, TypeVar
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
 from langgraph.types import Command
 from langgraph.graph import END
+from langchain_core.runnables import RunnableConfig
 
-from src.utils.util import llm
+from src.config import settings
+from src.utils.util import llm, final_answer
+from src.utils.deadline import bounded, has_budget, record_degraded, DeadlineExceeded, DEADLINE_REPLY
 from src.tools import COFFEE_SHOP_TOOLS
+from src.rag.response_cache import get_response_cache, alookup, astore
 from src.agents.details_management_agent.prompt import details_prompt
 from src.graph.state import CoffeeAgentState
 
@@ -15,22 +21,94 @@ logger = logging.getLogger(__name__)
 # Bind tools to LLM once at module level
 _llm_with_tools = llm.bind_tools(COFFEE_SHOP_TOOLS)
 
+_AGENT = "details_management_agent"
+
 # Tool name → function map for execution
 _TOOL_MAP = {tool.name: tool for tool in COFFEE_SHOP_TOOLS}
 
+T = TypeVar("T")
+
+
+async def _limited(limit: asyncio.Semaphore, call: Callable[[], Awaitable[T]]) -> T:
+    async with limit:
+        return await call()
+
+
+async def _run_tool(tool_call: dict, config: RunnableConfig, limit: asyncio.Semaphore) -> Tuple[str, bool]:
+    """Execute one tool call within its own timeout. Returns (result, succeeded).
+
+    ``limit`` caps the tool calls of this turn in flight at once; waiting for
+    a slot counts against the tool timeout and the request deadline.
+    """
+    tool_name = tool_call["name"]
+    tool = _TOOL_MAP.get(tool_name)
+    if not tool:
+        logger.warning(f"Unknown tool requested: {tool_name}")
+        return f"Tool '{tool_name}' not found.", False
+
+    try:
+        result = await bounded(
+            _limited(limit, lambda: tool.ainvoke(tool_call["args"])), config, cap=settings.details_tool_timeout_seconds
+        )
+        logger.debug(f"Tool '{tool_name}' returned result")
+        return str(result), True
+    except DeadlineExceeded:
+        record_degraded(config, "tool_timeout")
+        return f"Tool '{tool_name}' timed out.", False
+    except asyncio.TimeoutError:
+        logger.warning(f"Tool '{tool_name}' timed out after {settings.details_tool_timeout_seconds}s")
+        return f"Tool '{tool_name}' timed out.", False
+    except Exception as e:
+        logger.error(f"Tool execution error for '{tool_name}': {e}")
+        return f"Tool '{tool_name}' failed: {str(e)}", False
+
+
+def _templated_answer(tool_results: list) -> str:
+    """Tool output as-is, used when there is no time left for another LLM round."""
+    if not tool_results:
+        return DEADLINE_REPLY
+    return "Here's what I found:\n\n" + "\n\n".join(tool_results)
+
 
-async def details_management_agent(state: CoffeeAgentState) -> Command:
+async def details_management_agent(state: CoffeeAgentState, config: RunnableConfig) -> Command:
     """
     Handles product and shop information queries using tool calling.
 
     Flow:
     1. Invoke LLM with tools bound
-    2. If LLM calls tools → execute them, feed results back, loop
+    2. If LLM calls tools → execute them concurrently, feed results back
+       in call order, loop
     3. Once LLM gives final text response → return it
+
+    Every LLM and tool call is capped by the request deadline. When too little
+    time is left for another round, the tool results are returned as-is.
+    Menu and shop-info answers are shared across users via the response cache;
+    a hit skips the whole tool loop. A miss on a cacheable question is answered
+    from the question alone, so nothing from this user's history (name,
+    allergies, past orders) can end up in an answer served to others.
     """
     messages = list(state.messages)
+    tool_results = []
+
+    cache_context = None
+    if get_response_cache().cacheable(_AGENT, state.user_input):
+        try:
+            cached, cache_context = await bounded(alookup(_AGENT, state.user_input), config, cap=settings.details_tool_timeout_seconds)
+            if cached is not None:
+                logger.info(f"Details agent answered from the response cache: {state.user_input[:50]}")
+                return Command(
+                    update={"response_message": cached, "messages": [AIMessage(content=cached)]},
+                    goto=END
+                )
+        except Exception as e:
+            logger.warning(f"Response cache lookup failed: {e}")
 
-    chain = details_prompt | _llm_with_tools
+    if cache_context is not None:
+        # This answer will be shared — never let the per-user history into it
+        messages = [HumanMessage(content=state.user_input)]
+
+    # Tool-calling rounds share this chain; /chat/stream drops runs that emit tool calls
+    chain = final_answer(details_prompt | _llm_with_tools)
 
     try:
         logger.info(f"Details agent processing: {state.user_input[:50]}...")
@@ -38,11 +116,21 @@ async def details_management_agent(state: CoffeeAgentState) -> Command:
         # Agentic loop - keep going until LLM stops calling tools
         MAX_ITERATIONS = 5
         for i in range(MAX_ITERATIONS):
-            response = await chain.ainvoke({"messages": messages})
+            if tool_results and not has_budget(config):
+                record_degraded(config, "details_round")
+                msg = _templated_answer(tool_results)
+                return Command(
+                    update={"response_message": msg, "messages": [AIMessage(content=msg)]},
+                    goto=END
+                )
+
+            response = await bounded(chain.ainvoke({"messages": messages}), config)
 
             # No tool calls — we have the final answer
             if not response.tool_calls:
                 logger.info(f"Details agent completed in {i + 1} iteration(s)")
+                if cache_context is not None and response.content:
+                    await astore(_AGENT, state.user_input, response.content, cache_context)
                 return Command(
                     update={
                         "response_message": response.content,
@@ -51,28 +139,17 @@ async def details_management_agent(state: CoffeeAgentState) -> Command:
                     goto=END
                 )
 
-            # Execute each tool call
+            # Execute all tool calls of this round concurrently — the round costs
+            # the slowest tool, not the sum; gather keeps the original order
             logger.info(f"Details agent calling {len(response.tool_calls)} tool(s)")
             messages.append(response)  # Add AIMessage with tool_calls to history
 
-            for tool_call in response.tool_calls:
-                tool_name = tool_call["name"]
-                tool_args = tool_call["args"]
-                tool_id   = tool_call["id"]
-
-                tool = _TOOL_MAP.get(tool_name)
-                if not tool:
-                    tool_result = f"Tool '{tool_name}' not found."
-                    logger.warning(f"Unknown tool requested: {tool_name}")
-                else:
-                    try:
-                        tool_result = tool.invoke(tool_args)
-                        logger.debug(f"Tool '{tool_name}' returned result")
-                    except Exception as e:
-                        tool_result = f"Tool '{tool_name}' failed: {str(e)}"
-                        logger.error(f"Tool execution error for '{tool_name}': {e}")
-
-                messages.append(ToolMessage(content=str(tool_result), tool_call_id=tool_id))
+            limit = asyncio.Semaphore(max(1, settings.details_tool_concurrency))
+            results = await asyncio.gather(*(_run_tool(tc, config, limit) for tc in response.tool_calls))
+            for tool_call, (tool_result, ok) in zip(response.tool_calls, results):
+                if ok:
+                    tool_results.append(tool_result)
+                messages.append(ToolMessage(content=tool_result, tool_call_id=tool_call["id"]))
 
         # Exceeded max iterations — return last response content if any
         logger.warning("Details agent exceeded max tool iterations")
@@ -85,6 +162,14 @@ async def details_management_agent(state: CoffeeAgentState) -> Command:
             goto=END
         )
 
+    except DeadlineExceeded:
+        record_degraded(config, "details_answer")
+        msg = _templated_answer(tool_results)
+        return Command(
+            update={"response_message": msg, "messages": [AIMessage(content=msg)]},
+            goto=END
+        )
+
     except Exception as e:
         logger.error(f"Details agent failed: {e}", exc_info=True)
         
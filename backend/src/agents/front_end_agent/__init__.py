@@ -0,0 +1,13 @@
+"""Fused Front End - Guard, rewrite, routing and memory detection in one call."""
+
+from src.agents.front_end_agent.agent import front_end_agent, front_end_memory_agent, select_front_end
+from src.agents.front_end_agent.prompt import front_end_prompt
+from src.agents.front_end_agent.schema import FrontEndDecision
+
+__all__ = [
+    "front_end_agent",
+    "front_end_memory_agent",
+    "select_front_end",
+    "front_end_prompt",
+    "FrontEndDecision",
+]
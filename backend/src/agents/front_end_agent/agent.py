@@ -0,0 +1,125 @@
+"""Fused front end — guard, rewrite, routing and memory detection in one LLM call.
+
+The staged path (input_processor → memory ∥ router) formats the same recent
+messages three times and calls the small model up to three times. In fused
+mode a single ``FrontEndDecision`` replaces all three. Selected per
+deployment with ``FRONT_END_MODE`` (staged | fused | ab).
+"""
+
+import hashlib
+import logging
+
+from langgraph.types import Command
+from langgraph.graph import END
+from langgraph.errors import GraphInterrupt
+from langchain_core.runnables import RunnableConfig
+
+from src.config import settings
+from src.utils.util import small_llm, llm_priority
+from src.graph.state import CoffeeAgentState
+from src.agents.front_end_agent.prompt import front_end_prompt
+from src.agents.front_end_agent.schema import FrontEndDecision
+from src.agents.memory_management_agent import apply_memory_intent, memory_signal, MemoryIntent
+from src.agents.router_agent.agent import try_fast_route
+from src.utils.deadline import bounded
+
+logger = logging.getLogger(__name__)
+
+_chain = llm_priority(front_end_prompt | small_llm.with_structured_output(FrontEndDecision), "router")
+
+
+def _fused_bucket(thread_id: str) -> bool:
+    """Stable A/B assignment: the same conversation always gets the same front end."""
+    digest = hashlib.sha1(thread_id.encode()).hexdigest()
+    return int(digest[:8], 16) / 0xFFFFFFFF < settings.front_end_fused_share
+
+
+def select_front_end(state: CoffeeAgentState, config: RunnableConfig) -> str:
+    """START edge: "front_end" (fused) or "input_processor" (staged)."""
+    mode = settings.front_end_mode
+    if state.image_url or mode == "staged":
+        # Multimodal input is only handled by the staged input processor
+        return "input_processor"
+    if mode == "ab":
+        thread_id = str(config.get("configurable", {}).get("thread_id", ""))
+        variant = "front_end" if _fused_bucket(thread_id) else "input_processor"
+        logger.info(f"Front end A/B: thread {thread_id[:8]} -> {variant}")
+        return variant
+    return "front_end"
+
+
+async def front_end_agent(state: CoffeeAgentState, config: RunnableConfig) -> Command:
+    """One structured call decides guard, rewrite, target agent and memory updates."""
+    user_input = state.user_input
+
+    if not user_input.strip():
+        return Command(
+            update={"response_message": "I didn't catch that — what can I get you?"},
+            goto=END
+        )
+
+    # Greetings, thanks, confirm/cancel without preference cues need no LLM at all
+    route = try_fast_route(state)
+    if route is not None and not (
+        settings.memory_gate_enabled and memory_signal(user_input)[0] >= settings.memory_gate_threshold
+    ):
+        return Command(update={"response_message": ""}, goto=route.target_agent)
+
+    try:
+        recent_messages = state.messages[-6:] if state.messages else []
+        formatted_messages = "\n".join([
+            f"{getattr(m, 'type', 'unknown').upper()}: {m.content}"
+            for m in recent_messages
+        ]) or "(no prior messages)"
+
+        result: FrontEndDecision = await bounded(_chain.ainvoke({
+            "user_input": user_input,
+            "messages": formatted_messages,
+            "user_memory": state.user_memory.model_dump(),
+            "order": [f"{i.name} x{i.quantity}" for i in state.order] or "empty",
+        }), config)
+
+        if result.decision == "blocked":
+            logger.info(f"Front end: BLOCKED — {result.response_message[:40]}")
+            return Command(
+                update={"response_message": result.response_message},
+                goto=END
+            )
+
+        target = result.target_agent.value
+        intent = result.memory_intent()
+        logger.info(f"Front end: ALLOWED -> {target} — Rewritten: {result.rewritten_input[:40]}")
+        update = {"user_input": result.rewritten_input, "response_message": ""}
+
+        if intent.has_updates():
+            # HITL lives in its own node so a resume does not repeat this LLM call
+            return Command(
+                update={**update, "pending_memory": intent.model_dump(), "route": target},
+                goto="front_end_memory"
+            )
+        return Command(update=update, goto=target)
+
+    except Exception as e:
+        logger.error(f"front_end_agent failed: {e}", exc_info=True)
+
+        from src.utils.util import get_llm_error_message
+        msg = get_llm_error_message(e) or "Sorry, I'm having trouble understanding your request right now. Could you please try again?"
+        return Command(update={"response_message": msg}, goto=END)
+
+
+async def front_end_memory_agent(state: CoffeeAgentState, config: RunnableConfig) -> Command:
+    """Approve (HITL) and apply the memory intent found by the fused front end, then route."""
+    user_id: str = config.get("configurable", {}).get("user_id", "anonymous")
+    target = state.route or "general_agent"
+    update = {"pending_memory": None, "route": None}
+
+    try:
+        memory = await apply_memory_intent(state, MemoryIntent(**(state.pending_memory or {})), user_id)
+        if memory is not None:
+            update["user_memory"] = memory
+    except GraphInterrupt:
+        raise
+    except Exception as e:
+        logger.error(f"front_end_memory_agent failed: {e}", exc_info=True)
+
+    return Command(update=update, goto=target)
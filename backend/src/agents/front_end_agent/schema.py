@@ -0,0 +1,27 @@
+from typing import Any, Dict
+
+from pydantic import BaseModel, Field
+
+from src.agents.input_processor_agent.schema import ProcessorDecision
+from src.agents.memory_management_agent.schema import MemoryIntent
+from src.agents.router_agent.schema import AgentType
+
+
+class FrontEndDecision(BaseModel):
+    """Guard, rewrite, routing and memory detection in a single structured call."""
+    decision: ProcessorDecision = Field(..., description="Whether the query is allowed or blocked")
+    rewritten_input: str = Field(..., description="The self-contained, rewritten query if allowed, or original if blocked")
+    response_message: str = Field(default="", description="Friendly redirect message if blocked, empty if allowed")
+    target_agent: AgentType = Field(default=AgentType.general_agent, description="The chosen agent to handle the input")
+    memory_reasoning: str = Field(default="", description="Why memory updates were (or were not) extracted")
+    add_or_update: Dict[str, Any] = Field(default_factory=dict)
+    remove: Dict[str, Any] = Field(default_factory=dict)
+    replace: Dict[str, Any] = Field(default_factory=dict)
+
+    def memory_intent(self) -> MemoryIntent:
+        return MemoryIntent(
+            reasoning=self.memory_reasoning,
+            add_or_update=self.add_or_update,
+            remove=self.remove,
+            replace=self.replace,
+        )
@@ -4,17 +4,19 @@ import logging
 from langchain_core.messages import AIMessage
 from langgraph.types import Command
 from langgraph.graph import END
+from langchain_core.runnables import RunnableConfig
 
-from src.utils.util import llm
+from src.utils.util import llm, final_answer
 from src.agents.general_agent.prompt import general_prompt
 from src.graph.state import CoffeeAgentState
+from src.utils.deadline import bounded, record_degraded, DeadlineExceeded, DEADLINE_REPLY
 
 logger = logging.getLogger(__name__)
 
-_chain = general_prompt | llm
+_chain = final_answer(general_prompt | llm)
 
 
-async def general_agent(state: CoffeeAgentState) -> Command:
+async def general_agent(state: CoffeeAgentState, config: RunnableConfig) -> Command:
     try:
         # Format order for prompt — full details
         if state.order:
@@ -31,13 +33,13 @@ async def general_agent(state: CoffeeAgentState) -> Command:
         # sliding window: only send last 10 messages to LLM to prevent token limits
         recent_messages = state.messages[-10:] if state.messages else []
 
-        response = await _chain.ainvoke({
+        response = await bounded(_chain.ainvoke({
             "messages": recent_messages,
             "user_memory": state.user_memory.model_dump(),
             "current_order": current_order,
             "order_total": order_total,
             "semantic_memories": state.semantic_memories,
-        })
+        }), config)
         msg = response.content
         return Command(
             update={
@@ -46,6 +48,9 @@ async def general_agent(state: CoffeeAgentState) -> Command:
             },
             goto=END
         )
+    except DeadlineExceeded:
+        record_degraded(config, "general_reply")
+        return Command(update={"response_message": DEADLINE_REPLY}, goto=END)
     except Exception as e:
         logger.error(f"general_agent failed: {e}", exc_info=True)
         
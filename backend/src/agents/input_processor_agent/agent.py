@@ -1,18 +1,24 @@
 import logging
 from langgraph.types import Command
 from langgraph.graph import END
+from langchain_core.runnables import RunnableConfig
 
-from src.utils.util import small_llm
+from src.utils.util import small_llm, llm_priority
 from src.agents.input_processor_agent.schema import InputProcessorResponse
 from src.agents.input_processor_agent.prompt import input_processor_prompt
 from src.graph.state import CoffeeAgentState
+from src.utils.deadline import bounded
 
 logger = logging.getLogger(__name__)
 
-_chain = input_processor_prompt | small_llm.with_structured_output(InputProcessorResponse)
+# Memory extraction and routing are independent — run them in the same superstep.
+FAN_OUT = ["memory", "router"]
 
+_structured_llm = llm_priority(small_llm.with_structured_output(InputProcessorResponse), "router")
+_chain = input_processor_prompt | _structured_llm
 
-async def input_processor_agent(state: CoffeeAgentState) -> Command:
+
+async def input_processor_agent(state: CoffeeAgentState, config: RunnableConfig) -> Command:
     """
     Unified agent for gatekeeping (Guard) and query refinement (Intent Refiner).
     Runs first to ensure the request is valid and self-contained.
@@ -54,9 +60,11 @@ async def input_processor_agent(state: CoffeeAgentState) -> Command:
                 ("system", system_prompt),
                 HumanMessage(content=content)
             ]
-            result: InputProcessorResponse = await small_llm.with_structured_output(InputProcessorResponse).ainvoke(messages)
+            result: InputProcessorResponse = await bounded(
+                _structured_llm.ainvoke(messages), config
+            )
         else:
-            result: InputProcessorResponse = await _chain.ainvoke(inputs)
+            result: InputProcessorResponse = await bounded(_chain.ainvoke(inputs), config)
 
         if result.decision == "blocked":
             logger.info(f"Input Processor: BLOCKED — {result.response_message[:40]}")
@@ -71,7 +79,7 @@ async def input_processor_agent(state: CoffeeAgentState) -> Command:
                 "user_input": result.rewritten_input,
                 "response_message": ""
             },
-            goto="memory"
+            goto=FAN_OUT
         )
 
     except Exception as e:
@@ -86,4 +94,4 @@ async def input_processor_agent(state: CoffeeAgentState) -> Command:
             )
 
         # Generic Fallback: Allow but don't rewrite
-        return Command(goto="memory")
+        return Command(goto=FAN_OUT)
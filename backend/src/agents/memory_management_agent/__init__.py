@@ -1,11 +1,15 @@
 """Memory Agent - Extracts and persists user preferences from conversation."""
 
-from src.agents.memory_management_agent.agent import memory_agent
+from src.agents.memory_management_agent.agent import memory_agent, apply_memory_intent
 from src.agents.memory_management_agent.prompt import memory_extraction_prompt
 from src.agents.memory_management_agent.schema import MemoryIntent
+from src.agents.memory_management_agent.gate import memory_signal, get_memory_gate_stats
 
 __all__ = [
     "memory_agent",
+    "apply_memory_intent",
     "memory_extraction_prompt",
     "MemoryIntent",
+    "memory_signal",
+    "get_memory_gate_stats",
 ]
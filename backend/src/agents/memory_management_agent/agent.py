@@ -1,12 +1,18 @@
 """Memory Agent - Extracts and persists user preferences from conversation."""
 
+import asyncio
 import logging
+import random
+from typing import Optional
+
 from langgraph.types import Command, interrupt
 from langgraph.errors import GraphInterrupt
 from langchain_core.runnables import RunnableConfig
 
-from src.utils.util import small_llm
+from src.config import settings
+from src.utils.util import small_llm, llm_priority, LLMOverloaded
 from src.graph.state import CoffeeAgentState
+from src.memory.schemas import UserMemory
 from src.memory.memory_manager import (
     save_user_memory,
     merge_and_update_memory,
@@ -15,92 +21,146 @@ from src.memory.memory_manager import (
 )
 from src.agents.memory_management_agent.prompt import memory_extraction_prompt
 from src.agents.memory_management_agent.schema import MemoryIntent
+from src.agents.memory_management_agent.gate import memory_signal, stats as gate_stats
+from src.utils.deadline import bounded, has_budget, record_degraded
 
 logger = logging.getLogger(__name__)
 
-_extractor = memory_extraction_prompt | small_llm.with_structured_output(MemoryIntent)
+_extractor = llm_priority(memory_extraction_prompt | small_llm.with_structured_output(MemoryIntent), "memory")
+
+# Strong references so shadow extractions are not garbage-collected mid-flight
+_shadow_tasks: set = set()
+
+
+async def _extract(state: CoffeeAgentState, config: RunnableConfig = None) -> MemoryIntent:
+    # Format recent messages for context
+    recent_messages = state.messages[-6:] if state.messages else []
+    formatted_messages = "\n".join([
+        f"{getattr(m, 'type', 'unknown').upper()}: {m.content}"
+        for m in recent_messages
+    ]) or "(no prior messages)"
+
+    return await bounded(_extractor.ainvoke({
+        "user_input": state.user_input,
+        "user_memory": state.user_memory.model_dump(),
+        "messages": formatted_messages,
+    }), config)
+
+
+async def _shadow_extract(state: CoffeeAgentState) -> None:
+    """Run the extractor on a gated-out message to measure the gate's misses."""
+    try:
+        intent = await _extract(state)
+    except Exception as e:
+        logger.debug(f"Memory gate shadow check skipped: {e}")
+        return
+    gate_stats.record_shadow(intent.has_updates())
+    if intent.has_updates():
+        logger.warning(f"Memory gate missed an update: '{state.user_input[:60]}'")
+
+
+def _passes_gate(state: CoffeeAgentState) -> bool:
+    """True if the message may carry preferences and the extractor should run."""
+    if not settings.memory_gate_enabled:
+        return True
+
+    score, cues = memory_signal(state.user_input)
+    passed = score >= settings.memory_gate_threshold
+    gate_stats.record(passed)
+    if passed:
+        logger.debug(f"Memory gate passed ({score:.2f}, cues={cues})")
+    elif random.random() < settings.memory_gate_shadow_rate:
+        task = asyncio.create_task(_shadow_extract(state))
+        _shadow_tasks.add(task)
+        task.add_done_callback(_shadow_tasks.discard)
+    return passed
+
+
+async def apply_memory_intent(state: CoffeeAgentState, intent: MemoryIntent, user_id: str) -> Optional[UserMemory]:
+    """Ask the user to approve ``intent`` (HITL), then apply and persist it.
+
+    Returns the updated memory, or None if there was nothing to apply or the
+    user rejected it. Shared by the memory agent and the fused front end.
+    """
+    if not intent.has_updates():
+        return None
+
+    # Trigger HITL before applying
+    status = interrupt({
+        "action": "memory_validation",
+        "details": intent.model_dump()
+    })
+
+    if status == "reject":
+        logger.info("User rejected memory update via HITL. Skipping Supabase and Mem0.")
+        return None
+
+    # Apply updates
+    memory = state.user_memory.model_copy(deep=True)
+
+    logger.info(f"--- MEMORY AGENT: APPLYING UPDATES for {user_id} ---")
+    if intent.add_or_update:
+        memory = merge_and_update_memory(intent.add_or_update, memory)
+    if intent.remove:
+        memory = remove_from_memory(intent.remove, memory)
+    if intent.replace:
+        memory = replace_in_memory(intent.replace, memory)
+
+    # Persist to Supabase and Mem0 (only when meaningful preferences were detected)
+    if user_id != "anonymous":
+        save_user_memory(user_id, memory)
+
+        # --- MEM0 INTEGRATION: Add to semantic memory (after approval) ---
+        from src.memory.mem0_manager import mem0_manager
+        mem0_manager.add_memory(state.user_input, user_id=user_id)
+        # ----------------------------------------------------------------
+    else:
+        logger.debug("Skipping Supabase save — no user_id in config")
+
+    return memory
 
 
 async def memory_agent(state: CoffeeAgentState, config: RunnableConfig) -> Command:
     """
-    Runs after guard, before intent_refiner.
+    Runs after the input processor, in parallel with the router.
 
+    - Skips the LLM entirely when the memory gate sees no preference cues,
+      or when the request deadline leaves no room for an optional step
     - Extracts memory preferences from user input
     - Saves to Supabase if anything found
-    - Always routes to router — router decides which action agent to use
+    - Has no outgoing edge: the router's chosen agent starts only once this
+      node (including a pending HITL interrupt) has finished, so it always
+      sees the updated memory
     """
     user_id: str = config.get("configurable", {}).get("user_id", "anonymous")
 
+    if not _passes_gate(state):
+        return Command()
+    if not has_budget(config):
+        record_degraded(config, "memory_extraction")
+        return Command()
+
     try:
-        # Format recent messages for context
-        recent_messages = state.messages[-6:] if state.messages else []
-        formatted_messages = "\n".join([
-            f"{getattr(m, 'type', 'unknown').upper()}: {m.content}"
-            for m in recent_messages
-        ]) or "(no prior messages)"
-
-        intent: MemoryIntent = await _extractor.ainvoke({
-            "user_input": state.user_input,
-            "user_memory": state.user_memory.model_dump(),
-            "messages": formatted_messages,
-        })
+        intent: MemoryIntent = await _extract(state, config)
+        if settings.memory_gate_enabled:
+            gate_stats.record_extraction(intent.has_updates())
 
         if intent.reasoning:
             logger.info(f"Memory Agent Reasoning: {intent.reasoning}")
 
-        if not intent.has_updates():
-            return Command(goto="router")
-
-        # Trigger HITL before applying
-        status = interrupt({
-            "action": "memory_validation",
-            "details": intent.model_dump()
-        })
-
-        if status == "reject":
-            logger.info("User rejected memory update via HITL. Skipping Supabase and Mem0.")
-            return Command(goto="router")
-
-        # Apply updates
-        memory = state.user_memory.model_copy(deep=True)
-
-        logger.info(f"--- MEMORY AGENT: APPLYING UPDATES for {user_id} ---")
-        if intent.add_or_update:
-            memory = merge_and_update_memory(intent.add_or_update, memory)
-        if intent.remove:
-            memory = remove_from_memory(intent.remove, memory)
-        if intent.replace:
-            memory = replace_in_memory(intent.replace, memory)
-
-        # Persist to Supabase and Mem0 (only when meaningful preferences were detected)
-        if user_id != "anonymous":
-            save_user_memory(user_id, memory)
-
-            # --- MEM0 INTEGRATION: Add to semantic memory (after approval) ---
-            from src.memory.mem0_manager import mem0_manager
-            mem0_manager.add_memory(state.user_input, user_id=user_id)
-            # ----------------------------------------------------------------
-        else:
-            logger.debug("Skipping Supabase save — no user_id in config")
-
-        # Always forward to intent_refiner with updated memory
-        return Command(
-            update={"user_memory": memory},
-            goto="router"
-        )
+        memory = await apply_memory_intent(state, intent, user_id)
+        if memory is None:
+            return Command()
+        return Command(update={"user_memory": memory})
 
     except GraphInterrupt:
         # Pass LangGraph standard interrupt up
         raise
+    except LLMOverloaded as e:
+        # Shed by admission control so customer-facing calls keep the provider budget
+        logger.info(f"memory_agent skipped: {e}")
+        return Command()
     except Exception as e:
+        # Non-critical: the router has already picked an agent, let the turn continue
         logger.error(f"memory_agent failed: {e}", exc_info=True)
-        
-        # Check for specific LLM API errors
-        from src.utils.util import get_llm_error_message
-        if api_msg := get_llm_error_message(e):
-            return Command(
-                update={"response_message": api_msg},
-                goto=END
-            )
-
-        return Command(goto="router")
+        return Command()
@@ -0,0 +1,110 @@
+"""Cheap pre-filter deciding whether a message can carry memory updates.
+
+Only a small fraction of messages state a preference ("I'm allergic to…",
+"I love…", "call me…"), yet ``memory_extraction_prompt`` used to run on every
+one. ``memory_signal`` scores a message with lexical cues fed into a tiny
+hand-weighted logistic model; the extractor only runs at or above
+``MEMORY_GATE_THRESHOLD``. Lower the threshold for recall, raise it for
+precision.
+
+A sampled share of gated-out messages is still run through the extractor in
+the background (``MEMORY_GATE_SHADOW_RATE``) to measure what the gate misses;
+counters are available from ``get_memory_gate_stats()``.
+"""
+
+import math
+import re
+import threading
+from typing import Dict, List, Pattern, Tuple
+
+
+def _rx(pattern: str) -> Pattern:
+    return re.compile(pattern, re.IGNORECASE)
+
+
+# (feature, pattern, weight) — positive cues mirror the fields in UserMemory
+_FEATURES: List[Tuple[str, Pattern, float]] = [
+    ("allergy", _rx(r"\b(allergic|allerg(y|ies)|intoleran(t|ce)|anaphyla\w*)\b"), 3.5),
+    ("diet_identity", _rx(r"\bi'?(m| am) (a |an )?(vegan|vegetarian|pescatarian|lactose|diabetic|celiac|coeliac|keto)\b"), 3.5),
+    ("name", _rx(r"\b(call me|my name is|my name'?s|i'?m called|i am called)\b"), 3.5),
+    ("location", _rx(r"\b(i live in|i'?m (from|based in)|i am (from|based in)|i moved to)\b"), 3.0),
+    ("preference", _rx(r"\bi (really |absolutely |just |do(n'?t)? )?(love|like|enjoy|adore|prefer|hate|dislike|detest|can'?t stand)\b"), 2.5),
+    ("favourite", _rx(r"\bmy (all[- ]time )?favou?rite\b"), 2.5),
+    ("habit", _rx(r"\bi (usually|always|never|normally|often) (get|have|drink|order|take)\b"), 2.25),
+    ("avoid", _rx(r"\b(i (can'?t|cannot|don'?t|do not) (have|eat|drink)|i avoid|i'?m off)\b"), 2.5),
+    ("memory_op", _rx(r"\b(remember( that)?|forget( that)?|update my|remove .+ from my|no longer|not anymore|these days)\b"), 2.25),
+    ("diet_term", _rx(r"\b(vegan|vegetarian|lactose|gluten|dairy|nuts?|peanuts?|soy|decaf|sugar[- ]free)\b"), 0.75),
+    # Negative evidence: questions about the menu and one-off orders
+    ("question", _rx(r"^(what|which|how|do you|does|is there|are there|can you)\b|\?\s*$"), -1.5),
+    ("order", _rx(r"^(i'?d like|i want|can i (get|have)|give me|get me|add|remove|make it)\b"), -1.5),
+]
+
+_BIAS = -2.0
+
+
+def _sigmoid(x: float) -> float:
+    return 1.0 / (1.0 + math.exp(-x))
+
+
+def memory_signal(text: str) -> Tuple[float, List[str]]:
+    """Probability-like score that ``text`` carries a memory update, plus the cues that fired."""
+    text = (text or "").strip()
+    if not text:
+        return 0.0, []
+    fired = [(name, w) for name, rx, w in _FEATURES if rx.search(text)]
+    return _sigmoid(_BIAS + sum(w for _, w in fired)), [name for name, _ in fired]
+
+
+# ── Metrics ───────────────────────────────────────────────────────────────────
+
+class MemoryGateStats:
+    """Pass/skip counters and the miss rate measured by shadow extractions."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.messages = 0
+        self.passed = 0
+        self.skipped = 0
+        self.passed_with_updates = 0
+        self.shadow_checks = 0
+        self.shadow_misses = 0
+
+    def record(self, passed: bool) -> None:
+        with self._lock:
+            self.messages += 1
+            if passed:
+                self.passed += 1
+            else:
+                self.skipped += 1
+
+    def record_extraction(self, had_updates: bool) -> None:
+        """Outcome of an extraction the gate let through (precision)."""
+        with self._lock:
+            self.passed_with_updates += int(had_updates)
+
+    def record_shadow(self, had_updates: bool) -> None:
+        """Outcome of a shadow extraction on a skipped message (recall)."""
+        with self._lock:
+            self.shadow_checks += 1
+            self.shadow_misses += int(had_updates)
+
+    def snapshot(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "messages": self.messages,
+                "passed": self.passed,
+                "skipped": self.skipped,
+                "skip_rate": round(self.skipped / self.messages, 4) if self.messages else 0.0,
+                "precision": round(self.passed_with_updates / self.passed, 4) if self.passed else None,
+                "shadow_checks": self.shadow_checks,
+                "shadow_miss_rate": (
+                    round(self.shadow_misses / self.shadow_checks, 4) if self.shadow_checks else None
+                ),
+            }
+
+
+stats = MemoryGateStats()
+
+
+def get_memory_gate_stats() -> Dict[str, object]:
+    return stats.snapshot()
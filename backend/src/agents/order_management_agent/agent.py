@@ -7,7 +7,7 @@ from langgraph.types import Command, interrupt
 from langgraph.graph import END
 from langgraph.errors import GraphInterrupt
 
-from src.utils.util import llm
+from src.utils.util import llm, final_answer
 from src.graph.state import CoffeeAgentState, ProductItem
 from src.agents.order_management_agent.schema import (
     OrderInput, OrderUpdateState, OrderAction, ActionDecision
@@ -19,22 +19,23 @@ from src.agents.order_management_agent.prompt import (
     order_responder_prompt,
 )
 from langchain_core.runnables import RunnableConfig
-from src.rag.retriever import get_product_by_name
+from src.rag.retriever import aget_products_by_names, asearch_products
 from src.orders import save_order, confirm_order, cancel_order
 from src.utils.email_util import send_order_receipt
+from src.utils.deadline import bounded, has_budget, record_degraded, DeadlineExceeded, DEADLINE_REPLY
+from src.agents.order_management_agent import templates
 
 logger = logging.getLogger(__name__)
 
 _action_llm    = llm.with_structured_output(ActionDecision)
 _new_order_llm = llm.with_structured_output(OrderInput)
 _update_llm    = llm.with_structured_output(OrderUpdateState)
-_responder     = order_responder_prompt | llm
+_responder     = final_answer(order_responder_prompt | llm)
 
 
 # ── Helpers ───────────────────────────────────────────────────────────────────
 
-def _lookup_product(name: str) -> dict:
-    result = get_product_by_name(name)
+def _to_product(result: dict) -> dict:
     if result.get("found"):
         return {
             "name": result.get("name"),
@@ -44,6 +45,11 @@ def _lookup_product(name: str) -> dict:
     return {"found": False}
 
 
+async def _lookup_products(names: List[str]) -> List[dict]:
+    """Resolve every line item in one batched lookup (order preserved)."""
+    return [_to_product(r) for r in await aget_products_by_names(names)]
+
+
 def _format_order_summary(order: List[ProductItem], final_price: float) -> str:
     lines = [f"  • {item.name} x{item.quantity} @ ₹{item.per_unit_price:.2f} = ₹{item.total_price:.2f}" for item in order]
     return f"Here's your order:\n" + "\n".join(lines) + f"\n\n🧾 Total: ₹{final_price:.2f}\n\nShall I confirm this order?"
@@ -68,11 +74,22 @@ async def _generate_dynamic_response(
     unavailable_items: List[str],
     status_message: str,
     user_input: str,
-    messages: List
+    messages: List,
+    config: RunnableConfig = None,
+    fallback: str = None
 ) -> str:
-    """Invokes the responder LLM to get a natural response."""
+    """Invokes the responder LLM to get a natural response.
+
+    The responder only rewords ``status_message``, so it is skipped when the
+    request deadline is close; ``fallback`` (default: the status) is returned
+    then and on errors.
+    """
+    fallback = fallback or status_message
+    if not has_budget(config):
+        record_degraded(config, "order_responder")
+        return fallback
     try:
-        response = await _responder.ainvoke({
+        response = await bounded(_responder.ainvoke({
             "action_type": action_type,
             "items_impacted": items_impacted,
             "current_order": current_order,
@@ -81,11 +98,29 @@ async def _generate_dynamic_response(
             "status_message": status_message,
             "user_input": user_input,
             "messages": messages[-6:] if messages else []
-        })
+        }), config)
         return response.content
+    except DeadlineExceeded:
+        record_degraded(config, "order_responder")
+        return fallback
     except Exception as e:
         logger.error(f"Dynamic response generation failed: {e}")
-        return status_message # Fallback to hardcoded status
+        return fallback # Fallback to templated status
+
+
+async def _respond(action_type: str, status_message: str, user_input: str, config: RunnableConfig = None, **context) -> str:
+    """Templated reply, or the responder LLM when the action's mode asks for it."""
+    reply = templates.render(action_type, status_message, user_input)
+    if not templates.use_responder(action_type, user_input):
+        return reply
+    return await _generate_dynamic_response(
+        action_type=action_type,
+        status_message=status_message,
+        user_input=user_input,
+        config=config,
+        fallback=reply,
+        **context
+    )
 
 
 # ── Main agent ────────────────────────────────────────────────────────────────
@@ -105,13 +140,13 @@ async def order_management_agent(state: CoffeeAgentState, config: RunnableConfig
                 last_bot_msg = m.content[:200]
                 break
 
-        action_decision: ActionDecision = await (detect_order_action_prompt | _action_llm).ainvoke({
+        action_decision: ActionDecision = await bounded((detect_order_action_prompt | _action_llm).ainvoke({
             "user_input": user_input,
             "has_existing_order": bool(existing_order),
             "existing_order": [f"{i.name} x{i.quantity}" for i in existing_order],
             "messages": messages,
             "last_bot_message": last_bot_msg,
-        })
+        }), config)
         action = action_decision.action
         logger.info(f"order_management_agent: action={action} for input='{user_input}'")
 
@@ -123,15 +158,16 @@ async def order_management_agent(state: CoffeeAgentState, config: RunnableConfig
         # ── CONFIRM ───────────────────────────────────────────────────────────
         if action == OrderAction.CONFIRM:
             if not existing_order:
-                msg = await _generate_dynamic_response(
-                    action_type="confirm",
+                msg = await _respond(
+                    action_type="confirm_empty",
                     items_impacted=[],
                     current_order=[],
                     total_price=0.0,
                     unavailable_items=[],
                     status_message="You don't have anything in your order yet. Want to start one?",
                     user_input=user_input,
-                    messages=messages
+                    messages=messages,
+                    config=config
                 )
                 return Command(update={"response_message": msg, "messages": [AIMessage(content=msg)]}, goto=END)
 
@@ -152,7 +188,7 @@ async def order_management_agent(state: CoffeeAgentState, config: RunnableConfig
                     asyncio.ensure_future(_safe_send_receipt())
                 
                 receipt = _mock_receipt(existing_order, state.final_price, order_id)
-                msg = await _generate_dynamic_response(
+                msg = await _respond(
                     action_type="confirm",
                     items_impacted=[i.name for i in existing_order],
                     current_order=[f"{i.name} x{i.quantity}" for i in existing_order],
@@ -160,14 +196,15 @@ async def order_management_agent(state: CoffeeAgentState, config: RunnableConfig
                     unavailable_items=[],
                     status_message=receipt,
                     user_input=user_input,
-                    messages=messages
+                    messages=messages,
+                    config=config
                 )
                 return Command(
                     update={"response_message": msg, "messages": [AIMessage(content=msg)], "order": [], "final_price": 0.0},
                     goto=END
                 )
             else:
-                msg = await _generate_dynamic_response(
+                msg = await _respond(
                     action_type="checkout_cancelled",
                     items_impacted=[],
                     current_order=[f"{i.name} x{i.quantity}" for i in existing_order],
@@ -175,7 +212,8 @@ async def order_management_agent(state: CoffeeAgentState, config: RunnableConfig
                     unavailable_items=[],
                     status_message="Checkout was cancelled. Your order is still saved in your cart.",
                     user_input=user_input,
-                    messages=messages
+                    messages=messages,
+                    config=config
                 )
                 return Command(
                     update={"response_message": msg, "messages": [AIMessage(content=msg)]},
@@ -187,7 +225,7 @@ async def order_management_agent(state: CoffeeAgentState, config: RunnableConfig
             if user_id != "anonymous":
                 cancel_order(user_id)
             
-            msg = await _generate_dynamic_response(
+            msg = await _respond(
                 action_type="cancel",
                 items_impacted=[i.name for i in existing_order],
                 current_order=[],
@@ -195,7 +233,8 @@ async def order_management_agent(state: CoffeeAgentState, config: RunnableConfig
                 unavailable_items=[],
                 status_message="Your order has been cancelled. Let me know if you'd like to start a new one!",
                 user_input=user_input,
-                messages=messages
+                messages=messages,
+                config=config
             )
             return Command(
                 update={"response_message": msg, "messages": [AIMessage(content=msg)], "order": [], "final_price": 0.0},
@@ -204,14 +243,14 @@ async def order_management_agent(state: CoffeeAgentState, config: RunnableConfig
 
         # ── CREATE ────────────────────────────────────────────────────────────
         elif action == OrderAction.CREATE or (action == OrderAction.UPDATE and not existing_order):
-            parsed: OrderInput = await (parse_new_order_prompt | _new_order_llm).ainvoke({
+            parsed: OrderInput = await bounded((parse_new_order_prompt | _new_order_llm).ainvoke({
                 "user_input": user_input,
                 "messages": messages,
-            })
+            }), config)
 
             new_order, total, unavailable = [], 0.0, []
-            for item in parsed.items:
-                product = _lookup_product(item.name)
+            products = await _lookup_products([item.name for item in parsed.items])
+            for item, product in zip(parsed.items, products):
                 if product.get("name"):
                     price = product["price"]
                     line_total = round(price * item.quantity, 2)
@@ -229,10 +268,10 @@ async def order_management_agent(state: CoffeeAgentState, config: RunnableConfig
             total = round(total, 2)
 
             if not new_order:
-                from src.rag.retriever import search_products
+                import asyncio
                 recommendations = []
-                for u in unavailable:
-                    recs = search_products(u, top_k=2)
+                all_recs = await asyncio.gather(*(asearch_products(u, top_k=2) for u in unavailable))
+                for u, recs in zip(unavailable, all_recs):
                     if recs:
                         recs_str = " or ".join([r.get("name") for r in recs])
                         recommendations.append(f"{recs_str} instead of {u}")
@@ -242,7 +281,7 @@ async def order_management_agent(state: CoffeeAgentState, config: RunnableConfig
                 else:
                     msg = f"Sorry, I couldn't find any of those items on our menu: {', '.join(unavailable)}."
                 
-                msg = await _generate_dynamic_response(
+                msg = await _respond(
                     action_type="create_error",
                     items_impacted=[],
                     current_order=[],
@@ -250,7 +289,8 @@ async def order_management_agent(state: CoffeeAgentState, config: RunnableConfig
                     unavailable_items=unavailable,
                     status_message=msg,
                     user_input=user_input,
-                    messages=messages
+                    messages=messages,
+                    config=config
                 )
                 return Command(update={"response_message": msg, "messages": [AIMessage(content=msg)]}, goto=END)
 
@@ -260,7 +300,7 @@ async def order_management_agent(state: CoffeeAgentState, config: RunnableConfig
             if user_id != "anonymous":
                 save_order(user_id, new_order, total)
 
-            msg = await _generate_dynamic_response(
+            msg = await _respond(
                 action_type="create",
                 items_impacted=[i.name for i in new_order],
                 current_order=[f"{i.name} x{i.quantity}" for i in new_order],
@@ -268,7 +308,8 @@ async def order_management_agent(state: CoffeeAgentState, config: RunnableConfig
                 unavailable_items=unavailable,
                 status_message=summary,
                 user_input=user_input,
-                messages=messages
+                messages=messages,
+                config=config
             )
 
             return Command(
@@ -278,17 +319,17 @@ async def order_management_agent(state: CoffeeAgentState, config: RunnableConfig
 
         # ── UPDATE ────────────────────────────────────────────────────────────
         elif action == OrderAction.UPDATE:
-            parsed: OrderUpdateState = await (parse_order_update_prompt | _update_llm).ainvoke({
+            parsed: OrderUpdateState = await bounded((parse_order_update_prompt | _update_llm).ainvoke({
                 "user_input": user_input,
                 "existing_order": [f"{i.name} x{i.quantity}" for i in existing_order],
                 "messages": messages,
-            })
+            }), config)
 
             order_dict = {item.name.lower(): item for item in existing_order}
 
-            for update in parsed.updates:
+            products = await _lookup_products([update.name for update in parsed.updates])
+            for update, product in zip(parsed.updates, products):
                 key = update.name.lower()
-                product = _lookup_product(update.name)
                 price = product.get("price", 0.0)
                 image_url = product.get("image_url")
 
@@ -326,7 +367,7 @@ async def order_management_agent(state: CoffeeAgentState, config: RunnableConfig
                 if user_id != "anonymous":
                     cancel_order(user_id)
                 
-                msg = await _generate_dynamic_response(
+                msg = await _respond(
                     action_type="update_empty",
                     items_impacted=[],
                     current_order=[],
@@ -334,7 +375,8 @@ async def order_management_agent(state: CoffeeAgentState, config: RunnableConfig
                     unavailable_items=[],
                     status_message="Your order is now empty. Let me know if you'd like to order something!",
                     user_input=user_input,
-                    messages=messages
+                    messages=messages,
+                    config=config
                 )
                 return Command(
                     update={"order": [], "final_price": 0.0, "response_message": msg, "messages": [AIMessage(content=msg)]},
@@ -345,7 +387,7 @@ async def order_management_agent(state: CoffeeAgentState, config: RunnableConfig
             if user_id != "anonymous":
                 save_order(user_id, updated_order, total)
 
-            msg = await _generate_dynamic_response(
+            msg = await _respond(
                 action_type="update",
                 items_impacted=[f"{u.name} (set to {u.set_quantity if u.set_quantity is not None else 'adjusted by ' + str(u.delta_quantity)})" for u in parsed.updates],
                 current_order=[f"{i.name} x{i.quantity}" for i in updated_order],
@@ -353,7 +395,8 @@ async def order_management_agent(state: CoffeeAgentState, config: RunnableConfig
                 unavailable_items=[],
                 status_message=summary,
                 user_input=user_input,
-                messages=messages
+                messages=messages,
+                config=config
             )
 
             return Command(
@@ -364,6 +407,9 @@ async def order_management_agent(state: CoffeeAgentState, config: RunnableConfig
     except GraphInterrupt:
         # LangGraph HITL needs this bubble up
         raise
+    except DeadlineExceeded:
+        record_degraded(config, "order_action")
+        return Command(update={"response_message": DEADLINE_REPLY}, goto=END)
     except Exception as e:
         logger.error(f"order_management_agent failed: {e}", exc_info=True)
         
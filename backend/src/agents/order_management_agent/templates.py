@@ -0,0 +1,96 @@
+"""Templated order replies — the default instead of an extra responder LLM call.
+
+Every order action already builds its status deterministically (order summary,
+receipt, cancellation notice). The responder LLM only rewords it, which costs
+a third LLM call on every order turn. Here each action type has a small set
+of variants, picked by a stable hash of the user input so a replayed turn
+gets the same wording.
+
+The response mode is chosen per action type:
+
+- ``template`` — always render from the template set
+- ``llm``      — always call the responder (the previous behaviour)
+- ``auto``     — template, unless the user input asks something the status
+                 does not answer (a question, a request for suggestions)
+
+``ORDER_RESPONSE_MODE`` sets the default and ``ORDER_RESPONSE_MODES`` (JSON,
+e.g. ``{"create_error": "llm"}``) overrides single actions.
+"""
+
+import re
+import zlib
+from typing import Dict, Tuple
+
+from src.config import settings
+
+MODES = ("template", "llm", "auto")
+
+# ``{status}`` is the deterministic status message built by the agent
+_TEMPLATES: Dict[str, Tuple[str, ...]] = {
+    "create": (
+        "Great choice! {status}",
+        "Coming right up! {status}",
+        "Lovely pick! {status}",
+    ),
+    "create_error": (
+        "{status}",
+    ),
+    "update": (
+        "Done — I've updated your order. {status}",
+        "All set! {status}",
+        "Updated! {status}",
+    ),
+    "update_empty": (
+        "{status}",
+        "All cleared — your order is empty now. Fancy something else?",
+    ),
+    "cancel": (
+        "{status}",
+        "Order cancelled — no worries. Just say the word if you'd like to start fresh!",
+    ),
+    "confirm": (
+        "{status}\n\nThanks for ordering with Merry's Way ☕",
+        "{status}\n\nEnjoy your coffee! ☕",
+    ),
+    "confirm_empty": (
+        "{status}",
+        "There's nothing in your order yet — what can I get you?",
+    ),
+    "checkout_cancelled": (
+        "{status}",
+        "No problem — checkout was cancelled and your items are still safe in your cart.",
+    ),
+}
+
+# Input the status message cannot answer: questions and requests for advice
+_NEEDS_RESPONDER_RE = re.compile(
+    r"\?|\b(what|which|how|why|recommend|suggest|anything else|is it|are they|does it|do you)\b",
+    re.IGNORECASE,
+)
+
+
+def response_mode(action_type: str) -> str:
+    """Configured mode for ``action_type`` (per-action override, else the default)."""
+    mode = settings.order_response_modes.get(action_type, settings.order_response_mode)
+    return mode if mode in MODES else "auto"
+
+
+def needs_responder(user_input: str) -> bool:
+    """True if the user asked something beyond the order action itself."""
+    return bool(_NEEDS_RESPONDER_RE.search(user_input or ""))
+
+
+def use_responder(action_type: str, user_input: str) -> bool:
+    mode = response_mode(action_type)
+    if mode == "auto":
+        return needs_responder(user_input)
+    return mode == "llm"
+
+
+def render(action_type: str, status_message: str, user_input: str = "") -> str:
+    """Pick a variant for ``action_type`` (stable per input) and fill in the status."""
+    variants = _TEMPLATES.get(action_type)
+    if not variants:
+        return status_message
+    index = zlib.crc32(f"{action_type}:{user_input}".encode()) % len(variants)
+    return variants[index].format(status=status_message)
@@ -4,15 +4,17 @@ from threading import Lock
 from langchain_core.messages import AIMessage
 from langgraph.types import Command
 from langgraph.graph import END
+from langchain_core.runnables import RunnableConfig
 
-from src.utils.util import llm
+from src.utils.util import llm, final_answer
 from src.graph.state import CoffeeAgentState
 from src.recommender import HybridRecommender
 from src.agents.recommendation_management_agent.prompt import recommendation_prompt
+from src.utils.deadline import bounded, record_degraded, DeadlineExceeded, DEADLINE_REPLY
 
 logger = logging.getLogger(__name__)
 
-_chain = recommendation_prompt | llm
+_chain = final_answer(recommendation_prompt | llm)
 
 # Thread-safe lazy singleton — load once at first request, never re-load
 _recommender: HybridRecommender = None
@@ -49,7 +51,14 @@ def _format_ml_products(recommendations: list[dict]) -> str:
     return "\n".join(lines)
 
 
-async def recommendation_management_agent(state: CoffeeAgentState) -> Command:
+def _templated_recommendations(recommendations: list[dict]) -> str:
+    """Plain rendering of the ML picks, used when there is no time left for the LLM."""
+    lines = [f"• {r['name']} (₹{r['price']}) — {r['reason']}" for r in recommendations]
+    return "Here are a few picks I think you'll like:\n" + "\n".join(lines) + "\n\nWant me to add any of these to your order?"
+
+
+async def recommendation_management_agent(state: CoffeeAgentState, config: RunnableConfig) -> Command:
+    recommendations = []
     try:
         memory = state.user_memory
         rec = _get_recommender()
@@ -73,7 +82,7 @@ async def recommendation_management_agent(state: CoffeeAgentState) -> Command:
         )
 
         # LLM formats the ML output into natural language
-        response = await _chain.ainvoke({
+        response = await bounded(_chain.ainvoke({
             "user_input": state.user_input,
             "likes": memory.likes or "no preferences noted",
             "dislikes": memory.dislikes or "none",
@@ -81,7 +90,7 @@ async def recommendation_management_agent(state: CoffeeAgentState) -> Command:
             "last_order": memory.last_order or "no previous order",
             "time_of_day": _time_context(),
             "products": _format_ml_products(recommendations),
-        })
+        }), config)
 
         msg = response.content
         return Command(
@@ -89,6 +98,14 @@ async def recommendation_management_agent(state: CoffeeAgentState) -> Command:
             goto=END,
         )
 
+    except DeadlineExceeded:
+        record_degraded(config, "recommendation_reply")
+        msg = _templated_recommendations(recommendations) if recommendations else DEADLINE_REPLY
+        return Command(
+            update={"response_message": msg, "messages": [AIMessage(content=msg)]},
+            goto=END,
+        )
+
     except Exception as e:
         logger.error(f"recommendation_management_agent failed: {e}", exc_info=True)
         
@@ -3,6 +3,7 @@
 from src.agents.router_agent.agent import router_agent
 from src.agents.router_agent.prompt import router_prompt
 from src.agents.router_agent.schema import AgentDecision, AgentType
+from src.agents.router_agent.fast_path import fast_route, get_fast_router_stats
 
 # Backward compatibility alias
 router_node = router_agent
@@ -13,4 +14,6 @@ __all__ = [
     "router_prompt",
     "AgentDecision",
     "AgentType",
+    "fast_route",
+    "get_fast_router_stats",
 ]
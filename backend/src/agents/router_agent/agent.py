@@ -1,37 +1,95 @@
+import asyncio
+import logging
+import random
+
 from langgraph.types import Command
 from langgraph.graph import END
+from langchain_core.runnables import RunnableConfig
+from src.config import settings
 from src.graph.state import CoffeeAgentState
-from src.utils.util import small_llm
+from src.utils.util import small_llm, llm_priority
 from src.agents.router_agent.schema import AgentDecision
 from src.agents.router_agent.prompt import router_prompt
+from src.agents.router_agent.fast_path import fast_route, stats as fast_path_stats
+from src.utils.deadline import bounded
+
+logger = logging.getLogger(__name__)
+
+# Strong references so shadow checks are not garbage-collected mid-flight
+_shadow_tasks: set = set()
+
+
+async def _llm_route(state: CoffeeAgentState, config: RunnableConfig = None) -> dict:
+    """Ask the small model for an AgentDecision (raises on LLM errors)."""
+    structured_llm = small_llm.with_structured_output(AgentDecision)
+    chain = llm_priority(router_prompt | structured_llm, "router")
+
+    # Strip to clean role:content pairs — avoid leaking metadata/tool_calls into the prompt
+    def _fmt(m) -> str:
+        role = "user" if m.__class__.__name__ == "HumanMessage" else "assistant"
+        content = m.content if isinstance(m.content, str) else str(m.content)
+        return f"{role}: {content}"
 
-async def router_agent(state: CoffeeAgentState) -> Command:
+    recent = state.messages[-6:]  # last 3 turns is enough context for routing
+    formatted_messages = "\n".join(_fmt(m) for m in recent) or "(no prior messages)"
+
+    result = await bounded(chain.ainvoke({
+        "user_input": state.user_input,
+        "order": [f"{i.name} x{i.quantity}" for i in state.order] or "empty",
+        "messages": formatted_messages,
+    }), config)
+    return result.model_dump(mode='json')
+
+
+async def _shadow_check(state: CoffeeAgentState, fast_target: str, rule: str) -> None:
+    """Compare a fast-path decision with the LLM router (off the critical path)."""
+    try:
+        llm_target = (await _llm_route(state))['target_agent']
+    except Exception as e:
+        logger.debug(f"Router shadow check skipped: {e}")
+        return
+    agreed = llm_target == fast_target
+    fast_path_stats.record_shadow(agreed)
+    if not agreed:
+        logger.warning(
+            f"Fast router disagreement ({rule}): '{state.user_input[:60]}' -> {fast_target}, LLM says {llm_target}"
+        )
+
+
+def try_fast_route(state: CoffeeAgentState):
+    """A confident deterministic route, or None to fall back to the LLM."""
+    if not settings.router_fast_path_enabled:
+        return None
+
+    route = fast_route(state.user_input, has_order=bool(state.order))
+    used = route is not None and route.confidence >= settings.router_fast_path_min_confidence
+    fast_path_stats.record(route, used)
+    if not used:
+        return None
+
+    logger.info(f"Fast router: '{state.user_input[:40]}' -> {route.target_agent} ({route.rule}, {route.confidence:.2f})")
+    if random.random() < settings.router_fast_path_shadow_rate:
+        task = asyncio.create_task(_shadow_check(state, route.target_agent, route.rule))
+        _shadow_tasks.add(task)
+        task.add_done_callback(_shadow_tasks.discard)
+    return route
+
+
+async def router_agent(state: CoffeeAgentState, config: RunnableConfig) -> Command:
     """
-    Decides which specialist agent (Details, Order, Recommendation, Update) 
+    Decides which specialist agent (Details, Order, Recommendation, Update)
     should handle the user's refined query.
+
+    Obvious intents (greetings, thanks, confirm/cancel) are routed by the
+    deterministic fast path; everything else goes to the small LLM.
     """
+    route = try_fast_route(state)
+    if route is not None:
+        return Command(update={"response_message": ""}, goto=route.target_agent)
 
-    structured_llm = small_llm.with_structured_output(AgentDecision)
-    chain = router_prompt | structured_llm
-    
     try:
-        # Strip to clean role:content pairs — avoid leaking metadata/tool_calls into the prompt
-        def _fmt(m) -> str:
-            role = "user" if m.__class__.__name__ == "HumanMessage" else "assistant"
-            content = m.content if isinstance(m.content, str) else str(m.content)
-            return f"{role}: {content}"
-
-        recent = state.messages[-6:]  # last 3 turns is enough context for routing
-        formatted_messages = "\n".join(_fmt(m) for m in recent) or "(no prior messages)"
-
-        result = await chain.ainvoke({
-            "user_input": state.user_input,
-            "order": [f"{i.name} x{i.quantity}" for i in state.order] or "empty",
-            "messages": formatted_messages,
-        })
-
-        result = result.model_dump(mode='json')
-        
+        result = await _llm_route(state, config)
+
         return Command(
             update={
                 "response_message": result.get('response_message', "")
@@ -40,16 +98,15 @@ async def router_agent(state: CoffeeAgentState) -> Command:
         )
 
     except Exception as e:
-        import logging
-        logging.getLogger(__name__).error(f"router_agent failed: {e}", exc_info=True)
-        
+        logger.error(f"router_agent failed: {e}", exc_info=True)
+
         # Check for specific LLM API errors
         from src.utils.util import get_llm_error_message
         msg = get_llm_error_message(e) or "Sorry, I'm having trouble understanding your request right now. Could you please try again?"
-        
+
         return Command(
             update={
                 "response_message": msg
             },
             goto=END,
-        )
\ No newline at end of file
+        )
@@ -0,0 +1,156 @@
+"""Deterministic pre-router for high-frequency intents.
+
+Greetings, thanks, "confirm", "cancel my order" and friends make up a large
+share of turns and never need an LLM to route. ``fast_route`` checks a
+compiled pattern set (plus the order state) and, failing that, a tiny
+keyword-vote classifier. It returns a route only when confident; everything
+ambiguous falls through to the LLM router.
+
+A sampled fraction of fast-path decisions is re-checked against the LLM
+router in the background ("shadow" mode) so routing accuracy is measured,
+not assumed. Counters are available from ``get_fast_router_stats()``.
+"""
+
+import logging
+import re
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Pattern, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+GENERAL = "general_agent"
+DETAILS = "details_management_agent"
+ORDER = "order_management_agent"
+RECOMMEND = "recommendation_management_agent"
+
+
+@dataclass(frozen=True)
+class FastRoute:
+    target_agent: str
+    confidence: float
+    rule: str
+
+
+def _rx(pattern: str) -> Pattern:
+    return re.compile(pattern, re.IGNORECASE)
+
+
+_END = r"[\s!.?,:;)(\-]*$"
+
+# (rule name, pattern, target, confidence, requires an active order)
+_RULES: Sequence[Tuple[str, Pattern, str, float, bool]] = (
+    ("greeting", _rx(r"^(hi+|hello+|hey+|hiya|yo|howdy|good (morning|afternoon|evening))( there)?" + _END), GENERAL, 0.98, False),
+    ("thanks", _rx(r"^(thanks?( you)?( so much)?|thank u|thx|ty|cheers|much appreciated)" + _END), GENERAL, 0.97, False),
+    ("farewell", _rx(r"^(bye+|goodbye|see (you|ya)( later)?|good ?night|have a (good|nice) (day|one))" + _END), GENERAL, 0.97, False),
+    ("order_status", _rx(r"^(what'?s|what is|show( me)?|check) (in )?my (current )?order" + _END), GENERAL, 0.95, False),
+    ("order_status", _rx(r"^what (have|did) i order(ed)?" + _END), GENERAL, 0.95, False),
+    ("cancel_order", _rx(r"^(please )?cancel (my|the|this) (whole |entire )?order( please)?" + _END), ORDER, 0.96, False),
+    ("confirm_order", _rx(r"^(yes|yeah|yep|ok(ay)?|sure)?[, ]*(please )?(confirm|place|checkout|check out)( (it|my order|the order|order))?( please)?" + _END), ORDER, 0.96, True),
+    ("confirm_order", _rx(r"^(yes|yeah|yep)( please)?" + _END), ORDER, 0.92, True),
+    ("modify_order", _rx(r"^(please )?(add|remove|delete) .+ (to|from) (my|the) order" + _END), ORDER, 0.95, False),
+    ("recommend", _rx(r"^(what (do|would) you (recommend|suggest)|(can you |could you )?(recommend|suggest) (me )?(something|anything)|surprise me)" + _END), RECOMMEND, 0.93, False),
+)
+
+# Keyword-vote classifier for what the rules don't cover. Each cue votes for
+# one agent with a weight; confidence = vote share × evidence strength.
+_CUES: Dict[str, List[Tuple[Pattern, float]]] = {
+    DETAILS: [
+        (_rx(r"\bhow much (is|are|does|do)\b"), 1.0),
+        (_rx(r"\b(price|cost|calories|ingredients?)\b"), 1.0),
+        (_rx(r"\bdo you (have|sell|serve)\b"), 1.0),
+        (_rx(r"\b(menu|opening hours|open|close|location|delivery)\b"), 1.0),
+        (_rx(r"\bwhat'?s in (a|an|the)\b"), 1.0),
+    ],
+    ORDER: [
+        (_rx(r"\b(i('d| would) like|i want|can i (get|have)|get me|give me)\b"), 1.0),
+        (_rx(r"\b(add|remove|cancel|make it)\b"), 1.0),
+        (_rx(r"\b\d+ (x )?[a-z]+s?\b"), 0.5),
+        (_rx(r"\bplease\b"), 0.25),
+    ],
+    RECOMMEND: [
+        (_rx(r"\b(recommend|suggest|suggestion|surprise)\b"), 1.5),
+        (_rx(r"\bwhat should i (get|order|try|have)\b"), 1.5),
+    ],
+}
+
+# Cues that mean the user asks about their own order (→ general, per the router prompt)
+_OWN_ORDER_RE = _rx(r"\bmy (current )?order\b")
+
+
+def _classify(text: str) -> Optional[FastRoute]:
+    votes = {agent: sum(w for rx, w in cues if rx.search(text)) for agent, cues in _CUES.items()}
+    total = sum(votes.values())
+    if not total:
+        return None
+    agent, top = max(votes.items(), key=lambda kv: kv[1])
+    confidence = (top / total) * min(1.0, top / 2.0)
+    return FastRoute(agent, round(confidence, 3), "classifier")
+
+
+def fast_route(user_input: str, has_order: bool) -> Optional[FastRoute]:
+    """Best deterministic guess for ``user_input`` (None if nothing matched)."""
+    text = (user_input or "").strip()
+    if not text or len(text) > 200:
+        return None
+
+    for rule, rx, target, confidence, needs_order in _RULES:
+        if rx.match(text):
+            if needs_order and not has_order:
+                continue
+            return FastRoute(target, confidence, rule)
+
+    if _OWN_ORDER_RE.search(text):
+        # Status vs modification of the current order is the LLM's call
+        return None
+    return _classify(text)
+
+
+# ── Metrics ───────────────────────────────────────────────────────────────────
+
+class FastRouterStats:
+    """Hit rate of the fast path and agreement with the LLM router in shadow checks."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.turns = 0
+        self.fast_hits = 0
+        self.llm_fallbacks = 0
+        self.shadow_checks = 0
+        self.shadow_agreements = 0
+        self.by_rule: Dict[str, int] = {}
+
+    def record(self, route: Optional[FastRoute], used: bool) -> None:
+        with self._lock:
+            self.turns += 1
+            if used:
+                self.fast_hits += 1
+                self.by_rule[route.rule] = self.by_rule.get(route.rule, 0) + 1
+            else:
+                self.llm_fallbacks += 1
+
+    def record_shadow(self, agreed: bool) -> None:
+        with self._lock:
+            self.shadow_checks += 1
+            self.shadow_agreements += int(agreed)
+
+    def snapshot(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "turns": self.turns,
+                "fast_hits": self.fast_hits,
+                "llm_fallbacks": self.llm_fallbacks,
+                "hit_rate": round(self.fast_hits / self.turns, 4) if self.turns else 0.0,
+                "shadow_checks": self.shadow_checks,
+                "shadow_accuracy": (
+                    round(self.shadow_agreements / self.shadow_checks, 4) if self.shadow_checks else None
+                ),
+                "by_rule": dict(self.by_rule),
+            }
+
+
+stats = FastRouterStats()
+
+
+def get_fast_router_stats() -> Dict[str, object]:
+    return stats.snapshot()
@@ -3,7 +3,7 @@ Single source of truth for all configuration.
 Uses pydantic-settings — reads from .env automatically.
 """
 
-from typing import Optional
+from typing import Dict, List, Optional
 from pydantic import SecretStr
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -42,10 +42,61 @@ class Settings(BaseSettings):
     groq_api_key: str = ""
     groq_model: str = "llama-3.3-70b-versatile"
     llm_timeout_seconds: int = 30
+    llm_coalescing_enabled: bool = True       # share one provider call among identical concurrent prompts
+
+    # ── LLM hedging ───────────────────────────────────────────────────────────
+    llm_hedging_enabled: bool = False             # race OpenRouter against a slow Groq call (needs both keys)
+    llm_hedge_quantile: float = 0.9               # hedge once the primary is slower than this latency quantile
+    llm_hedge_min_delay_seconds: float = 0.3      # never hedge earlier than this
+    llm_hedge_initial_delay_seconds: float = 3.0  # hedge delay until enough samples are tracked
+    llm_hedge_min_samples: int = 20
+    llm_hedge_max_rate: float = 0.1               # share of calls that may fire a hedge
+    llm_latency_window: int = 200                 # samples kept per provider (and calls for the hedge rate)
+
+    # ── LLM circuit breakers ──────────────────────────────────────────────────
+    llm_breaker_enabled: bool = True
+    llm_breaker_window: int = 20                  # last N calls per provider the rates are taken over
+    llm_breaker_min_calls: int = 5                # never trip on fewer calls than this
+    llm_breaker_failure_rate: float = 0.5         # errors, 429s and timeouts
+    llm_breaker_slow_call_seconds: float = 10.0   # a call (or first streamed chunk) slower than this is "slow"
+    llm_breaker_slow_rate: float = 0.8
+    llm_breaker_cooldown_seconds: float = 30.0    # open → half-open
+    llm_breaker_half_open_probes: int = 1         # concurrent trial calls while half-open
+
+    # ── LLM admission control ─────────────────────────────────────────────────
+    # Opt-in per deployment. Budgets are per process (missing / 0 = unlimited): with N
+    # workers, set each to your plan's limit / N, e.g. {"groq": 30} on Groq's free tier with one worker
+    llm_admission_enabled: bool = False
+    llm_requests_per_minute: Dict[str, int] = {}
+    llm_tokens_per_minute: Dict[str, int] = {}
+    # Share of each bucket a priority class may not use (kept for the classes above it)
+    llm_admission_reserve: Dict[str, float] = {"router": 0.05, "memory": 0.2, "admin": 0.4}
+    # Longest a call of each class queues for a provider with no fallback before it is shed
+    llm_admission_max_wait_seconds: Dict[str, float] = {"answer": 10.0, "router": 5.0, "memory": 2.0, "admin": 20.0}
+    # With a fallback provider, any class fails over to it after queueing this long
+    llm_admission_failover_wait_seconds: float = 0.25
+    llm_admission_expected_output_tokens: int = 256  # charged up front, corrected from the reported usage
+    llm_admission_poll_seconds: float = 0.05
+
+    # ── Request deadlines ─────────────────────────────────────────────────────
+    request_budget_chat_seconds: float = 25.0     # whole turn, preload included
+    request_budget_stream_seconds: float = 30.0
+    request_budget_resume_seconds: float = 15.0
+    deadline_reserve_seconds: float = 0.5         # kept back for persisting and returning the reply
+    deadline_optional_step_seconds: float = 8.0   # skip memory extraction / order responder below this
 
     # ── Embeddings ────────────────────────────────────────────────────────────
     embedding_model: str = "BAAI/bge-base-en-v1.5"  # must match pgvector index dimension (768)
+    embedding_backend: str = "hf_endpoint"          # "hf_endpoint" | "local" (sentence-transformers) | "hashing"
+    embedding_local_path: str = ""                  # local model dir for the "local" backend
+    embedding_device: str = "cpu"
+    embedding_dim: int = 768
     hf_api_key: str = ""
+    embedding_cache_max_bytes: int = 32 * 1024 * 1024   # in-memory LRU budget for query vectors
+    embedding_cache_ttl_seconds: int = 7 * 24 * 3600
+    embedding_cache_path: str = ""                      # optional SQLite file for the on-disk tier
+    embedding_phrase_table_path: str = ""               # precomputed catalog-vocabulary vectors (.npz)
+    embedding_phrase_max_ngram: int = 3
 
     # ── Pinecone (DEPRECATED: Using Supabase pgvector) ──────────────────────
     pinecone_api_key: Optional[str] = None
@@ -56,6 +107,41 @@ class Settings(BaseSettings):
     retriever_max_top_k: int = 50
     retriever_timeout_seconds: int = 30
     retriever_retry_attempts: int = 3
+    catalog_refresh_seconds: int = 600        # in-process ProductCatalog reload interval
+    catalog_version_poll_seconds: int = 30    # how often to check coffee_shop_catalog_meta (0 = off)
+    retriever_search_backend: str = "pgvector"  # "pgvector" | "local" (in-process NumPy index)
+    retriever_vector_snapshot_path: str = ""    # optional .npz snapshot for the local backend
+    retriever_fuzzy_min_confidence: float = 0.82 # lexical typo match needed to skip the embedding call
+    retriever_rrf_k: int = 60                   # reciprocal-rank fusion constant for BM25 + vector
+    retriever_hybrid_pool: int = 20             # candidates pulled from each ranker before fusion
+    retriever_result_cache_size: int = 512      # cached search result lists (0 = disabled)
+    retriever_result_cache_ttl_seconds: int = 600
+
+    # ── Response cache ────────────────────────────────────────────────────────
+    response_cache_size: int = 256                 # cached final answers (0 = disabled)
+    response_cache_ttl_seconds: int = 1800
+    response_cache_similarity: float = 0.93        # cosine needed for a semantic hit (1.0 = exact only)
+    response_cache_agents: List[str] = ["details_management_agent"]  # user-independent agents only
+
+    # ── Details agent tools ───────────────────────────────────────────────────
+    details_tool_timeout_seconds: float = 10.0   # per tool call (still capped by the request deadline)
+    details_tool_concurrency: int = 8            # tool calls in flight per turn (one tool round)
+
+    # ── Routing ───────────────────────────────────────────────────────────────
+    front_end_mode: str = "staged"                 # "staged" (3 nodes) | "fused" (1 LLM call) | "ab"
+    front_end_fused_share: float = 0.5             # share of threads on the fused front end in "ab" mode
+    router_fast_path_enabled: bool = True
+    router_fast_path_min_confidence: float = 0.9   # below this the LLM router decides
+    router_fast_path_shadow_rate: float = 0.05     # share of fast-path turns re-checked by the LLM
+
+    # ── Memory gate ───────────────────────────────────────────────────────────
+    memory_gate_enabled: bool = True
+    memory_gate_threshold: float = 0.5     # lower = more recall (more LLM calls), higher = more precision
+    memory_gate_shadow_rate: float = 0.02  # share of skipped messages still extracted to measure misses
+
+    # ── Order replies ─────────────────────────────────────────────────────────
+    order_response_mode: str = "auto"          # "template" | "llm" (responder call) | "auto" (LLM only for questions)
+    order_response_modes: Dict[str, str] = {}  # per-action overrides, e.g. {"create_error": "llm"}
 
     # ── Rate limiting ─────────────────────────────────────────────────────────
     enable_rate_limiting: bool = True
@@ -127,9 +213,45 @@ class Config:
     GROQ_API_KEY = settings.groq_api_key
     GROQ_MODEL = settings.groq_model
     LLM_TIMEOUT_SECONDS = settings.llm_timeout_seconds
+    LLM_COALESCING_ENABLED = settings.llm_coalescing_enabled
+    LLM_HEDGING_ENABLED = settings.llm_hedging_enabled
+    LLM_HEDGE_QUANTILE = settings.llm_hedge_quantile
+    LLM_HEDGE_MIN_DELAY_SECONDS = settings.llm_hedge_min_delay_seconds
+    LLM_HEDGE_INITIAL_DELAY_SECONDS = settings.llm_hedge_initial_delay_seconds
+    LLM_HEDGE_MIN_SAMPLES = settings.llm_hedge_min_samples
+    LLM_HEDGE_MAX_RATE = settings.llm_hedge_max_rate
+    LLM_LATENCY_WINDOW = settings.llm_latency_window
+    LLM_BREAKER_ENABLED = settings.llm_breaker_enabled
+    LLM_BREAKER_WINDOW = settings.llm_breaker_window
+    LLM_BREAKER_MIN_CALLS = settings.llm_breaker_min_calls
+    LLM_BREAKER_FAILURE_RATE = settings.llm_breaker_failure_rate
+    LLM_BREAKER_SLOW_CALL_SECONDS = settings.llm_breaker_slow_call_seconds
+    LLM_BREAKER_SLOW_RATE = settings.llm_breaker_slow_rate
+    LLM_BREAKER_COOLDOWN_SECONDS = settings.llm_breaker_cooldown_seconds
+    LLM_BREAKER_HALF_OPEN_PROBES = settings.llm_breaker_half_open_probes
+    LLM_ADMISSION_ENABLED = settings.llm_admission_enabled
+    LLM_REQUESTS_PER_MINUTE = settings.llm_requests_per_minute
+    LLM_TOKENS_PER_MINUTE = settings.llm_tokens_per_minute
+    LLM_ADMISSION_RESERVE = settings.llm_admission_reserve
+    LLM_ADMISSION_MAX_WAIT_SECONDS = settings.llm_admission_max_wait_seconds
+    LLM_ADMISSION_FAILOVER_WAIT_SECONDS = settings.llm_admission_failover_wait_seconds
+    LLM_ADMISSION_EXPECTED_OUTPUT_TOKENS = settings.llm_admission_expected_output_tokens
+    LLM_ADMISSION_POLL_SECONDS = settings.llm_admission_poll_seconds
+    REQUEST_BUDGET_CHAT_SECONDS = settings.request_budget_chat_seconds
+    REQUEST_BUDGET_STREAM_SECONDS = settings.request_budget_stream_seconds
+    REQUEST_BUDGET_RESUME_SECONDS = settings.request_budget_resume_seconds
 
     EMBEDDING_MODEL = settings.embedding_model
+    EMBEDDING_BACKEND = settings.embedding_backend
+    EMBEDDING_LOCAL_PATH = settings.embedding_local_path
+    EMBEDDING_DEVICE = settings.embedding_device
+    EMBEDDING_DIM = settings.embedding_dim
     HF_API_KEY = settings.hf_api_key
+    EMBEDDING_CACHE_MAX_BYTES = settings.embedding_cache_max_bytes
+    EMBEDDING_CACHE_TTL_SECONDS = settings.embedding_cache_ttl_seconds
+    EMBEDDING_CACHE_PATH = settings.embedding_cache_path
+    EMBEDDING_PHRASE_TABLE_PATH = settings.embedding_phrase_table_path
+    EMBEDDING_PHRASE_MAX_NGRAM = settings.embedding_phrase_max_ngram
 
     PINECONE_API_KEY = settings.pinecone_api_key
     PINECONE_INDEX_NAME = settings.pinecone_index_name
@@ -169,3 +291,12 @@ class RetrieverConfig:
     max_top_k = settings.retriever_max_top_k
     timeout_seconds = settings.retriever_timeout_seconds
     retry_attempts = settings.retriever_retry_attempts
+    catalog_refresh_seconds = settings.catalog_refresh_seconds
+    catalog_version_poll_seconds = settings.catalog_version_poll_seconds
+    search_backend = settings.retriever_search_backend
+    vector_snapshot_path = settings.retriever_vector_snapshot_path
+    fuzzy_min_confidence = settings.retriever_fuzzy_min_confidence
+    rrf_k = settings.retriever_rrf_k
+    hybrid_pool = settings.retriever_hybrid_pool
+    result_cache_size = settings.retriever_result_cache_size
+    result_cache_ttl_seconds = settings.retriever_result_cache_ttl_seconds
@@ -1,5 +1,6 @@
 from langgraph.graph import StateGraph, START, END
 from src.agents.input_processor_agent import input_processor_agent
+from src.agents.front_end_agent import front_end_agent, front_end_memory_agent, select_front_end
 from src.agents.memory_management_agent import memory_agent
 from src.agents.router_agent import router_agent
 from src.agents.details_management_agent import details_management_agent
@@ -8,6 +9,7 @@ from src.agents.general_agent import general_agent
 from src.agents.recommendation_management_agent import recommendation_management_agent
 
 from src.graph.state import CoffeeAgentState
+from src.utils.metrics import instrument_node
 import os
 
 _checkpointer = None
@@ -89,15 +91,28 @@ def _get_checkpointer():
 def build_coffee_shop_graph():
     builder = StateGraph(CoffeeAgentState)
 
-    builder.add_node("input_processor", input_processor_agent)
-    builder.add_node("memory", memory_agent)
-    builder.add_node("router", router_agent)
-    builder.add_node("details_management_agent", details_management_agent)
-    builder.add_node("order_management_agent", order_management_agent)
-    builder.add_node("recommendation_management_agent", recommendation_management_agent)
-    builder.add_node("general_agent", general_agent)
-
-    builder.add_edge(START, "input_processor")
-    builder.add_edge("memory", "router")
+    # Every node is wrapped for per-node wall-time metrics (see src/utils/metrics.py)
+    for name, node in [
+        ("input_processor", input_processor_agent),
+        ("front_end", front_end_agent),
+        ("front_end_memory", front_end_memory_agent),
+        ("memory", memory_agent),
+        ("router", router_agent),
+        ("details_management_agent", details_management_agent),
+        ("order_management_agent", order_management_agent),
+        ("recommendation_management_agent", recommendation_management_agent),
+        ("general_agent", general_agent),
+    ]:
+        builder.add_node(name, instrument_node(name, node))
+
+    # FRONT_END_MODE picks the staged path (input_processor → memory ∥ router)
+    # or the fused single-call front_end; "ab" splits threads between them.
+    #
+    # input_processor fans out to memory + router in one superstep. The router
+    # picks the agent via Command(goto); that agent runs in the next superstep,
+    # i.e. only after memory has finished. If memory raises a HITL interrupt,
+    # the router's completed write is kept as a pending write and replayed on
+    # resume instead of re-running the router.
+    builder.add_conditional_edges(START, select_front_end, ["input_processor", "front_end"])
 
     return builder.compile(checkpointer=_get_checkpointer())
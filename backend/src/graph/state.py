@@ -23,3 +23,6 @@ class CoffeeAgentState(BaseModel):
     response_message: Optional[str] = ""
     order: List[ProductItem] = Field(default_factory=list)
     final_price: float = 0.0
+    # Fused front end: memory intent awaiting HITL approval and the agent to run after it
+    pending_memory: Optional[dict] = None
+    route: Optional[str] = None
@@ -0,0 +1,74 @@
+"""Async Supabase (PostgREST) client for the retriever hot path.
+
+supabase-py is synchronous, so calling it from an async agent blocks the
+event loop for every concurrent chat stream on the worker. This thin
+httpx.AsyncClient wrapper covers the two calls the retriever needs — table
+selects and RPCs — and keeps one pooled client per event loop so connections
+are reused across requests.
+"""
+
+import asyncio
+import logging
+import weakref
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from src.config import RetrieverConfig
+from src.memory.supabase_client import SUPABASE_URL, SUPABASE_SERVICE_KEY
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncSupabaseRest:
+    """Minimal async PostgREST client (service role — server-side only)."""
+
+    def __init__(self, url: str = SUPABASE_URL, key: str = SUPABASE_SERVICE_KEY, timeout: float = None):
+        self._client = httpx.AsyncClient(
+            base_url=f"{url.rstrip('/')}/rest/v1",
+            headers={
+                "apikey": key,
+                "Authorization": f"Bearer {key}",
+                "Content-Type": "application/json",
+            },
+            timeout=timeout or RetrieverConfig.timeout_seconds,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+        )
+
+    async def rpc(self, fn: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        res = await self._client.post(f"/rpc/{fn}", json=params)
+        res.raise_for_status()
+        return res.json() or []
+
+    async def select_in(self, table: str, column: str, values: List[str], columns: str = "*") -> List[Dict[str, Any]]:
+        """SELECT ``columns`` FROM ``table`` WHERE ``column`` IN (values)."""
+        quoted = ",".join('"' + v.replace('"', '\\"') + '"' for v in values)
+        res = await self._client.get(f"/{table}", params={"select": columns, column: f"in.({quoted})"})
+        res.raise_for_status()
+        return res.json() or []
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+# httpx connection pools are bound to the loop that created them — keep one
+# client per running loop. Keyed on the loop object itself (weakly), so a
+# closed loop's client goes with it and a recycled id() never hands out a
+# client bound to a dead loop.
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncSupabaseRest]" = weakref.WeakKeyDictionary()
+
+
+def get_async_supabase() -> AsyncSupabaseRest:
+    loop = asyncio.get_running_loop()
+    client: Optional[AsyncSupabaseRest] = _clients.get(loop)
+    if client is None:
+        client = _clients[loop] = AsyncSupabaseRest()
+        logger.info("Async Supabase REST client created")
+    return client
+
+
+async def close_async_supabase() -> None:
+    """Close the client owned by the running loop (call on app shutdown)."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
@@ -0,0 +1,129 @@
+"""In-memory BM25 index over the product catalog.
+
+Vector similarity alone has weak recall for literal attribute queries
+("oat milk", "gluten-free", "almond"), which makes the details agent loop
+extra tool calls. BM25 over name, category, ingredients and description
+catches those lexically; ``src/rag/retriever.hybrid_search_products`` fuses
+both rankings with reciprocal-rank fusion.
+"""
+
+import logging
+import math
+import re
+import threading
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+_STOPWORDS = {
+    "a", "an", "the", "and", "or", "with", "of", "for", "in", "on", "to", "it",
+    "do", "you", "have", "has", "what", "which", "is", "are", "any", "some",
+    "me", "i", "your", "our", "we", "can", "get", "show", "there", "that",
+    "this", "something", "anything", "menu", "options", "items",
+}
+
+# Field repetition = cheap BM25F: a hit in the name outweighs one in the prose
+FIELD_WEIGHTS = {"name": 3, "category": 2, "ingredients": 2, "description": 1}
+
+
+def _stem(token: str) -> str:
+    """Very light plural folding — enough for menu vocabulary."""
+    if len(token) > 4 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if len(token) > 4 and token.endswith(("ches", "shes", "xes")):
+        return token[:-2]
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    return [_stem(t) for t in _TOKEN_RE.findall((text or "").casefold()) if t not in _STOPWORDS]
+
+
+def product_document(p: Dict[str, Any]) -> List[str]:
+    """Weighted token list for one catalog row."""
+    ingredients = p.get("ingredients") or []
+    if isinstance(ingredients, str):
+        ingredients = [ingredients]
+    fields = {
+        "name": p.get("name") or "",
+        "category": p.get("category") or "",
+        "ingredients": " ".join(str(i) for i in ingredients),
+        "description": p.get("description") or "",
+    }
+    tokens = []
+    for field, text in fields.items():
+        tokens.extend(tokenize(text) * FIELD_WEIGHTS[field])
+    return tokens
+
+
+class BM25Index:
+    """Okapi BM25 (k1, b) over catalog rows."""
+
+    def __init__(self, products: List[Dict[str, Any]], version: int = 0, k1: float = 1.5, b: float = 0.75):
+        self.rows = [{k: v for k, v in p.items() if k != "embedding"} for p in products]
+        self.version = version
+        self.k1 = k1
+        self.b = b
+
+        self._tf: List[Counter] = []
+        self._lengths: List[int] = []
+        df: Dict[str, int] = defaultdict(int)
+        for p in products:
+            tf = Counter(product_document(p))
+            self._tf.append(tf)
+            self._lengths.append(sum(tf.values()))
+            for term in tf:
+                df[term] += 1
+
+        n = len(self.rows)
+        self._avg_len = (sum(self._lengths) / n) if n else 0.0
+        self._idf = {t: math.log(1 + (n - f + 0.5) / (f + 0.5)) for t, f in df.items()}
+
+    def search(self, query: str, top_k: int = 5) -> List[Tuple[Dict[str, Any], float]]:
+        """Top-k (row, bm25_score) pairs with a positive score."""
+        terms = [t for t in tokenize(query) if t in self._idf]
+        if not terms:
+            return []
+
+        scores = []
+        for i, tf in enumerate(self._tf):
+            score = 0.0
+            norm = self.k1 * (1 - self.b + self.b * self._lengths[i] / (self._avg_len or 1.0))
+            for term in terms:
+                f = tf.get(term)
+                if f:
+                    score += self._idf[term] * f * (self.k1 + 1) / (f + norm)
+            if score > 0:
+                scores.append((i, score))
+
+        scores.sort(key=lambda x: x[1], reverse=True)
+        return [(self.rows[i], s) for i, s in scores[:top_k]]
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+
+# ── Lazy singleton (rebuilt whenever the ProductCatalog reloads) ──────────────
+
+_index: Optional[BM25Index] = None
+_index_lock = threading.Lock()
+
+
+def get_bm25_index(reload: bool = True) -> Optional[BM25Index]:
+    global _index
+    from src.rag.catalog import get_product_catalog
+
+    catalog = get_product_catalog()
+    if not catalog.ensure_loaded(reload):
+        return None
+    if _index is None or _index.version != catalog.version:
+        with _index_lock:
+            if _index is None or _index.version != catalog.version:
+                _index = BM25Index(catalog.products(), version=catalog.version)
+                logger.info(f"BM25 index built over {len(_index)} products")
+    return _index
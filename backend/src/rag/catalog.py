@@ -0,0 +1,302 @@
+"""In-process product catalog index.
+
+The catalog is small (a few dozen to a few thousand rows), so the whole
+``coffee_shop_products`` table is loaded once and kept in memory. Name
+resolution then runs against plain dictionaries:
+
+- exact      — the name exactly as stored ("Espresso shot")
+- casefold   — case-insensitive, whitespace-collapsed ("ESPRESSO  SHOT")
+- alias      — punctuation-free, plural and curated variants ("espresso shots")
+
+Call ``refresh()`` after reseeding or ``invalidate()`` to force a reload on
+the next lookup; otherwise the catalog reloads itself every
+``RetrieverConfig.catalog_refresh_seconds``. One thread reloads at a time while
+the others keep serving the previous snapshot; async code reloads through
+``asyncio.to_thread`` and reads with ``ensure_loaded(reload=False)``.
+
+Seeding scripts call ``bump_catalog_version()``, which increments the row in
+``coffee_shop_catalog_meta``. Every server polls that single row every
+``RetrieverConfig.catalog_version_poll_seconds`` and reloads when it moves,
+so caches keyed on ``ProductCatalog.cache_version`` never serve stale prices
+yet survive the periodic TTL reloads.
+"""
+
+import logging
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from src.config import RetrieverConfig
+
+logger = logging.getLogger(__name__)
+
+TABLE = "coffee_shop_products"
+META_TABLE = "coffee_shop_catalog_meta"
+META_KEY = "products"
+REFRESH_RETRY_SECONDS = 30  # back-off between failed reloads so an outage doesn't cost every lookup
+# Columns the lookups, BM25 and the result formatters read. The embedding
+# column is only pulled when the local vector index is built from the catalog.
+COLUMNS = ("id", "name", "category", "description", "price", "rating", "ingredients", "image_url")
+
+# Curated aliases for names customers commonly say differently from the menu.
+_EXTRA_ALIASES: Dict[str, List[str]] = {
+    "Espresso shot": ["espresso", "single espresso", "shot of espresso"],
+    "Carmel syrup": ["caramel syrup", "caramel"],
+    "Pumpkin Spice Latte": ["psl"],
+    "Pain au Chocolat": ["pain au chocolate"],
+}
+
+_PUNCT_RE = re.compile(r"[^\w\s]")
+_SPACE_RE = re.compile(r"\s+")
+_PARENS_RE = re.compile(r"\([^)]*\)")
+
+
+def normalize_name(name: str) -> str:
+    """Case-fold and collapse whitespace — the key used for case-folded lookups."""
+    return _SPACE_RE.sub(" ", (name or "").casefold()).strip()
+
+
+def _strip_punctuation(key: str) -> str:
+    return _SPACE_RE.sub(" ", _PUNCT_RE.sub(" ", key)).strip()
+
+
+def _plural_variants(key: str) -> List[str]:
+    """Naive singular/plural forms of the last word ("latte" ↔ "lattes")."""
+    if not key:
+        return []
+    if key.endswith("es") and len(key) > 3:
+        return [key[:-2], key[:-1]]
+    if key.endswith("s") and len(key) > 2:
+        return [key[:-1]]
+    if key.endswith(("ch", "sh", "x")):
+        return [key + "es"]
+    return [key + "s"]
+
+
+def alias_keys(name: str) -> List[str]:
+    """All alias keys derived from a product name (excluding the case-folded key)."""
+    base = normalize_name(name)
+    candidates = {
+        _strip_punctuation(base),
+        _strip_punctuation(_PARENS_RE.sub(" ", base)),
+        _strip_punctuation(base.replace("&", " and ")),
+    }
+    for key in list(candidates):
+        candidates.update(_plural_variants(key))
+    candidates.discard(base)
+    candidates.discard("")
+    return sorted(candidates)
+
+
+def fetch_catalog_version(client) -> Optional[int]:
+    """Current persisted catalog version, or None if the meta row is missing."""
+    res = client.table(META_TABLE).select("version").eq("id", META_KEY).limit(1).execute()
+    rows = res.data or []
+    return int(rows[0]["version"]) if rows else None
+
+
+def bump_catalog_version(client) -> Optional[int]:
+    """Atomically increment the persisted catalog version after a reseed.
+
+    Returns the new version, or None if the meta table has not been created
+    yet (servers then only pick up changes on their TTL reload).
+    """
+    try:
+        res = client.rpc("bump_coffee_catalog_version", {}).execute()
+        version = int(res.data)
+        logger.info(f"Catalog version bumped to {version}")
+        return version
+    except Exception as e:
+        logger.warning(f"Could not bump catalog version (run supabase_db/schema.sql?): {e}")
+        return None
+
+
+class ProductCatalog:
+    """Thread-safe, lazily loaded in-memory index over ``coffee_shop_products``."""
+
+    def __init__(self, client=None, ttl_seconds: Optional[int] = None):
+        self._client = client
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else RetrieverConfig.catalog_refresh_seconds
+        self._lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self._rows: List[Dict[str, Any]] = []
+        self._exact: Dict[str, Dict[str, Any]] = {}
+        self._folded: Dict[str, Dict[str, Any]] = {}
+        self._aliases: Dict[str, Dict[str, Any]] = {}
+        self._loaded_at: float = 0.0
+        self._failed_at: float = 0.0
+        self._checked_at: float = 0.0
+        self.version: int = 0
+        self.remote_version: Optional[int] = None
+        self.version_poll_seconds = RetrieverConfig.catalog_version_poll_seconds
+
+    # ── Loading ───────────────────────────────────────────────────────────────
+
+    @property
+    def client(self):
+        if self._client is None:
+            from src.memory.supabase_client import supabase_admin
+            self._client = supabase_admin
+        return self._client
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._loaded_at > 0
+
+    @property
+    def cache_version(self) -> int:
+        """Version to key caches of catalog-derived results on.
+
+        The persisted version, which only moves on a reseed — not the
+        in-process ``version``, which every TTL reload bumps. Without the meta
+        table there is nothing persisted, so the reload counter is used.
+        """
+        return self.remote_version if self.remote_version is not None else self.version
+
+    def _expired(self, now: float) -> bool:
+        return not self.is_loaded or (now - self._loaded_at) > self.ttl_seconds
+
+    def is_stale(self) -> bool:
+        """True when a reload or a remote version check is due."""
+        now = time.time()
+        if now - self._failed_at < REFRESH_RETRY_SECONDS:
+            return False
+        if self._expired(now):
+            return True
+        return bool(self.version_poll_seconds) and (now - self._checked_at) > self.version_poll_seconds
+
+    def _fetch_remote_version(self) -> Optional[int]:
+        try:
+            return fetch_catalog_version(self.client)
+        except Exception as e:
+            logger.debug(f"Catalog version check failed: {e}")
+            return None
+
+    def _remote_changed(self) -> bool:
+        """Poll the persisted version; True if a reseed happened since our last load."""
+        remote = self._fetch_remote_version()
+        self._checked_at = time.time()
+        return remote is not None and remote != self.remote_version
+
+    def refresh(self) -> int:
+        """Reload the whole table and rebuild all lookup dictionaries.
+
+        Returns the number of products loaded. On failure the previous
+        snapshot (if any) is kept and the exception is re-raised.
+        """
+        # Read the version first: a bump landing mid-load triggers one more reload.
+        remote_version = self._fetch_remote_version()
+        columns = COLUMNS + (("embedding",) if RetrieverConfig.search_backend == "local" else ())
+        res = self.client.table(TABLE).select(",".join(columns)).execute()
+        rows = res.data or []
+
+        exact, folded, aliases = {}, {}, {}
+        ambiguous = set()
+        for row in rows:
+            name = row.get("name")
+            if not name:
+                continue
+            exact[name] = row
+            folded.setdefault(normalize_name(name), row)
+
+            extra = list(row.get("aliases") or []) + _EXTRA_ALIASES.get(name, [])
+            for key in alias_keys(name) + [normalize_name(a) for a in extra]:
+                if key in aliases and aliases[key] is not row:
+                    ambiguous.add(key)
+                aliases.setdefault(key, row)
+
+        # An alias shared by two products resolves neither — let the caller fall back.
+        for key in ambiguous:
+            aliases.pop(key, None)
+
+        with self._lock:
+            self._rows = rows
+            self._exact, self._folded, self._aliases = exact, folded, aliases
+            self._loaded_at = self._checked_at = time.time()
+            if remote_version is not None:  # a failed check keeps the last known version
+                self.remote_version = remote_version
+            self.version += 1
+
+        logger.info(f"ProductCatalog loaded {len(rows)} products (version {self.version})")
+        return len(rows)
+
+    def invalidate(self) -> None:
+        """Mark the snapshot stale so the next lookup reloads it."""
+        with self._lock:
+            self._loaded_at = 0.0
+            self._failed_at = 0.0
+        logger.info("ProductCatalog invalidated")
+
+    def ensure_loaded(self, reload: bool = True) -> bool:
+        """Load or reload if stale. Returns False if no snapshot is available.
+
+        Only one thread reloads; while it does, the others return the current
+        snapshot (or wait for it, when there is none yet). ``reload=False``
+        never touches the network — for async code that already reloaded off
+        the event loop.
+        """
+        if reload and self.is_stale():
+            if not self._reload_lock.acquire(blocking=not self._rows):
+                return True  # another thread is reloading — serve the current snapshot
+            try:
+                if self.is_stale() and (self._expired(time.time()) or self._remote_changed()):
+                    self.refresh()
+            except Exception as e:
+                self._failed_at = time.time()
+                logger.error(f"ProductCatalog refresh failed: {e}")
+            finally:
+                self._reload_lock.release()
+        return bool(self._rows)
+
+    # ── Lookups ───────────────────────────────────────────────────────────────
+
+    def lookup(self, name: str) -> Optional[Dict[str, Any]]:
+        """Resolve a product row by exact, case-folded or alias name."""
+        if not name:
+            return None
+        row = self._exact.get(name)
+        if row is not None:
+            return row
+        key = normalize_name(name)
+        row = self._folded.get(key)
+        if row is not None:
+            return row
+        row = self._aliases.get(key)
+        if row is not None:
+            return row
+        return self._aliases.get(_strip_punctuation(key))
+
+    def name_keys(self) -> Dict[str, Dict[str, Any]]:
+        """Every normalised lookup key (case-folded names and aliases) → product row."""
+        return {**self._aliases, **self._folded}
+
+    def products(self) -> List[Dict[str, Any]]:
+        """All product rows in the current snapshot."""
+        return list(self._rows)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "products": len(self._rows),
+            "version": self.version,
+            "remote_version": self.remote_version,
+            "cache_version": self.cache_version,
+            "age_seconds": round(time.time() - self._loaded_at, 1) if self.is_loaded else None,
+        }
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+
+# Thread-safe lazy singleton — loaded on first lookup, shared by every request
+_catalog: Optional[ProductCatalog] = None
+_catalog_lock = threading.Lock()
+
+
+def get_product_catalog() -> ProductCatalog:
+    global _catalog
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                _catalog = ProductCatalog()
+    return _catalog
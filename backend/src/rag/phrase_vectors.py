@@ -0,0 +1,163 @@
+"""Ahead-of-time embeddings for catalog vocabulary.
+
+Most retrieval queries are short phrases built from menu words — product
+names, categories, ingredients ("oat milk", "bakery", "chocolate"). Their
+vectors are computed once at catalog sync (``scripts/build_phrase_table.py``
+or ``scripts/seed_products.py``) and stored as a compact phrase → vector
+table. The retriever looks normalised queries up here first and only calls
+the embedder for genuinely novel text.
+
+Enable with ``EMBEDDING_PHRASE_TABLE_PATH=artifacts/phrase_vectors.npz``.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set
+
+import numpy as np
+
+from src.config import Config
+from src.utils.embedders import embedder_cache_key
+
+logger = logging.getLogger(__name__)
+
+_NON_WORD_RE = re.compile(r"[^\w\s]")
+_SPACE_RE = re.compile(r"\s+")
+
+# n-grams made only of these carry no meaning of their own
+_FILLER = {"a", "an", "the", "and", "or", "with", "of", "in", "on", "au", "de", "for", "to"}
+
+
+def normalize_phrase(text: str) -> str:
+    """Lookup key: case-folded, punctuation-free, whitespace-collapsed."""
+    return _SPACE_RE.sub(" ", _NON_WORD_RE.sub(" ", (text or "").casefold())).strip()
+
+
+def _ngrams(words: List[str], max_n: int) -> Iterable[str]:
+    for n in range(1, min(max_n, len(words)) + 1):
+        for i in range(len(words) - n + 1):
+            gram = words[i:i + n]
+            if all(w in _FILLER for w in gram) or (n == 1 and (len(gram[0]) < 3 or gram[0].isdigit())):
+                continue
+            yield " ".join(gram)
+
+
+def catalog_vocabulary(products: Sequence[Dict[str, Any]], max_ngram: int = None) -> List[str]:
+    """Normalised names, categories, ingredients and their word n-grams."""
+    from src.rag.catalog import alias_keys
+
+    max_ngram = max_ngram or Config.EMBEDDING_PHRASE_MAX_NGRAM
+    phrases: Set[str] = set()
+    for p in products:
+        texts = [p.get("name") or "", p.get("category") or ""]
+        ingredients = p.get("ingredients") or []
+        texts += [ingredients] if isinstance(ingredients, str) else [str(i) for i in ingredients]
+        if p.get("name"):
+            texts += alias_keys(p["name"])
+
+        for text in texts:
+            phrase = normalize_phrase(text)
+            if not phrase:
+                continue
+            phrases.add(phrase)
+            phrases.update(_ngrams(phrase.split(), max_ngram))
+    return sorted(phrases)
+
+
+class PhraseVectorTable:
+    """Exact-match phrase → embedding table, stored as float16 to stay small."""
+
+    def __init__(self, phrases: List[str], matrix: np.ndarray, model: str):
+        if len(phrases) != matrix.shape[0]:
+            raise ValueError(f"phrases ({len(phrases)}) and matrix ({matrix.shape[0]}) length mismatch")
+        self.model = model
+        self.matrix = np.asarray(matrix, dtype=np.float16)
+        self._index = {p: i for i, p in enumerate(phrases)}
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def build(cls, phrases: List[str], embeddings, model: str, batch_size: int = 64) -> "PhraseVectorTable":
+        """Embed ``phrases`` in batches with any LangChain ``Embeddings``."""
+        vectors: List[List[float]] = []
+        for start in range(0, len(phrases), batch_size):
+            vectors.extend(embeddings.embed_documents(phrases[start:start + batch_size]))
+        return cls(phrases, np.asarray(vectors, dtype=np.float32), model=model)
+
+    @classmethod
+    def load(cls, path: str) -> "PhraseVectorTable":
+        with np.load(path, allow_pickle=False) as data:
+            phrases = json.loads(str(data["phrases"]))
+            table = cls(phrases, data["matrix"], model=str(data["model"]))
+        logger.info(f"PhraseVectorTable loaded {len(table)} phrases from {path}")
+        return table
+
+    def save(self, path: str) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        phrases = sorted(self._index, key=self._index.get)
+        np.savez_compressed(
+            path,
+            matrix=self.matrix,
+            phrases=np.array(json.dumps(phrases)),
+            model=np.array(self.model),
+        )
+        logger.info(f"PhraseVectorTable written to {path} ({len(phrases)} phrases)")
+
+    def get(self, text: str) -> Optional[List[float]]:
+        i = self._index.get(normalize_phrase(text))
+        if i is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return self.matrix[i].astype(np.float32).tolist()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "phrases": len(self),
+            "model": self.model,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+
+# ── Lazy singleton (reloaded when the file on disk changes) ───────────────────
+
+_table: Optional[PhraseVectorTable] = None
+_table_mtime: float = 0.0
+_table_lock = threading.Lock()
+
+
+def get_phrase_table(model: str = None) -> Optional[PhraseVectorTable]:
+    """The configured table, or None if disabled, missing or built for another model."""
+    global _table, _table_mtime
+    path = Config.EMBEDDING_PHRASE_TABLE_PATH
+    if not path:
+        return None
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+
+    # Keyed on mtime alone so a corrupt file is not re-read on every query
+    if mtime != _table_mtime:
+        with _table_lock:
+            if mtime != _table_mtime:
+                try:
+                    _table = PhraseVectorTable.load(path)
+                except Exception as e:
+                    logger.error(f"Failed to load phrase table {path}: {e}")
+                    _table = None
+                _table_mtime = mtime
+
+    model = model or embedder_cache_key(Config.EMBEDDING_MODEL)
+    if _table is not None and _table.model != model:
+        return None
+    return _table
@@ -0,0 +1,258 @@
+"""Response cache for user-independent answers (menu and shop-info questions).
+
+"What are your hours", "do you have vegan options" — the details agent gets
+the same questions all day, and each one costs two LLM calls plus the tools.
+Answers are cached per (agent, normalised rewritten input):
+
+1. exact match on the normalised text, then
+2. embedding similarity above ``RESPONSE_CACHE_SIMILARITY`` — accepted only
+   when both questions mention the same menu items, so "how much is a latte"
+   never answers "how much is a mocha".
+
+Entries are dropped when the persisted catalog version moves (a reseed may have changed prices)
+and only agents listed in ``RESPONSE_CACHE_AGENTS`` are cached — order,
+recommendation and general answers depend on the user and never are. Inputs
+that still lean on the conversation ("how much is it?") are not cached either.
+"""
+
+import asyncio
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+import numpy as np
+
+from src.config import settings
+from src.rag.catalog import get_product_catalog
+from src.utils.util import get_embedding_model, normalize_embedding_text
+
+logger = logging.getLogger(__name__)
+
+CacheKey = Tuple[str, str]
+
+# References the input processor failed to resolve — the answer depends on history
+_CONTEXTUAL_RE = re.compile(r"\b(it|its|that|those|these|them|they|one|ones|same)\b")
+_WORD_RE = re.compile(r"[^\w\s]")
+
+
+@dataclass
+class _Entry:
+    answer: str
+    vector: Optional[np.ndarray]
+    mentions: FrozenSet[str]
+    created_at: float
+
+
+def _unit(vector: List[float]) -> Optional[np.ndarray]:
+    arr = np.asarray(vector, dtype=np.float32)
+    norm = float(np.linalg.norm(arr))
+    return arr / norm if norm else None
+
+
+class ResponseCache:
+    """Thread-safe LRU + TTL cache of final answers with a semantic fallback."""
+
+    def __init__(self, max_entries: int = None, ttl_seconds: int = None, min_similarity: float = None):
+        self.max_entries = max_entries if max_entries is not None else settings.response_cache_size
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.response_cache_ttl_seconds
+        self.min_similarity = min_similarity if min_similarity is not None else settings.response_cache_similarity
+        self._entries: "OrderedDict[CacheKey, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._version: Optional[int] = None
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.stale_drops = 0
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        # Trailing punctuation never changes what was asked ("vegan options?" == "vegan options")
+        return normalize_embedding_text(text).rstrip("?!. ")
+
+    def cacheable(self, agent: str, text: str) -> bool:
+        """True if answers of ``agent`` to ``text`` may be shared across users."""
+        if not self.max_entries or agent not in settings.response_cache_agents:
+            return False
+        normalized = self.normalize(text)
+        return bool(normalized) and not _CONTEXTUAL_RE.search(normalized)
+
+    @property
+    def semantic(self) -> bool:
+        return self.min_similarity < 1.0
+
+    def _check_version(self, version: int) -> bool:
+        """Drop every entry once the catalog version moves forward. Caller holds the lock.
+
+        Returns False for a ``version`` older than the cache's — a turn that
+        started before a reload must neither rewind the cache nor read or
+        write under the old prices.
+        """
+        if self._version is not None and version < self._version:
+            return False
+        if self._version != version:
+            if self._entries:
+                self._entries.clear()
+                self.invalidations += 1
+                logger.info(f"Response cache invalidated (catalog version {self._version} -> {version})")
+            self._version = version
+        return True
+
+    def _fresh(self, entry: _Entry, now: float) -> bool:
+        return not self.ttl_seconds or (now - entry.created_at) <= self.ttl_seconds
+
+    def get_exact(self, agent: str, text: str, version: int) -> Optional[str]:
+        key = (agent, self.normalize(text))
+        with self._lock:
+            if not self._check_version(version):
+                return None
+            entry = self._entries.get(key)
+            if entry is not None:
+                if self._fresh(entry, time.time()):
+                    self._entries.move_to_end(key)
+                    self.exact_hits += 1
+                    return entry.answer
+                del self._entries[key]
+            return None
+
+    def get_similar(self, agent: str, vector: List[float], mentions: FrozenSet[str], version: int) -> Optional[str]:
+        """Best entry of ``agent`` above the similarity threshold that mentions the same items."""
+        query = _unit(vector)
+        if query is None:
+            return None
+        now = time.time()
+        with self._lock:
+            if not self._check_version(version):
+                return None
+            best_key, best_score = None, self.min_similarity
+            for key, entry in self._entries.items():
+                if key[0] != agent or entry.vector is None or entry.mentions != mentions:
+                    continue
+                if not self._fresh(entry, now):
+                    continue
+                score = float(np.dot(query, entry.vector))
+                if score >= best_score:
+                    best_key, best_score = key, score
+            if best_key is None:
+                return None
+            self._entries.move_to_end(best_key)
+            self.semantic_hits += 1
+            logger.debug(f"Response cache semantic hit ({best_score:.3f}): '{best_key[1][:60]}'")
+            return self._entries[best_key].answer
+
+    def record_miss(self) -> None:
+        with self._lock:
+            self.misses += 1
+
+    def put(
+        self,
+        agent: str,
+        text: str,
+        answer: str,
+        version: int,
+        vector: Optional[List[float]] = None,
+        mentions: FrozenSet[str] = frozenset(),
+    ) -> None:
+        if not self.max_entries or not answer:
+            return
+        key = (agent, self.normalize(text))
+        entry = _Entry(answer, _unit(vector) if vector is not None else None, mentions, time.time())
+        with self._lock:
+            if not self._check_version(version):
+                self.stale_drops += 1
+                logger.debug(f"Response cache dropped an answer built on catalog version {version} (now {self._version})")
+                return
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            self.stores += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hits = self.exact_hits + self.semantic_hits
+            lookups = hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "catalog_version": self._version,
+                "exact_hits": self.exact_hits,
+                "semantic_hits": self.semantic_hits,
+                "misses": self.misses,
+                "stores": self.stores,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "stale_drops": self.stale_drops,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_response_cache = ResponseCache()
+
+
+def get_response_cache() -> ResponseCache:
+    return _response_cache
+
+
+def get_response_cache_stats() -> Dict[str, Any]:
+    """Hit/miss counters of the response cache."""
+    return _response_cache.stats()
+
+
+async def _acatalog_version() -> int:
+    catalog = get_product_catalog()
+    if catalog.is_stale():
+        await asyncio.to_thread(catalog.ensure_loaded)
+    return catalog.cache_version
+
+
+def mentioned_products(text: str) -> FrozenSet[str]:
+    """Catalog product names mentioned in ``text`` (whole-word match on names and aliases)."""
+    padded = f" {_WORD_RE.sub(' ', normalize_embedding_text(text))} "
+    return frozenset(
+        product.get("name", key)
+        for key, product in get_product_catalog().name_keys().items()
+        if f" {key} " in padded
+    )
+
+
+async def alookup(agent: str, text: str) -> Tuple[Optional[str], Dict[str, Any]]:
+    """Cached answer for ``text`` (exact, then semantic) or None.
+
+    The second value carries what the lookup computed (catalog version, query
+    vector, mentions) so ``astore`` does not embed the same text twice.
+    """
+    cache = _response_cache
+    context: Dict[str, Any] = {"version": await _acatalog_version(), "vector": None, "mentions": frozenset()}
+
+    answer = cache.get_exact(agent, text, context["version"])
+    if answer is None and cache.semantic:
+        try:
+            context["vector"] = await get_embedding_model().aembed_query(cache.normalize(text))
+            context["mentions"] = mentioned_products(text)
+            answer = cache.get_similar(agent, context["vector"], context["mentions"], context["version"])
+        except Exception as e:
+            logger.warning(f"Response cache semantic lookup skipped: {e}")
+
+    if answer is None:
+        cache.record_miss()
+    return answer, context
+
+
+async def astore(agent: str, text: str, answer: str, context: Dict[str, Any]) -> None:
+    """Cache ``answer`` under the version/vector computed by ``alookup``."""
+    _response_cache.put(
+        agent, text, answer, context["version"],
+        vector=context.get("vector"), mentions=context.get("mentions", frozenset()),
+    )
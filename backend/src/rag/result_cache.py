@@ -0,0 +1,111 @@
+"""Search result cache for the product retriever.
+
+The same menu questions ("what pastries do you have") repeat all day across
+users, and each one otherwise costs an embedding call plus a pgvector RPC.
+Results are cached under (normalised query, top_k, threshold, catalog
+version): a reseed bumps the catalog version, so entries from the old
+catalog can never be served and are dropped on the first lookup after it.
+A search that started before a reload (older version) bypasses the cache.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.config import RetrieverConfig
+from src.utils.util import normalize_embedding_text
+
+logger = logging.getLogger(__name__)
+
+CacheKey = Tuple[str, int, float, int]
+
+
+class SearchResultCache:
+    """Thread-safe LRU + TTL cache of search result lists."""
+
+    def __init__(self, max_entries: int = None, ttl_seconds: int = None):
+        self.max_entries = max_entries if max_entries is not None else RetrieverConfig.result_cache_size
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else RetrieverConfig.result_cache_ttl_seconds
+        self._entries: "OrderedDict[CacheKey, Tuple[List[Dict[str, Any]], float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._version: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.stale_drops = 0
+
+    @staticmethod
+    def key(query: str, top_k: int, threshold: float, catalog_version: int) -> CacheKey:
+        # Trailing punctuation never changes what was asked ("pastries?" == "pastries")
+        text = normalize_embedding_text(query).rstrip("?!. ")
+        return (text, int(top_k), round(float(threshold), 4), int(catalog_version))
+
+    def _check_version(self, version: int) -> bool:
+        """Drop every entry once the catalog version moves forward. Caller holds the lock.
+
+        Returns False for a ``version`` older than the cache's — a search that
+        started before a reload must neither rewind the cache nor read or
+        write under the old catalog.
+        """
+        if self._version is not None and version < self._version:
+            return False
+        if self._version != version:
+            if self._entries:
+                self._entries.clear()
+                self.invalidations += 1
+                logger.info(f"Search result cache invalidated (catalog version {self._version} -> {version})")
+            self._version = version
+        return True
+
+    def get(self, key: CacheKey) -> Optional[List[Dict[str, Any]]]:
+        if not self.max_entries:
+            return None
+        with self._lock:
+            if not self._check_version(key[3]):
+                self.misses += 1
+                return None
+            entry = self._entries.get(key)
+            if entry is not None:
+                results, created_at = entry
+                if not self.ttl_seconds or (time.time() - created_at) <= self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return list(results)
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: CacheKey, results: List[Dict[str, Any]]) -> None:
+        if not self.max_entries:
+            return
+        with self._lock:
+            if not self._check_version(key[3]):
+                self.stale_drops += 1
+                return
+            self._entries[key] = (list(results), time.time())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "catalog_version": self._version,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "stale_drops": self.stale_drops,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
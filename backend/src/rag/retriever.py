@@ -1,18 +1,31 @@
 """Scalable Retriever helpers for Coffee Shop RAG - Supabase pgvector version
 
 Provides utilities to query Supabase with vector similarity search for:
-- Hybrid lookup (Exact match + Semantic fallback)
+- Hybrid lookup (Exact match + Typo-tolerant lexical match + Semantic fallback)
+- Hybrid menu search (BM25 + vector, reciprocal-rank fusion)
+- Optional in-process vector search (RETRIEVER_SEARCH_BACKEND=local)
+- Async variants (asearch_products, aget_product_by_name) for async agents
+- Search result cache invalidated by the persisted catalog version
 - Unified product data & pricing source of truth
 - Low latency search (<300ms)
 - Multi-user / Multi-tenant support
 """
 
+import asyncio
 import logging
-from typing import List, Dict, Any, Optional
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Set, Tuple
 
 import dotenv
 from src.config import Config, RetrieverConfig as ConfigRetrieverConfig
 from src.memory.supabase_client import supabase_admin as supabase
+from src.rag.async_client import get_async_supabase
+from src.rag.bm25 import get_bm25_index
+from src.rag.catalog import get_product_catalog, normalize_name
+from src.rag.phrase_vectors import get_phrase_table
+from src.rag.result_cache import SearchResultCache
+from src.rag.vector_index import get_local_vector_index
 from src.utils.util import get_embedding_model
 
 dotenv.load_dotenv()
@@ -23,95 +36,552 @@ logger = logging.getLogger(__name__)
 RetrieverConfig = ConfigRetrieverConfig
 
 
+def _format_match(p: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": p.get("id"),
+        "name": p.get("name"),
+        "price": p.get("price"),
+        "score": p.get("similarity"), # Map similarity to score for backward compatibility
+        "category": p.get("category"),
+        "description": p.get("description"),
+        "image_url": p.get("image_url"),
+        "metadata": p
+    }
+
+
+def _rpc_params(q_vec: List[float], top_k: int, match_threshold: float) -> Dict[str, Any]:
+    return {
+        'query_embedding': q_vec,
+        'match_threshold': match_threshold,
+        'match_count': top_k
+    }
+
+
+def _local_index(reload: bool = True):
+    """The in-process vector index when RETRIEVER_SEARCH_BACKEND=local, else None."""
+    if RetrieverConfig.search_backend != "local":
+        return None
+    index = get_local_vector_index(reload)
+    if index is None:
+        logger.warning("Local vector index unavailable — falling back to pgvector")
+    return index
+
+
+async def _aensure_catalog() -> None:
+    """Reload a stale catalog off the event loop (supabase-py is synchronous).
+
+    Async code then reads the catalog with ``reload=False`` so a snapshot that
+    turned stale in between is never reloaded on the loop.
+    """
+    catalog = get_product_catalog()
+    if catalog.is_stale():
+        await asyncio.to_thread(catalog.ensure_loaded)
+
+
+# ── Query embedding ───────────────────────────────────────────────────────────
+# Catalog-vocabulary phrases ("oat milk", "bakery") come from the precomputed
+# phrase table; only novel text reaches the embedding model.
+
+def _phrase_vectors(embeddings, texts: List[str]) -> List[Optional[List[float]]]:
+    table = get_phrase_table(getattr(embeddings, "model_name", None))
+    if table is None:
+        return [None] * len(texts)
+    return [table.get(t) for t in texts]
+
+
+def _embed_query(query: str) -> List[float]:
+    embeddings = get_embedding_model()
+    vector = _phrase_vectors(embeddings, [query])[0]
+    return vector if vector is not None else embeddings.embed_query(query)
+
+
+async def _aembed_query(query: str) -> List[float]:
+    embeddings = get_embedding_model()
+    vector = _phrase_vectors(embeddings, [query])[0]
+    return vector if vector is not None else await embeddings.aembed_query(query)
+
+
+def _embed_documents(texts: List[str]) -> List[List[float]]:
+    embeddings = get_embedding_model()
+    vectors = _phrase_vectors(embeddings, texts)
+    missing = [i for i, v in enumerate(vectors) if v is None]
+    if missing:
+        for i, v in zip(missing, embeddings.embed_documents([texts[i] for i in missing])):
+            vectors[i] = v
+    return vectors
+
+
+async def _aembed_documents(texts: List[str]) -> List[List[float]]:
+    embeddings = get_embedding_model()
+    vectors = _phrase_vectors(embeddings, texts)
+    missing = [i for i, v in enumerate(vectors) if v is None]
+    if missing:
+        for i, v in zip(missing, await embeddings.aembed_documents([texts[i] for i in missing])):
+            vectors[i] = v
+    return vectors
+
+
+# ── Vector search ─────────────────────────────────────────────────────────────
+
+def _pgvector_search(q_vec: List[float], top_k: int, match_threshold: float) -> List[Dict[str, Any]]:
+    # Call the Supabase RPC function 'match_coffee_products'
+    res = supabase.rpc('match_coffee_products', _rpc_params(q_vec, top_k, match_threshold)).execute()
+    return [_format_match(p) for p in (res.data or [])]
+
+
+async def _apgvector_search(q_vec: List[float], top_k: int, match_threshold: float) -> List[Dict[str, Any]]:
+    rows = await get_async_supabase().rpc('match_coffee_products', _rpc_params(q_vec, top_k, match_threshold))
+    return [_format_match(p) for p in rows]
+
+
+def _vector_search(q_vec: List[float], top_k: int, match_threshold: float) -> List[Dict[str, Any]]:
+    """Dispatch to the configured search backend (local index falls back to pgvector)."""
+    index = _local_index()
+    if index is not None:
+        return index.search(q_vec, top_k=top_k, threshold=match_threshold)
+    return _pgvector_search(q_vec, top_k, match_threshold)
+
+
+async def _avector_search(q_vec: List[float], top_k: int, match_threshold: float) -> List[Dict[str, Any]]:
+    await _aensure_catalog()
+    index = _local_index(reload=False)
+    if index is not None:
+        return index.search(q_vec, top_k=top_k, threshold=match_threshold)
+    return await _apgvector_search(q_vec, top_k, match_threshold)
+
+
+# Repeated menu questions skip the embedding + RPC. Keyed on the persisted
+# catalog version, which moves whenever products are reseeded.
+_result_cache = SearchResultCache()
+
+
+def get_search_cache_stats() -> Dict[str, Any]:
+    """Hit/miss counters of the search result cache."""
+    return _result_cache.stats()
+
+
 def search_products(
     query: str,
     top_k: int = 5,
     match_threshold: float = 0.5,
 ) -> List[Dict[str, Any]]:
-    """Search products using Supabase pgvector similarity search."""
+    """Search products by vector similarity (Supabase pgvector or the local index)."""
     try:
-        embeddings = get_embedding_model()
-        q_vec = embeddings.embed_query(query)
-        
-        # Call the Supabase RPC function 'match_coffee_products'
-        rpc_params = {
-            'query_embedding': q_vec,
-            'match_threshold': match_threshold,
-            'match_count': top_k
-        }
-        
-        res = supabase.rpc('match_coffee_products', rpc_params).execute()
-        
-        if not res.data:
-            return []
-            
-        results = []
-        for p in res.data:
-            results.append({
-                "id": p.get("id"),
-                "name": p.get("name"),
-                "price": p.get("price"),
-                "score": p.get("similarity"), # Map similarity to score for backward compatibility
-                "category": p.get("category"),
-                "description": p.get("description"),
-                "image_url": p.get("image_url"),
-                "metadata": p
-            })
-            
+        catalog = get_product_catalog()
+        catalog.ensure_loaded()
+        key = _result_cache.key(query, top_k, match_threshold, catalog.cache_version)
+        cached = _result_cache.get(key)
+        if cached is not None:
+            return cached
+
+        q_vec = _embed_query(query)
+        results = _vector_search(q_vec, top_k, match_threshold)
+        _result_cache.put(key, results)
         return results
     except Exception as e:
         logger.error(f"Supabase vector search failed: {str(e)}")
         return []
 
 
-def get_product_by_name(name: str) -> Dict[str, Any]:
-    """Fetch product by name with Hybrid Logic using Supabase ONLY:
-    1. Try exact lookup in Supabase.
-    2. Fallback to Supabase pgvector semantic search to "translate" misspelt names.
+async def asearch_products(
+    query: str,
+    top_k: int = 5,
+    match_threshold: float = 0.5,
+) -> List[Dict[str, Any]]:
+    """Async ``search_products`` — never blocks the event loop on network I/O."""
+    try:
+        await _aensure_catalog()
+        key = _result_cache.key(query, top_k, match_threshold, get_product_catalog().cache_version)
+        cached = _result_cache.get(key)
+        if cached is not None:
+            return cached
+
+        q_vec = await _aembed_query(query)
+        results = await _avector_search(q_vec, top_k, match_threshold)
+        _result_cache.put(key, results)
+        return results
+    except Exception as e:
+        logger.error(f"Supabase vector search failed: {str(e)}")
+        return []
+
+
+# ── Hybrid BM25 + vector ranking ──────────────────────────────────────────────
+# Vector similarity misses literal attribute queries ("oat milk", "gluten-free");
+# BM25 catches them. Reciprocal-rank fusion merges both lists without having to
+# calibrate BM25 scores against cosine similarities.
+
+def _bm25_search(query: str, top_k: int, reload: bool = True) -> List[Dict[str, Any]]:
+    index = get_bm25_index(reload)
+    if index is None:
+        return []
+    return [
+        {**_format_match(row), "score": None, "bm25_score": round(score, 4)}
+        for row, score in index.search(query, top_k=top_k)
+    ]
+
+
+def _rrf_fuse(vector_hits: List[Dict[str, Any]], bm25_hits: List[Dict[str, Any]], top_k: int) -> List[Dict[str, Any]]:
+    """Reciprocal-rank fusion: score(d) = Σ 1 / (k + rank(d)) over both rankings."""
+    k = RetrieverConfig.rrf_k
+    fused: Dict[Any, float] = defaultdict(float)
+    docs: Dict[Any, Dict[str, Any]] = {}
+
+    for source, hits in (("vector", vector_hits), ("bm25", bm25_hits)):
+        for rank, hit in enumerate(hits, 1):
+            key = hit.get("id") or hit.get("name")
+            fused[key] += 1.0 / (k + rank)
+            doc = docs.setdefault(key, {**hit, "vector_score": None, "bm25_score": None})
+            if source == "vector":
+                doc["vector_score"] = hit.get("score")
+            else:
+                doc["bm25_score"] = hit.get("bm25_score")
+
+    ranked = sorted(fused, key=fused.get, reverse=True)[:top_k]
+    return [{**docs[key], "score": round(fused[key], 6)} for key in ranked]
+
+
+def hybrid_search_products(
+    query: str,
+    top_k: int = 5,
+    match_threshold: float = 0.5,
+) -> List[Dict[str, Any]]:
+    """BM25 + vector search fused with reciprocal-rank fusion.
+
+    Same result shape as ``search_products``; ``score`` is the fused RRF score
+    and ``vector_score`` / ``bm25_score`` carry the per-ranker scores. Either
+    ranker failing degrades to the other one.
     """
+    pool = max(top_k, RetrieverConfig.hybrid_pool)
+    vector_hits = search_products(query, top_k=pool, match_threshold=match_threshold)
     try:
-        normalized = name.lower().strip()
-        
-        # --- Step 1: Direct Supabase Lookup (Exact/ILIKE) ---
-        res = supabase.table("coffee_shop_products").select("*").ilike("name", normalized).execute()
-        
-        if res.data:
-            p = res.data[0]
-            logger.debug(f"Direct Supabase match found for '{name}'")
-            return {
-                "found": True,
-                "name": p.get("name"),
-                "price": p.get("price"),
-                "image_url": p.get("image_url"),
-                "metadata": p,
-                "source": "supabase_direct"
-            }
-
-        # --- Step 2: Semantic Translation fallback (Supabase pgvector) ---
-        logger.debug(f"No direct match for '{name}', using Supabase semantic fallback...")
-        fallback = search_products(name, top_k=1, match_threshold=0.5)
-        
-        if fallback:
-            top_match = fallback[0]
-            match_name = top_match.get("name")
-            score = top_match.get("score")
-            
-            # Use confidence threshold (0.5 for BGE models)
-            if score and score > 0.5:
-                logger.info(f"Supabase translated '{name}' -> '{match_name}' (score: {score:.2f})")
-                return {
-                    "found": True,
-                    "name": top_match.get("name"),
-                    "price": top_match.get("price"),
-                    "image_url": top_match.get("image_url"),
-                    "metadata": top_match.get("metadata"),
-                    "score": score,
-                    "source": "supabase_semantic"
-                }
-
-        logger.warning(f"Product '{name}' not found locally or via pgvector.")
-        return {"found": False, "query": name}
+        bm25_hits = _bm25_search(query, pool)
+    except Exception as e:
+        logger.error(f"BM25 search failed: {str(e)}")
+        bm25_hits = []
+    return _rrf_fuse(vector_hits, bm25_hits, top_k)
 
+
+async def ahybrid_search_products(
+    query: str,
+    top_k: int = 5,
+    match_threshold: float = 0.5,
+) -> List[Dict[str, Any]]:
+    """Async ``hybrid_search_products``."""
+    pool = max(top_k, RetrieverConfig.hybrid_pool)
+    vector_hits = await asearch_products(query, top_k=pool, match_threshold=match_threshold)
+    try:
+        await _aensure_catalog()
+        bm25_hits = _bm25_search(query, pool, reload=False)
     except Exception as e:
-        logger.error(f"get_product_by_name (supabase hybrid) failed for '{name}': {str(e)}")
-        return {"found": False, "query": name, "error": str(e)}
+        logger.error(f"BM25 search failed: {str(e)}")
+        bm25_hits = []
+    return _rrf_fuse(vector_hits, bm25_hits, top_k)
+
+
+# ── Typo-tolerant lexical index ───────────────────────────────────────────────
+# Most order-line misses are spelling ("capuccino"), not meaning. A trigram
+# bucket prefilter plus normalised edit distance catches them in-process, so
+# the remote embedding + pgvector tier only runs when lexical confidence is low.
+
+def _trigrams(text: str) -> Set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _edit_distance(a: str, b: str) -> int:
+    """Levenshtein distance (two-row DP — names are short)."""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ca != cb),
+            ))
+        previous = current
+    return previous[-1]
+
+
+class FuzzyNameIndex:
+    """Trigram-bucketed edit-distance matcher over catalog names and aliases."""
+
+    # Two different products this close together are ambiguous — defer to semantics.
+    AMBIGUITY_MARGIN = 0.05
+
+    def __init__(self, keys: Dict[str, Dict[str, Any]], version: int = 0, max_candidates: int = 8):
+        self.keys = list(keys)
+        self.rows = [keys[k] for k in self.keys]
+        self.version = version
+        self.max_candidates = max_candidates
+        self._gram_counts = []
+        self._buckets: Dict[str, List[int]] = defaultdict(list)
+        for i, key in enumerate(self.keys):
+            grams = _trigrams(key)
+            self._gram_counts.append(len(grams))
+            for g in grams:
+                self._buckets[g].append(i)
+
+    def match(self, name: str) -> Tuple[Optional[Dict[str, Any]], float]:
+        """Best product row for ``name`` and a confidence in [0, 1]."""
+        query = normalize_name(name)
+        if not query:
+            return None, 0.0
+
+        grams = _trigrams(query)
+        shared = Counter(i for g in grams for i in self._buckets.get(g, ()))
+        if not shared:
+            return None, 0.0
+
+        # Dice coefficient on trigrams narrows the field before edit distance
+        candidates = sorted(
+            shared,
+            key=lambda i: 2 * shared[i] / (len(grams) + self._gram_counts[i]),
+            reverse=True,
+        )[:self.max_candidates]
+
+        best_by_product: Dict[int, Tuple[Dict[str, Any], float]] = {}
+        for i in candidates:
+            key = self.keys[i]
+            confidence = 1 - _edit_distance(query, key) / max(len(query), len(key))
+            row = self.rows[i]
+            current = best_by_product.get(id(row))
+            if current is None or confidence > current[1]:
+                best_by_product[id(row)] = (row, confidence)
+
+        ranked = sorted(best_by_product.values(), key=lambda rc: rc[1], reverse=True)
+        row, confidence = ranked[0]
+        if len(ranked) > 1 and confidence - ranked[1][1] < self.AMBIGUITY_MARGIN:
+            confidence = min(confidence, 0.5)
+        return row, confidence
+
+
+_fuzzy_index: Optional[FuzzyNameIndex] = None
+
+
+def _get_fuzzy_index() -> Optional[FuzzyNameIndex]:
+    """Lexical index over the loaded catalog, rebuilt whenever the catalog reloads."""
+    global _fuzzy_index
+    catalog = get_product_catalog()
+    if not len(catalog):
+        return None
+    if _fuzzy_index is None or _fuzzy_index.version != catalog.version:
+        _fuzzy_index = FuzzyNameIndex(catalog.name_keys(), version=catalog.version)
+    return _fuzzy_index
+
+
+# ── Name resolution ───────────────────────────────────────────────────────────
+
+def _product_hit(p: Dict[str, Any], source: str) -> Dict[str, Any]:
+    return {
+        "found": True,
+        "name": p.get("name"),
+        "price": p.get("price"),
+        "image_url": p.get("image_url"),
+        "metadata": p,
+        "source": source
+    }
+
+
+# Confidence threshold for semantic name translation (0.5 for BGE models)
+SEMANTIC_MATCH_THRESHOLD = 0.5
+
+
+def _semantic_hit(top_match: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "found": True,
+        "name": top_match.get("name"),
+        "price": top_match.get("price"),
+        "image_url": top_match.get("image_url"),
+        "metadata": top_match.get("metadata"),
+        "score": top_match.get("score"),
+        "source": "supabase_semantic"
+    }
+
+
+def _catalog_hits(names: List[str]) -> Dict[str, Dict[str, Any]]:
+    catalog = get_product_catalog()
+    hits = {}
+    for name in names:
+        p = catalog.lookup(name)
+        if p:
+            hits[name] = _product_hit(p, "catalog")
+    return hits
+
+
+def _fuzzy_hits(names: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Lexical typo correction — only confident matches, the rest go to the semantic tier."""
+    index = _get_fuzzy_index()
+    if index is None:
+        return {}
+    hits = {}
+    for name in names:
+        p, confidence = index.match(name)
+        if p and confidence >= RetrieverConfig.fuzzy_min_confidence:
+            logger.info(f"Lexical match '{name}' -> '{p.get('name')}' (confidence: {confidence:.2f})")
+            hits[name] = {**_product_hit(p, "catalog_fuzzy"), "score": round(confidence, 4)}
+    return hits
+
+
+def _in_candidates(names: List[str]) -> List[str]:
+    """Spellings to send in a single `in_` query when the catalog is unavailable."""
+    return sorted({v for n in names for v in (n.strip(), n.strip().title(), n.strip().capitalize())})
+
+
+def _direct_hits(names: List[str], rows: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    by_folded = {(p.get("name") or "").casefold(): p for p in rows}
+    return {
+        name: _product_hit(by_folded[name.strip().casefold()], "supabase_direct")
+        for name in names if name.strip().casefold() in by_folded
+    }
+
+
+def _semantic_hits(names: List[str], matches: List[List[Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
+    hits = {}
+    for name, fallback in zip(names, matches):
+        if not fallback:
+            continue
+        top_match = fallback[0]
+        score = top_match.get("score")
+        if score and score > SEMANTIC_MATCH_THRESHOLD:
+            logger.info(f"Supabase translated '{name}' -> '{top_match.get('name')}' (score: {score:.2f})")
+            hits[name] = _semantic_hit(top_match)
+    return hits
+
+
+def _assemble(names: List[str], resolved: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+    results = []
+    for name in names:
+        if name in resolved:
+            results.append(resolved[name])
+        else:
+            logger.warning(f"Product '{name}' not found locally or via pgvector.")
+            results.append({"found": False, "query": name})
+    return results
+
+
+def _exact_lookup(names: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Resolve exact and misspelt names. In-process when the catalog is loaded, else one `in_` query."""
+    if get_product_catalog().ensure_loaded():
+        hits = _catalog_hits(names)
+        hits.update(_fuzzy_hits([n for n in names if n not in hits]))
+        return hits
+
+    # Catalog unavailable — single Supabase round trip for every name at once
+    res = supabase.table("coffee_shop_products").select("*").in_("name", _in_candidates(names)).execute()
+    return _direct_hits(names, res.data or [])
+
+
+async def _aexact_lookup(names: List[str]) -> Dict[str, Dict[str, Any]]:
+    await _aensure_catalog()
+    if get_product_catalog().ensure_loaded(reload=False):
+        hits = _catalog_hits(names)
+        hits.update(_fuzzy_hits([n for n in names if n not in hits]))
+        return hits
+
+    rows = await get_async_supabase().select_in("coffee_shop_products", "name", _in_candidates(names))
+    return _direct_hits(names, rows)
+
+
+def _semantic_lookup(names: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Translate unmatched names by vector similarity.
+
+    Catalog phrases come from the precomputed phrase table and the rest are
+    embedded in one ``embed_documents`` batch; the local index
+    scores them in one matrix multiply, pgvector RPCs run concurrently.
+    """
+    vectors = _embed_documents(names)
+
+    index = _local_index()
+    if index is not None:
+        matches = index.search_batch(vectors, top_k=1, threshold=SEMANTIC_MATCH_THRESHOLD)
+    else:
+        with ThreadPoolExecutor(max_workers=min(len(names), 8)) as pool:
+            matches = list(pool.map(
+                lambda v: _pgvector_search(v, 1, SEMANTIC_MATCH_THRESHOLD), vectors
+            ))
+    return _semantic_hits(names, matches)
+
+
+async def _asemantic_lookup(names: List[str]) -> Dict[str, Dict[str, Any]]:
+    vectors = await _aembed_documents(names)
+
+    await _aensure_catalog()
+    index = _local_index(reload=False)
+    if index is not None:
+        matches = index.search_batch(vectors, top_k=1, threshold=SEMANTIC_MATCH_THRESHOLD)
+    else:
+        matches = await asyncio.gather(*(
+            _apgvector_search(v, 1, SEMANTIC_MATCH_THRESHOLD) for v in vectors
+        ))
+    return _semantic_hits(names, matches)
+
+
+def get_products_by_names(names: List[str]) -> List[Dict[str, Any]]:
+    """Resolve many product names at once — one result per input name, in order.
+
+    Same hybrid logic and result shape as ``get_product_by_name``, but exact
+    matches are resolved together and all misses share a single embedding
+    batch, so a five-item order costs one round trip instead of five to fifteen.
+    """
+    if not names:
+        return []
+    unique = list(dict.fromkeys(n for n in names if n and n.strip()))
+
+    try:
+        resolved = _exact_lookup(unique)
+
+        misses = [n for n in unique if n not in resolved]
+        if misses:
+            logger.debug(f"No direct match for {misses}, using semantic fallback...")
+            try:
+                resolved.update(_semantic_lookup(misses))
+            except Exception as e:
+                logger.error(f"Semantic fallback failed for {misses}: {str(e)}")
+
+        return _assemble(names, resolved)
+
+    except Exception as e:
+        logger.error(f"get_products_by_names failed for {names}: {str(e)}")
+        return [{"found": False, "query": name, "error": str(e)} for name in names]
+
+
+async def aget_products_by_names(names: List[str]) -> List[Dict[str, Any]]:
+    """Async ``get_products_by_names`` — safe to await from agents and tools."""
+    if not names:
+        return []
+    unique = list(dict.fromkeys(n for n in names if n and n.strip()))
+
+    try:
+        resolved = await _aexact_lookup(unique)
+
+        misses = [n for n in unique if n not in resolved]
+        if misses:
+            logger.debug(f"No direct match for {misses}, using semantic fallback...")
+            try:
+                resolved.update(await _asemantic_lookup(misses))
+            except Exception as e:
+                logger.error(f"Semantic fallback failed for {misses}: {str(e)}")
+
+        return _assemble(names, resolved)
+
+    except Exception as e:
+        logger.error(f"aget_products_by_names failed for {names}: {str(e)}")
+        return [{"found": False, "query": name, "error": str(e)} for name in names]
+
+
+def get_product_by_name(name: str) -> Dict[str, Any]:
+    """Fetch product by name with Hybrid Logic:
+    1. Exact / case-folded / alias lookup in the in-process ProductCatalog.
+       (Only if the catalog could not be loaded: exact lookup in Supabase.)
+    2. Typo-tolerant lexical match (trigrams + edit distance) over the catalog.
+    3. Fallback to Supabase pgvector semantic search when lexical confidence is low.
+    """
+    return get_products_by_names([name])[0]
+
+
+async def aget_product_by_name(name: str) -> Dict[str, Any]:
+    """Async ``get_product_by_name``."""
+    return (await aget_products_by_names([name]))[0]
@@ -0,0 +1,210 @@
+"""Local vector index for product semantic search.
+
+The catalog fits comfortably in RAM, so instead of a pgvector round trip the
+product embeddings can be held as a single normalised float32 matrix and
+searched with a brute-force dot product (cosine similarity on unit vectors).
+
+The matrix is filled either from the ``embedding`` column of the in-process
+ProductCatalog or from a snapshot file written by
+``scripts/export_vector_snapshot.py``. Enable it with
+``RETRIEVER_SEARCH_BACKEND=local``.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from src.config import Config, RetrieverConfig
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_DIM = Config.EMBEDDING_DIM  # 768 for BAAI/bge-base-en-v1.5 — must match the pgvector column
+
+
+def _parse_embedding(value: Any) -> Optional[List[float]]:
+    """PostgREST returns pgvector columns as a "[0.1,0.2,...]" string."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return None
+    return list(value) if len(value) else None
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (matrix / norms).astype(np.float32, copy=False)
+
+
+class LocalVectorIndex:
+    """Brute-force cosine top-k over an (N × D) float32 matrix of unit vectors."""
+
+    def __init__(self, rows: List[Dict[str, Any]], matrix: np.ndarray, version: int = 0):
+        if len(rows) != matrix.shape[0]:
+            raise ValueError(f"rows ({len(rows)}) and matrix ({matrix.shape[0]}) length mismatch")
+        self.rows = rows
+        self.matrix = _normalize_rows(np.asarray(matrix, dtype=np.float32))
+        self.version = version
+
+    # ── Builders ──────────────────────────────────────────────────────────────
+
+    @classmethod
+    def from_products(cls, products: Sequence[Dict[str, Any]], version: int = 0) -> "LocalVectorIndex":
+        """Build from catalog rows that carry an ``embedding`` column."""
+        rows, vectors = [], []
+        for p in products:
+            vec = _parse_embedding(p.get("embedding"))
+            if vec is None:
+                continue
+            rows.append({k: v for k, v in p.items() if k != "embedding"})
+            vectors.append(vec)
+
+        if not vectors:
+            raise ValueError("No product rows carry an embedding — run scripts/seed_products.py")
+
+        skipped = len(products) - len(rows)
+        if skipped:
+            logger.warning(f"LocalVectorIndex skipped {skipped} products without embeddings")
+        return cls(rows, np.asarray(vectors, dtype=np.float32), version=version)
+
+    @classmethod
+    def load(cls, path: str) -> "LocalVectorIndex":
+        """Load a snapshot written by ``save()``."""
+        with np.load(path, allow_pickle=False) as data:
+            matrix = data["matrix"]
+            rows = json.loads(str(data["rows"]))
+            version = int(data["version"]) if "version" in data else 0
+        logger.info(f"LocalVectorIndex loaded {len(rows)} vectors from {path}")
+        return cls(rows, matrix, version=version)
+
+    def save(self, path: str) -> None:
+        """Write a compressed ``.npz`` snapshot (matrix + product rows)."""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        np.savez_compressed(
+            path,
+            matrix=self.matrix,
+            rows=np.array(json.dumps(self.rows, default=str)),
+            version=np.array(self.version),
+        )
+        logger.info(f"LocalVectorIndex snapshot written to {path} ({len(self.rows)} vectors)")
+
+    # ── Search ────────────────────────────────────────────────────────────────
+
+    def _top_k(self, scores: np.ndarray, top_k: int, threshold: float) -> List[Dict[str, Any]]:
+        k = min(top_k, scores.shape[0])
+        if k <= 0:
+            return []
+        idx = np.argpartition(-scores, k - 1)[:k]
+        idx = idx[np.argsort(-scores[idx])]
+
+        results = []
+        for i in idx:
+            score = float(scores[i])
+            if score < threshold:
+                break
+            p = self.rows[i]
+            results.append({
+                "id": p.get("id"),
+                "name": p.get("name"),
+                "price": p.get("price"),
+                "score": score,
+                "category": p.get("category"),
+                "description": p.get("description"),
+                "image_url": p.get("image_url"),
+                "metadata": {**p, "similarity": score},
+            })
+        return results
+
+    def search(self, query_vector: Sequence[float], top_k: int = 5, threshold: float = 0.5) -> List[Dict[str, Any]]:
+        """Top-k products by cosine similarity, same shape as ``search_products``."""
+        return self.search_batch([query_vector], top_k=top_k, threshold=threshold)[0]
+
+    def search_batch(
+        self,
+        query_vectors: Sequence[Sequence[float]],
+        top_k: int = 5,
+        threshold: float = 0.5,
+    ) -> List[List[Dict[str, Any]]]:
+        """Score many queries with a single matrix multiply."""
+        queries = _normalize_rows(np.atleast_2d(np.asarray(query_vectors, dtype=np.float32)))
+        if queries.shape[1] != self.matrix.shape[1]:
+            raise ValueError(
+                f"Query dimension {queries.shape[1]} != index dimension {self.matrix.shape[1]}"
+            )
+        scores = queries @ self.matrix.T
+        return [self._top_k(row, top_k, threshold) for row in scores]
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+
+# ── Lazy singleton ────────────────────────────────────────────────────────────
+# Rebuilt whenever the ProductCatalog version moves so prices never go stale.
+
+_SNAPSHOT_RETRY_SECONDS = 60  # back-off after a failed snapshot load
+
+_index: Optional[LocalVectorIndex] = None
+_index_source_version: int = -1
+_snapshot: Optional[LocalVectorIndex] = None
+_snapshot_failed_at: float = 0.0
+_index_lock = threading.Lock()
+
+
+def _load_snapshot(path: str) -> Optional[LocalVectorIndex]:
+    """The snapshot index, loaded once (a failed load is retried after a back-off)."""
+    global _snapshot, _snapshot_failed_at
+    if _snapshot is None and time.time() - _snapshot_failed_at >= _SNAPSHOT_RETRY_SECONDS:
+        with _index_lock:
+            if _snapshot is None and time.time() - _snapshot_failed_at >= _SNAPSHOT_RETRY_SECONDS:
+                try:
+                    _snapshot = LocalVectorIndex.load(path)
+                except Exception as e:
+                    _snapshot_failed_at = time.time()
+                    logger.error(f"Failed to load vector snapshot {path} (retry in {_SNAPSHOT_RETRY_SECONDS}s): {e}")
+    return _snapshot
+
+
+def get_local_vector_index(reload: bool = True) -> Optional[LocalVectorIndex]:
+    """Return the local index, or None if it cannot be built (caller falls back to pgvector).
+
+    ``reload=False``: do not reload a stale catalog (async callers do that off the loop).
+
+    A snapshot is served only while its recorded catalog version matches the
+    persisted one (or the catalog cannot be loaded); after a reseed the index
+    is rebuilt from the catalog rows so prices and availability stay current.
+    """
+    global _index, _index_source_version
+    from src.rag.catalog import get_product_catalog
+
+    catalog = get_product_catalog()
+    loaded = catalog.ensure_loaded(reload)
+
+    snapshot_path = RetrieverConfig.vector_snapshot_path
+    if snapshot_path:
+        snapshot = _load_snapshot(snapshot_path)
+        if snapshot is not None and (not loaded or catalog.remote_version == snapshot.version):
+            return snapshot
+
+    if not loaded:
+        return None
+
+    if _index is None or _index_source_version != catalog.version:
+        with _index_lock:
+            if _index is None or _index_source_version != catalog.version:
+                try:
+                    _index = LocalVectorIndex.from_products(catalog.products(), version=catalog.version)
+                    _index_source_version = catalog.version
+                    stale = " (vector snapshot is from another catalog version)" if snapshot_path else ""
+                    logger.info(f"LocalVectorIndex built from catalog: {len(_index)} vectors{stale}")
+                except Exception as e:
+                    logger.error(f"Failed to build local vector index: {e}")
+                    return None
+    return _index
@@ -49,10 +49,16 @@ We host live music nights, art showcases, and fundraisers. Eco-friendly packagin
         return f"Sorry, I couldn't retrieve shop information right now. Error: {str(e)}"
 
 
+async def aabout_us_func(_: str = "") -> str:
+    """Async variant — pure in-memory, avoids the default executor hop."""
+    return about_us_func(_)
+
+
 # Create tool
 about_us_tool = Tool(
     name="AboutUsTool",
     func=about_us_func,
+    coroutine=aabout_us_func,
     description=(
         "Get information about the coffee shop: story, mission, hours, "
         "location, delivery areas, and specialties. No input required."
@@ -0,0 +1,131 @@
+"""Per-request latency budget carried through the graph.
+
+A turn can chain several LLM calls (the details agent alone loops up to five
+tool rounds), each bounded only by the provider clients' ``LLM_TIMEOUT_SECONDS``. The chat endpoints
+therefore stamp an absolute deadline (epoch seconds, so it survives being
+copied into checkpoint metadata) into ``config["configurable"]["deadline"]``.
+Nodes read it back to:
+
+- cap every LLM / tool call at the time that is left (``bounded``),
+- skip optional work such as memory extraction or the order responder when
+  the turn is already running late (``has_budget``),
+- and fall back to templated replies when a call is cut short
+  (``DeadlineExceeded``).
+
+Without a deadline in the config (scripts, notebooks) everything behaves as
+before: LLM calls are bounded only by each provider's own client timeout, so
+a hung primary still leaves the fallback its turn, and nothing is skipped.
+"""
+
+import asyncio
+import inspect
+import logging
+import time
+from typing import Awaitable, Optional, Tuple, TypeVar
+
+from langchain_core.runnables import RunnableConfig
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+CONFIG_KEY = "deadline"
+
+# Templated reply for turns whose budget ran out before any answer was ready
+DEADLINE_REPLY = "Sorry, that took longer than expected on my side. Could you send that again?"
+
+
+class DeadlineExceeded(Exception):
+    """The request budget ran out before (or while) a call could finish."""
+
+
+def budget_for(endpoint: str) -> float:
+    """Seconds a whole turn may take on ``endpoint`` ("chat" | "stream" | "resume")."""
+    budgets = {
+        "chat": settings.request_budget_chat_seconds,
+        "stream": settings.request_budget_stream_seconds,
+        "resume": settings.request_budget_resume_seconds,
+    }
+    return budgets.get(endpoint, settings.request_budget_chat_seconds)
+
+
+def new_deadline(endpoint: str, started: Optional[float] = None) -> float:
+    """Absolute deadline for a request on ``endpoint`` that started at ``started`` (default: now)."""
+    return (started if started is not None else time.time()) + budget_for(endpoint)
+
+
+def remaining(config: Optional[RunnableConfig]) -> Optional[float]:
+    """Seconds left before the request deadline, or None when there is no deadline."""
+    deadline = ((config or {}).get("configurable") or {}).get(CONFIG_KEY)
+    if deadline is None:
+        return None
+    return float(deadline) - time.time()
+
+
+def has_budget(config: Optional[RunnableConfig], seconds: float = None) -> bool:
+    """True if at least ``seconds`` (default: the optional-step threshold) are left."""
+    left = remaining(config)
+    if left is None:
+        return True
+    needed = settings.deadline_optional_step_seconds if seconds is None else seconds
+    return left >= needed
+
+
+def _timeout(config: Optional[RunnableConfig], cap: Optional[float]) -> Tuple[Optional[float], bool]:
+    """``call_timeout`` plus whether the request deadline (not ``cap``) sets it."""
+    left = remaining(config)
+    if left is None:
+        return (float(cap) if cap is not None else None), False
+    usable = left - settings.deadline_reserve_seconds
+    if usable <= 0:
+        raise DeadlineExceeded(f"request deadline passed ({left:.2f}s left)")
+    if cap is not None and cap < usable:
+        return float(cap), False
+    return usable, True
+
+
+def call_timeout(config: Optional[RunnableConfig], cap: float = None) -> Optional[float]:
+    """Timeout for the next call: the time left minus the reserve, at most ``cap``.
+
+    None with neither a deadline nor a cap: an LLM chain is then bounded by
+    its providers' client timeouts, one per provider, so its fallback can run.
+    Raises ``DeadlineExceeded`` when nothing usable is left.
+    """
+    return _timeout(config, cap)[0]
+
+
+async def bounded(awaitable: Awaitable[T], config: Optional[RunnableConfig], cap: float = None) -> T:
+    """Await ``awaitable`` within ``call_timeout(config, cap)``.
+
+    Raises ``DeadlineExceeded`` instead of ``asyncio.TimeoutError`` when the
+    request deadline cut the call off, so callers can tell a budget cut-off
+    apart from a provider error. Running into ``cap`` alone stays an
+    ``asyncio.TimeoutError``.
+    """
+    try:
+        timeout, by_deadline = _timeout(config, cap)
+    except DeadlineExceeded:
+        if inspect.iscoroutine(awaitable):
+            awaitable.close()  # never started — avoid the "never awaited" warning
+        raise
+    if timeout is None:
+        return await awaitable
+    try:
+        return await asyncio.wait_for(awaitable, timeout)
+    except asyncio.TimeoutError as e:
+        if not by_deadline:
+            raise
+        raise DeadlineExceeded(f"call cut off after {timeout:.2f}s") from e
+
+
+def record_degraded(config: Optional[RunnableConfig], step: str) -> None:
+    """Log and count a step that was skipped or cut short by the deadline."""
+    from src.utils.metrics import DEADLINE_DEGRADED
+
+    node = ((config or {}).get("metadata") or {}).get("langgraph_node", "unknown")
+    left = remaining(config)
+    DEADLINE_DEGRADED.inc(labels={"node": node, "step": step})
+    budget = f"{left:.2f}s left" if left is not None else "no request deadline"
+    logger.warning(f"Deadline: {node} degraded '{step}' ({budget})")
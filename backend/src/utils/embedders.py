@@ -0,0 +1,137 @@
+"""Pluggable embedding backends.
+
+``EmbeddingPool`` builds its model through ``create_embedder`` instead of
+hard-wiring the HuggingFace endpoint. Select a backend with
+``EMBEDDING_BACKEND``:
+
+- ``hf_endpoint`` — HuggingFace Inference endpoint (default, remote)
+- ``local``       — sentence-transformers on CPU, loaded from
+                    ``EMBEDDING_LOCAL_PATH`` (or the hub id in ``EMBEDDING_MODEL``);
+                    needs ``pip install sentence-transformers``
+- ``hashing``     — deterministic feature hashing, no model at all; for tests
+                    and offline development only (vectors are not comparable
+                    with the BGE vectors stored in pgvector)
+
+Every backend must produce ``EMBEDDING_DIM`` (768) vectors — the width of the
+pgvector column and of the local vector index.
+"""
+
+import hashlib
+import logging
+import math
+import re
+from typing import Callable, Dict, List
+
+from langchain_core.embeddings import Embeddings
+
+from src.config import Config
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+class HashingEmbeddings(Embeddings):
+    """Deterministic bag-of-features embedder (word unigrams + char trigrams).
+
+    Same text → same vector on every machine, no network and no model files,
+    and texts sharing words or spelling land close together.
+    """
+
+    def __init__(self, dim: int = None):
+        self.dim = dim or Config.EMBEDDING_DIM
+
+    def _features(self, text: str) -> List[str]:
+        words = _TOKEN_RE.findall((text or "").casefold())
+        features = [f"w:{w}" for w in words]
+        for w in words:
+            padded = f"#{w}#"
+            features += [f"c:{padded[i:i + 3]}" for i in range(len(padded) - 2)]
+        return features
+
+    def embed_query(self, text: str) -> List[float]:
+        vector = [0.0] * self.dim
+        for feature in self._features(text):
+            digest = hashlib.blake2b(feature.encode(), digest_size=8).digest()
+            bucket = int.from_bytes(digest[:4], "little") % self.dim
+            vector[bucket] += 1.0 if digest[4] & 1 else -1.0
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        return [v / norm for v in vector]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed_query(t) for t in texts]
+
+
+def _hf_endpoint(model_name: str) -> Embeddings:
+    from langchain_huggingface import HuggingFaceEndpointEmbeddings
+
+    return HuggingFaceEndpointEmbeddings(model=model_name, huggingfacehub_api_token=Config.HF_API_KEY)
+
+
+def _local(model_name: str) -> Embeddings:
+    # langchain_huggingface imports fine without it and only fails once the
+    # model is constructed — check for sentence-transformers up front
+    try:
+        import sentence_transformers  # noqa: F401
+        from langchain_huggingface import HuggingFaceEmbeddings
+    except ImportError as e:
+        raise ImportError(
+            "EMBEDDING_BACKEND=local needs sentence-transformers — pip install sentence-transformers"
+        ) from e
+
+    return HuggingFaceEmbeddings(
+        model_name=Config.EMBEDDING_LOCAL_PATH or model_name,
+        model_kwargs={"device": Config.EMBEDDING_DEVICE},
+        encode_kwargs={"normalize_embeddings": True},
+    )
+
+
+def _hashing(model_name: str) -> Embeddings:
+    return HashingEmbeddings()
+
+
+EMBEDDER_BACKENDS: Dict[str, Callable[[str], Embeddings]] = {
+    "hf_endpoint": _hf_endpoint,
+    "local": _local,
+    "hashing": _hashing,
+}
+
+
+def register_embedder_backend(name: str, factory: Callable[[str], Embeddings]) -> None:
+    """Add a backend selectable with ``EMBEDDING_BACKEND=<name>``."""
+    EMBEDDER_BACKENDS[name] = factory
+
+
+def embedder_cache_key(model_name: str, backend: str = None) -> str:
+    """Identity of the vector space, used to key cached and precomputed vectors.
+
+    ``local`` loading ``model_name`` from the hub runs the same model as the
+    endpoint, so both share a key. A model loaded from ``EMBEDDING_LOCAL_PATH``
+    may be anything, so its path (which carries the snapshot revision for hub
+    caches) is part of the key. The hashing stand-in gets its own.
+    """
+    backend = backend or Config.EMBEDDING_BACKEND
+    if backend == "hashing":
+        return "hashing"
+    if backend == "local" and Config.EMBEDDING_LOCAL_PATH:
+        return f"local:{Config.EMBEDDING_LOCAL_PATH.rstrip('/')}"
+    return model_name
+
+
+def create_embedder(model_name: str, backend: str = None) -> Embeddings:
+    """Build the configured backend and enforce the embedding dimension."""
+    backend = backend or Config.EMBEDDING_BACKEND
+    factory = EMBEDDER_BACKENDS.get(backend)
+    if factory is None:
+        raise ValueError(f"Unknown EMBEDDING_BACKEND '{backend}' (choose from {sorted(EMBEDDER_BACKENDS)})")
+
+    model = factory(model_name)
+    if backend != "hf_endpoint":
+        # Cheap for in-process backends; a remote probe would cost a round trip at startup
+        dim = len(model.embed_query("dimension check"))
+        if dim != Config.EMBEDDING_DIM:
+            raise ValueError(
+                f"Embedding backend '{backend}' produces {dim}-dim vectors, expected {Config.EMBEDDING_DIM}"
+            )
+    logger.info(f"Embedding backend '{backend}' ready for {model_name}")
+    return model
@@ -0,0 +1,332 @@
+"""Per-node latency instrumentation for the coffee shop graph.
+
+Two sources feed the same numbers:
+
+- ``instrument_node`` wraps every graph node and records its wall time.
+- ``InstrumentationCallback`` (a LangChain callback handler passed in the
+  graph config) records LLM time, token counts, retries and tool time,
+  attributed to the node that made the call via ``langgraph_node`` metadata.
+
+Everything lands in two places: process-wide histograms/counters rendered in
+Prometheus text format by ``render_prometheus()`` (served at ``/metrics``),
+and a per-request ``RequestMetrics`` breakdown carried in a ContextVar, which
+the chat endpoints attach to SSE ``status`` events.
+"""
+
+import bisect
+import functools
+import logging
+import threading
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+_INF = 'le="+Inf"'
+
+
+def _label_key(labels: Optional[Dict[str, str]]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in (labels or {}).items()))
+
+
+def _num(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _format_labels(key: LabelKey, extra: str = "") -> str:
+    parts = [f'{k}="{v}"' for k, v in key]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Histogram:
+    """Cumulative-bucket histogram per label set (Prometheus semantics)."""
+
+    def __init__(self, name: str, help_text: str, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._series: Dict[LabelKey, List[float]] = {}  # bucket counts + [sum, count]
+
+    def observe(self, value: float, labels: Optional[Dict[str, str]] = None) -> None:
+        key = _label_key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0.0] * (len(self.buckets) + 2)
+            if index < len(self.buckets):
+                series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                cumulative = 0.0
+                for bound, count in zip(self.buckets, series):
+                    cumulative += count
+                    le = 'le="%g"' % bound
+                    lines.append(f"{self.name}_bucket{_format_labels(key, le)} {_num(cumulative)}")
+                lines.append(f"{self.name}_bucket{_format_labels(key, _INF)} {_num(series[-1])}")
+                lines.append(f"{self.name}_sum{_format_labels(key)} {series[-2]:.6f}")
+                lines.append(f"{self.name}_count{_format_labels(key)} {_num(series[-1])}")
+        return lines
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help = help_text
+        self._lock = threading.Lock()
+        self._values: Dict[LabelKey, float] = defaultdict(float)
+
+    def inc(self, value: float = 1.0, labels: Optional[Dict[str, str]] = None) -> None:
+        with self._lock:
+            self._values[_label_key(labels)] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(key)} {_num(value)}")
+        return lines
+
+
+# ── Process-wide metrics ──────────────────────────────────────────────────────
+
+NODE_SECONDS = Histogram("coffee_node_duration_seconds", "Wall time per graph node")
+LLM_SECONDS = Histogram("coffee_llm_duration_seconds", "LLM call latency per graph node")
+TOOL_SECONDS = Histogram("coffee_tool_duration_seconds", "Tool call latency per tool")
+REQUEST_SECONDS = Histogram("coffee_request_duration_seconds", "End-to-end chat request latency per endpoint")
+PRELOAD_SECONDS = Histogram("coffee_preload_duration_seconds", "Pre-graph Supabase/Mem0 loads per endpoint")
+LLM_TOKENS = Counter("coffee_llm_tokens_total", "LLM tokens per graph node and direction")
+LLM_RETRIES = Counter("coffee_llm_retries_total", "LLM retries per graph node")
+LLM_ERRORS = Counter("coffee_llm_errors_total", "Failed LLM calls per graph node")
+NODE_ERRORS = Counter("coffee_node_errors_total", "Graph node runs ending in an exception (interrupts excluded)")
+DEADLINE_DEGRADED = Counter("coffee_deadline_degraded_total", "Steps skipped or cut short by the request deadline, per node")
+
+_METRICS = [
+    NODE_SECONDS, LLM_SECONDS, TOOL_SECONDS, REQUEST_SECONDS, PRELOAD_SECONDS,
+    LLM_TOKENS, LLM_RETRIES, LLM_ERRORS, NODE_ERRORS, DEADLINE_DEGRADED,
+]
+
+# Components with their own counters (caches, fast router, memory gate) register here
+_gauge_providers: Dict[str, Callable[[], Dict[str, Any]]] = {}
+
+
+def register_gauge_provider(prefix: str, provider: Callable[[], Dict[str, Any]]) -> None:
+    """Export every numeric value of ``provider()`` as gauge ``coffee_<prefix>_<key>``."""
+    _gauge_providers[prefix] = provider
+
+
+def render_prometheus() -> str:
+    lines: List[str] = []
+    for metric in _METRICS:
+        lines.extend(metric.render())
+    for prefix, provider in _gauge_providers.items():
+        try:
+            values = provider() or {}
+        except Exception as e:
+            logger.debug(f"Gauge provider {prefix} failed: {e}")
+            continue
+        for key, value in values.items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            name = f"coffee_{prefix}_{key}"
+            lines += [f"# TYPE {name} gauge", f"{name} {_num(value)}"]
+    return "\n".join(lines) + "\n"
+
+
+# ── Per-request breakdown ─────────────────────────────────────────────────────
+
+def _empty_node() -> Dict[str, float]:
+    return {
+        "wall_ms": 0.0, "llm_ms": 0.0, "tool_ms": 0.0, "llm_calls": 0, "tool_calls": 0,
+        "tokens_in": 0, "tokens_out": 0, "retries": 0, "runs": 0,
+    }
+
+
+class RequestMetrics:
+    """Timing breakdown of one chat request, per node."""
+
+    def __init__(self, endpoint: str):
+        self.endpoint = endpoint
+        self.started = time.perf_counter()
+        self.preload_ms = 0.0
+        self.nodes: Dict[str, Dict[str, float]] = defaultdict(_empty_node)
+        self._lock = threading.Lock()
+        self.callback = InstrumentationCallback()
+
+    def add(self, node: str, **values: float) -> None:
+        with self._lock:
+            entry = self.nodes[node or "unknown"]
+            for key, value in values.items():
+                entry[key] += value
+
+    def record_preload(self, seconds: float) -> None:
+        self.preload_ms += seconds * 1000
+        PRELOAD_SECONDS.observe(seconds, {"endpoint": self.endpoint})
+
+    def breakdown(self) -> Dict[str, Any]:
+        with self._lock:
+            nodes = {
+                name: {k: round(v, 1) if isinstance(v, float) else v for k, v in entry.items()}
+                for name, entry in self.nodes.items()
+            }
+        return {
+            "elapsed_ms": round((time.perf_counter() - self.started) * 1000, 1),
+            "preload_ms": round(self.preload_ms, 1),
+            "nodes": nodes,
+        }
+
+    def finish(self) -> Dict[str, Any]:
+        REQUEST_SECONDS.observe(time.perf_counter() - self.started, {"endpoint": self.endpoint})
+        summary = self.breakdown()
+        logger.info(f"Request timings ({self.endpoint}): {summary}")
+        return summary
+
+
+_current: ContextVar[Optional[RequestMetrics]] = ContextVar("coffee_request_metrics", default=None)
+
+
+def start_request(endpoint: str) -> RequestMetrics:
+    """Create the request's metrics and make them current for this context."""
+    metrics = RequestMetrics(endpoint)
+    _current.set(metrics)
+    return metrics
+
+
+def use_request(metrics: RequestMetrics) -> None:
+    """Re-bind ``metrics`` in a new context (e.g. inside a streaming generator)."""
+    _current.set(metrics)
+
+
+def current_request() -> Optional[RequestMetrics]:
+    return _current.get()
+
+
+# ── Graph node wrapper ────────────────────────────────────────────────────────
+
+def instrument_node(name: str, fn: Callable) -> Callable:
+    """Wrap an async node so each run's wall time is recorded under ``name``.
+
+    ``functools.wraps`` keeps the original signature, so LangGraph still
+    injects ``config`` into nodes that ask for it.
+    """
+    from langgraph.errors import GraphInterrupt
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        outcome = "ok"
+        try:
+            return await fn(*args, **kwargs)
+        except GraphInterrupt:
+            outcome = "interrupt"
+            raise
+        except Exception:
+            outcome = "error"
+            NODE_ERRORS.inc(labels={"node": name})
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            NODE_SECONDS.observe(elapsed, {"node": name, "outcome": outcome})
+            request = current_request()
+            if request is not None:
+                request.add(name, wall_ms=elapsed * 1000, runs=1)
+
+    return wrapper
+
+
+# ── LangChain callbacks (LLM / tool time, tokens, retries) ────────────────────
+
+def _token_usage(response) -> Tuple[int, int]:
+    usage = (getattr(response, "llm_output", None) or {}).get("token_usage") or {}
+    if usage:
+        return int(usage.get("prompt_tokens") or 0), int(usage.get("completion_tokens") or 0)
+    tokens_in = tokens_out = 0
+    for generations in getattr(response, "generations", None) or []:
+        for generation in generations:
+            meta = getattr(getattr(generation, "message", None), "usage_metadata", None) or {}
+            tokens_in += int(meta.get("input_tokens") or 0)
+            tokens_out += int(meta.get("output_tokens") or 0)
+    return tokens_in, tokens_out
+
+
+class InstrumentationCallback(BaseCallbackHandler):
+    """Times LLM and tool runs and attributes them to the calling graph node."""
+
+    run_inline = True  # plain bookkeeping — don't hop to a thread per event
+
+    def __init__(self):
+        self._starts: Dict[UUID, Tuple[float, str, str]] = {}
+
+    def _begin(self, run_id: UUID, kind: str, metadata: Optional[Dict[str, Any]], label: str = "") -> None:
+        node = (metadata or {}).get("langgraph_node") or "unknown"
+        self._starts[run_id] = (time.perf_counter(), node, label or kind)
+
+    def _end(self, run_id: UUID) -> Optional[Tuple[float, str, str]]:
+        start = self._starts.pop(run_id, None)
+        if start is None:
+            return None
+        return time.perf_counter() - start[0], start[1], start[2]
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, metadata=None, **kwargs):
+        self._begin(run_id, "llm", metadata)
+
+    def on_llm_start(self, serialized, prompts, *, run_id, metadata=None, **kwargs):
+        self._begin(run_id, "llm", metadata)
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        ended = self._end(run_id)
+        if ended is None:
+            return
+        elapsed, node, _ = ended
+        tokens_in, tokens_out = _token_usage(response)
+        LLM_SECONDS.observe(elapsed, {"node": node})
+        LLM_TOKENS.inc(tokens_in, {"node": node, "direction": "in"})
+        LLM_TOKENS.inc(tokens_out, {"node": node, "direction": "out"})
+        request = current_request()
+        if request is not None:
+            request.add(node, llm_ms=elapsed * 1000, llm_calls=1, tokens_in=tokens_in, tokens_out=tokens_out)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        ended = self._end(run_id)
+        if ended is not None:
+            LLM_ERRORS.inc(labels={"node": ended[1]})
+
+    def on_retry(self, retry_state, *, run_id, metadata=None, **kwargs):
+        node = (metadata or {}).get("langgraph_node") or "unknown"
+        LLM_RETRIES.inc(labels={"node": node})
+        request = current_request()
+        if request is not None:
+            request.add(node, retries=1)
+
+    def on_tool_start(self, serialized, input_str, *, run_id, metadata=None, **kwargs):
+        self._begin(run_id, "tool", metadata, label=(serialized or {}).get("name") or kwargs.get("name") or "tool")
+
+    def on_tool_end(self, output, *, run_id, **kwargs):
+        ended = self._end(run_id)
+        if ended is None:
+            return
+        elapsed, node, tool = ended
+        TOOL_SECONDS.observe(elapsed, {"tool": tool})
+        request = current_request()
+        if request is not None:
+            request.add(node, tool_ms=elapsed * 1000, tool_calls=1)
+
+    def on_tool_error(self, error, *, run_id, **kwargs):
+        self._end(run_id)
@@ -2,16 +2,33 @@
 
 Provides:
 - Connection pooling with health checks
+- Single-flight coalescing of identical concurrent LLM calls
+- Per-provider circuit breakers (fail fast onto the healthy provider)
+- Per-provider LLM admission control with priority classes
+- Opt-in hedging of slow LLM calls onto the fallback provider
 - Thread-safe singleton pattern
+- Query-embedding cache (LRU + TTL, optional on-disk tier)
 - Distributed cache support (Redis)
 - Resource limits & rate limiting
 - Monitoring & observability hooks
 """
 
 import os
+import re
+import json
+import asyncio
+import atexit
+import hashlib
+import heapq
+import itertools
 import logging
+import sqlite3
 import threading
-from typing import Optional
+import weakref
+from array import array
+from collections import OrderedDict, deque
+from contextvars import ContextVar
+from typing import ClassVar, Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 from functools import wraps
 import time
@@ -19,9 +36,12 @@ import time
 from dotenv import load_dotenv
 from langchain_openai import ChatOpenAI
 from langchain_groq import ChatGroq
-from langchain_huggingface import HuggingFaceEndpointEmbeddings
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import message_to_dict
 
 from src.config import Config
+from src.utils.embedders import create_embedder, embedder_cache_key
 
 load_dotenv()
 
@@ -38,12 +58,36 @@ try:
 except ImportError:
     groq = None
 
+class ProviderUnavailable(Exception):
+    """Every usable LLM provider has an open circuit breaker — fail fast instead of waiting."""
+
+
+class LLMOverloaded(ProviderUnavailable):
+    """Admission control shed the call: the provider's rate budget is spent for its priority."""
+
+
+def is_rate_limit_error(e: Exception) -> bool:
+    """True for provider 429s (typed client errors or a "rate limit" message)."""
+    return (
+        "rate limit" in str(e).lower()
+        or getattr(e, "status_code", None) == 429
+        or bool(openai and isinstance(e, openai.RateLimitError))
+        or bool(groq and isinstance(e, groq.RateLimitError))
+    )
+
+
 def get_llm_error_message(e: Exception) -> Optional[str]:
     """Classifies an LLM exception and returns a user-friendly error message if applicable."""
     error_str = str(e).lower()
+
+    # Check for shed calls and open circuit breakers (no provider was even tried)
+    if isinstance(e, LLMOverloaded):
+        return "🚨 LLM Busy: We're handling a lot of requests right now. Please try again in a moment."
+    if isinstance(e, ProviderUnavailable):
+        return "🚨 LLM Unavailable: Our AI provider is having trouble right now. Please try again in a minute."
     
     # Check for Rate Limits
-    if "rate limit" in error_str or (openai and isinstance(e, openai.RateLimitError)) or (groq and isinstance(e, groq.RateLimitError)):
+    if is_rate_limit_error(e):
         return "🚨 LLM Rate Limit: Too many requests. Please wait a moment before trying again."
     
     # Check for Token/Context Limits
@@ -93,6 +137,948 @@ class HealthChecker:
                 logger.warning("Connection health check failed")
 
 
+# ============================================================
+# LLM Request Coalescing (single-flight)
+# ============================================================
+
+class _StreamFlight:
+    """Chunks of one streamed call so far, replayed to every caller that joins it."""
+
+    def __init__(self):
+        self.chunks: List = []
+        self.finished = False
+        self.error: Optional[BaseException] = None
+        self.task: Optional[asyncio.Task] = None
+        self._changed = asyncio.Event()
+
+    def notify(self) -> None:
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def wait(self) -> None:
+        await self._changed.wait()
+
+    def done(self) -> bool:
+        return self.task.done()
+
+    def cancel(self) -> None:
+        self.task.cancel()
+
+
+class SingleFlight:
+    """Share one in-flight call among concurrent callers with the same key.
+
+    The first caller (the leader) starts the call as its own task; callers
+    arriving while it runs await the same future — or, for ``stream``, get
+    the chunks produced so far and then the rest as they arrive. Waiters are
+    counted per call: a caller cancelled by its deadline (or a lost hedge)
+    leaves the call running for the others, and the last one to leave
+    cancels it so no provider request outlives every caller.
+
+    Calls are tracked per event loop (held weakly, like the async Supabase
+    clients), so a future is never shared across loops.
+    """
+
+    def __init__(self):
+        self._loops: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, object]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._waiters: Dict[object, int] = {}
+        self.leaders = 0
+        self.coalesced = 0
+        self.abandoned = 0
+
+    def _in_flight(self) -> Dict[str, object]:
+        loop = asyncio.get_running_loop()
+        in_flight = self._loops.get(loop)
+        if in_flight is None:
+            in_flight = self._loops[loop] = {}
+        return in_flight
+
+    @staticmethod
+    def _done(in_flight: Dict[str, object], key: str, flight) -> None:
+        if in_flight.get(key) is flight:
+            del in_flight[key]
+
+    def _join(self, in_flight: Dict[str, object], key: str, start):
+        """The call in flight under ``key``, started with ``start()`` if there is none."""
+        flight = in_flight.get(key)
+        if flight is not None:
+            self.coalesced += 1
+        else:
+            self.leaders += 1
+            flight = in_flight[key] = start()
+        self._waiters[flight] = self._waiters.get(flight, 0) + 1
+        return flight
+
+    def _leave(self, in_flight: Dict[str, object], key: str, flight) -> None:
+        self._waiters[flight] -= 1
+        if not self._waiters[flight]:
+            del self._waiters[flight]
+            if not flight.done():
+                # Nobody is left waiting — stop the provider call, and let the
+                # next identical prompt start a fresh one instead of joining it
+                self.abandoned += 1
+                self._done(in_flight, key, flight)
+                flight.cancel()
+
+    async def do(self, key: str, call):
+        in_flight = self._in_flight()
+
+        def start() -> asyncio.Future:
+            future = asyncio.ensure_future(call())
+            future.add_done_callback(lambda f: self._done(in_flight, key, f))
+            future.add_done_callback(_retrieve)  # even if every caller gave up
+            return future
+
+        future = self._join(in_flight, key, start)
+        try:
+            return await asyncio.shield(future)
+        finally:
+            self._leave(in_flight, key, future)
+
+    async def stream(self, key: str, call):
+        """Async-iterate the chunks of ``call()`` (an async iterator), shared like ``do``."""
+        in_flight = self._in_flight()
+
+        async def pump(flight: _StreamFlight) -> None:
+            try:
+                async for chunk in call():
+                    flight.chunks.append(chunk)
+                    flight.notify()
+            except asyncio.CancelledError as e:
+                flight.error = e
+                raise
+            except Exception as e:
+                flight.error = e
+            finally:
+                flight.finished = True
+                self._done(in_flight, key, flight)
+                flight.notify()
+
+        def start() -> _StreamFlight:
+            flight = _StreamFlight()
+            flight.task = asyncio.ensure_future(pump(flight))
+            return flight
+
+        flight = self._join(in_flight, key, start)
+        try:
+            sent = 0
+            while True:
+                while sent < len(flight.chunks):
+                    yield flight.chunks[sent]
+                    sent += 1
+                if flight.finished:
+                    if flight.error is not None:
+                        raise flight.error
+                    return
+                await flight.wait()
+        finally:
+            self._leave(in_flight, key, flight)
+
+    def stats(self) -> Dict[str, float]:
+        calls = self.leaders + self.coalesced
+        return {
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+            "in_flight": sum(len(in_flight) for in_flight in list(self._loops.values())),
+            "abandoned": self.abandoned,
+            "hit_rate": round(self.coalesced / calls, 4) if calls else 0.0,
+        }
+
+
+_llm_single_flight = SingleFlight()
+
+
+def _prompt_key(model: BaseChatModel, messages, stop, kwargs) -> str:
+    """Hash of everything that determines the completion (provider, model, params, messages, tools)."""
+    payload = {
+        # A hedge must never coalesce onto the call it is racing
+        "provider": getattr(model, "provider", None),
+        "model": type(model).__name__,
+        "params": model._identifying_params,
+        "messages": [message_to_dict(m) for m in messages],
+        "stop": stop,
+        "kwargs": kwargs,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class _SingleFlightMixin:
+    """Coalesce identical concurrent calls into one provider request.
+
+    Hooks ``_agenerate`` and ``_astream``, below prompt formatting, tool
+    binding and structured output, so every caller still gets its own
+    callback run (metrics, tracing, ``astream_events`` tokens for
+    ``/chat/stream``) while only the leader reaches the provider. Streamed
+    followers get the leader's chunks replayed from the first one.
+    """
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        generate = super()._agenerate
+        if not Config.LLM_COALESCING_ENABLED:
+            return await generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+
+        key = _prompt_key(self, messages, stop, kwargs)
+        result = await _llm_single_flight.do(
+            key, lambda: generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+        )
+        # LangChain stamps per-run ids onto the returned message — never share the object
+        return result.model_copy(deep=True)
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        stream = super()._astream
+        if not Config.LLM_COALESCING_ENABLED:
+            async for chunk in stream(messages, stop=stop, run_manager=run_manager, **kwargs):
+                yield chunk
+            return
+
+        key = "stream:" + _prompt_key(self, messages, stop, kwargs)
+        chunks = _llm_single_flight.stream(
+            key, lambda: stream(messages, stop=stop, run_manager=run_manager, **kwargs)
+        )
+        try:
+            async for chunk in chunks:
+                yield chunk.model_copy(deep=True)
+        finally:
+            await chunks.aclose()
+
+
+def get_llm_coalescing_stats() -> Dict[str, float]:
+    """Leader / coalesced call counts of the LLM single-flight layer."""
+    return _llm_single_flight.stats()
+
+
+# ============================================================
+# LLM Provider Circuit Breakers
+# ============================================================
+
+class CircuitBreaker:
+    """Per-provider breaker over a rolling window of call outcomes.
+
+    ``closed`` → ``open`` once the last ``LLM_BREAKER_WINDOW`` calls (at least
+    ``LLM_BREAKER_MIN_CALLS``) hold too many failures (errors, 429s, timeouts)
+    or too many calls slower than ``LLM_BREAKER_SLOW_CALL_SECONDS``. While open,
+    calls fail fast with ``ProviderUnavailable`` so the fallback provider takes
+    them at once. After ``LLM_BREAKER_COOLDOWN_SECONDS`` the breaker turns
+    ``half_open`` and lets ``LLM_BREAKER_HALF_OPEN_PROBES`` real calls through:
+    a healthy probe closes it, a failing or slow one re-opens it.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+    _STATE_CODES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+    def __init__(self, name: str):
+        self.name = name
+        self.state = self.CLOSED
+        self._window = deque(maxlen=Config.LLM_BREAKER_WINDOW)  # (failed, slow) per call
+        self._lock = threading.Lock()
+        self._opened_at = 0.0
+        self._probes = 0
+        self.calls = 0
+        self.failures = 0
+        self.rate_limited = 0
+        self.rejected = 0
+        self.trips = 0
+        self.last_error: Optional[str] = None
+
+    def _refresh(self, now: float) -> None:
+        """Move open → half_open once the cooldown passed. Caller holds the lock."""
+        if self.state == self.OPEN and now - self._opened_at >= Config.LLM_BREAKER_COOLDOWN_SECONDS:
+            self.state = self.HALF_OPEN
+            self._probes = 0
+            logger.info(f"LLM breaker {self.name}: half-open, probing")
+
+    def _open(self, now: float, reason: str) -> None:
+        self.state = self.OPEN
+        self._opened_at = now
+        self.trips += 1
+        logger.warning(f"LLM breaker {self.name}: open for {Config.LLM_BREAKER_COOLDOWN_SECONDS}s ({reason})")
+
+    def available(self) -> bool:
+        """True if a call would be let through right now (no probe slot is taken)."""
+        if not Config.LLM_BREAKER_ENABLED:
+            return True
+        with self._lock:
+            self._refresh(time.monotonic())
+            if self.state == self.HALF_OPEN:
+                return self._probes < Config.LLM_BREAKER_HALF_OPEN_PROBES
+            return self.state == self.CLOSED
+
+    def acquire(self) -> bool:
+        """Admit one call; returns True if it is a half-open probe.
+
+        Raises ``ProviderUnavailable`` while open (or while every probe slot is taken).
+        """
+        if not Config.LLM_BREAKER_ENABLED:
+            return False
+        with self._lock:
+            self._refresh(time.monotonic())
+            if self.state == self.CLOSED:
+                return False
+            if self.state == self.HALF_OPEN and self._probes < Config.LLM_BREAKER_HALF_OPEN_PROBES:
+                self._probes += 1
+                return True
+            self.rejected += 1
+        raise ProviderUnavailable(f"LLM provider {self.name} circuit is {self.state}")
+
+    def record(self, probe: bool, elapsed: float, error: Optional[BaseException] = None) -> None:
+        """Count one finished call and trip / close the breaker as needed."""
+        if not Config.LLM_BREAKER_ENABLED:
+            return
+        failed = error is not None
+        slow = elapsed >= Config.LLM_BREAKER_SLOW_CALL_SECONDS
+        now = time.monotonic()
+        with self._lock:
+            self.calls += 1
+            if failed:
+                self.failures += 1
+                self.rate_limited += 1 if is_rate_limit_error(error) else 0
+                self.last_error = f"{type(error).__name__}: {str(error)[:200]}"
+            if probe:
+                self._probes = max(0, self._probes - 1)
+                if failed or slow:
+                    self._open(now, "probe failed" if failed else f"probe took {elapsed:.1f}s")
+                else:
+                    self.state = self.CLOSED
+                    self._window.clear()
+                    logger.info(f"LLM breaker {self.name}: closed after a healthy probe")
+                return
+
+            self._window.append((failed, slow))
+            if self.state != self.CLOSED or len(self._window) < Config.LLM_BREAKER_MIN_CALLS:
+                return
+            failure_rate = sum(f for f, _ in self._window) / len(self._window)
+            slow_rate = sum(s for _, s in self._window) / len(self._window)
+            if failure_rate >= Config.LLM_BREAKER_FAILURE_RATE:
+                self._open(now, f"{failure_rate:.0%} of the last {len(self._window)} calls failed")
+            elif slow_rate >= Config.LLM_BREAKER_SLOW_RATE:
+                self._open(now, f"{slow_rate:.0%} of the last {len(self._window)} calls were slow")
+
+    def release(self, probe: bool) -> None:
+        """Give back a probe slot for a call that ended without an outcome (cancelled)."""
+        if probe:
+            with self._lock:
+                self._probes = max(0, self._probes - 1)
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            self._refresh(time.monotonic())
+            window = len(self._window)
+            return {
+                "state": self.state,
+                "state_code": self._STATE_CODES[self.state],
+                "calls": self.calls,
+                "failures": self.failures,
+                "rate_limited": self.rate_limited,
+                "rejected": self.rejected,
+                "trips": self.trips,
+                "window_failure_rate": round(sum(f for f, _ in self._window) / window, 4) if window else 0.0,
+                "window_slow_rate": round(sum(s for _, s in self._window) / window, 4) if window else 0.0,
+                "last_error": self.last_error,
+            }
+
+
+_circuit_breakers: Dict[str, CircuitBreaker] = {}
+_circuit_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(name: str) -> CircuitBreaker:
+    if name not in _circuit_breakers:
+        with _circuit_breakers_lock:
+            _circuit_breakers.setdefault(name, CircuitBreaker(name))
+    return _circuit_breakers[name]
+
+
+class _CircuitBreakerMixin:
+    """Route every provider call through the ``provider`` circuit breaker.
+
+    Sits below single-flight, so a coalesced call counts once. Streamed calls
+    are judged by their time to the first chunk. Calls cancelled by a deadline
+    or a lost hedge reach here once their last single-flight caller leaves;
+    they count only when they were already slow, otherwise a probe slot is
+    given back.
+    """
+
+    provider: ClassVar[str] = "llm"
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        breaker = get_circuit_breaker(self.provider)
+        probe = breaker.acquire()
+        started = time.monotonic()
+        try:
+            result = await super()._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+        except Exception as e:
+            breaker.record(probe, time.monotonic() - started, e)
+            raise
+        except BaseException:
+            self._record_cancelled(breaker, probe, time.monotonic() - started)
+            raise
+        breaker.record(probe, time.monotonic() - started)
+        return result
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        breaker = get_circuit_breaker(self.provider)
+        probe = breaker.acquire()
+        started = time.monotonic()
+        first_chunk = None
+        try:
+            async for chunk in super()._astream(messages, stop=stop, run_manager=run_manager, **kwargs):
+                if first_chunk is None:
+                    first_chunk = time.monotonic() - started
+                yield chunk
+        except Exception as e:
+            breaker.record(probe, first_chunk if first_chunk is not None else time.monotonic() - started, e)
+            raise
+        except BaseException:
+            elapsed = first_chunk if first_chunk is not None else time.monotonic() - started
+            self._record_cancelled(breaker, probe, elapsed)
+            raise
+        breaker.record(probe, first_chunk if first_chunk is not None else time.monotonic() - started)
+
+    @staticmethod
+    def _record_cancelled(breaker: CircuitBreaker, probe: bool, elapsed: float) -> None:
+        if elapsed >= Config.LLM_BREAKER_SLOW_CALL_SECONDS:
+            breaker.record(probe, elapsed)
+        else:
+            breaker.release(probe)
+
+
+def get_llm_breaker_stats() -> Dict[str, Dict[str, object]]:
+    """Circuit breaker state and window rates, per provider."""
+    return {name: breaker.stats() for name, breaker in list(_circuit_breakers.items())}
+
+
+def get_llm_breaker_gauges() -> Dict[str, float]:
+    """``get_llm_breaker_stats`` flattened to numbers (state as 0 closed / 1 half-open / 2 open)."""
+    return {
+        f"{name}_{key}": value
+        for name, stats in get_llm_breaker_stats().items()
+        for key, value in stats.items()
+        if isinstance(value, (int, float))
+    }
+
+
+# ============================================================
+# LLM Admission Control (per-provider budgets, priority classes)
+# ============================================================
+
+# Most important first: the customer-visible answer, then routing / input
+# processing, then memory extraction, then admin BI. Untagged calls count as
+# "answer" — they are on some user's turn.
+LLM_PRIORITIES = ("answer", "router", "memory", "admin")
+_PRIORITY_TAG_PREFIX = "llm_priority:"
+
+# Set by HedgedChatModel, whose inner provider calls get no run manager
+_call_priority: ContextVar[Optional[str]] = ContextVar("llm_call_priority", default=None)
+
+
+def llm_priority(runnable, priority: str):
+    """Tag ``runnable`` so the LLM calls inside it are admitted as ``priority``."""
+    if priority not in LLM_PRIORITIES:
+        raise ValueError(f"Unknown LLM priority '{priority}' (expected one of {LLM_PRIORITIES})")
+    return runnable.with_config(tags=[f"{_PRIORITY_TAG_PREFIX}{priority}"])
+
+
+def _resolve_priority(run_manager) -> str:
+    """Priority class of a call, from its run tags (the most important one wins)."""
+    tags = getattr(run_manager, "tags", None) or ()
+    if FINAL_ANSWER_TAG in tags:
+        return "answer"
+    found = [
+        tag[len(_PRIORITY_TAG_PREFIX):] for tag in tags
+        if tag.startswith(_PRIORITY_TAG_PREFIX) and tag[len(_PRIORITY_TAG_PREFIX):] in LLM_PRIORITIES
+    ]
+    if found:
+        return min(found, key=LLM_PRIORITIES.index)
+    return _call_priority.get() or "answer"
+
+
+def _estimate_tokens(messages, kwargs) -> int:
+    """Rough prompt + completion size (4 chars per token) charged before the call."""
+    chars = sum(len(m.content if isinstance(m.content, str) else str(m.content)) for m in messages)
+    if kwargs.get("tools"):
+        chars += len(json.dumps(kwargs["tools"], default=str))
+    expected_output = kwargs.get("max_tokens") or Config.LLM_ADMISSION_EXPECTED_OUTPUT_TOKENS
+    return chars // 4 + expected_output
+
+
+class TokenBucket:
+    """``per_minute`` units refilled evenly over a minute (``per_minute`` <= 0: unlimited).
+
+    Callers check against a ``reserve`` — the share of the bucket kept for
+    higher priority classes. The level may go negative when a call turns out
+    bigger than estimated.
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute or 0)
+        self.level = self.capacity
+        self._updated = time.monotonic()
+
+    @property
+    def unlimited(self) -> bool:
+        return self.capacity <= 0
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.capacity / 60.0)
+        self._updated = now
+
+    def wait_time(self, amount: float, reserve: float, now: float) -> float:
+        """Seconds until ``amount`` can be taken without dipping into ``reserve`` (0 = now)."""
+        if self.unlimited:
+            return 0.0
+        self._refill(now)
+        floor = reserve * self.capacity
+        needed = min(amount, self.capacity - floor)  # a prompt bigger than the budget still gets through
+        deficit = floor + needed - self.level
+        return max(0.0, deficit * 60.0 / self.capacity)
+
+    def take(self, amount: float) -> None:
+        if not self.unlimited:
+            self.level = max(-self.capacity, self.level - amount)
+
+    def give_back(self, amount: float) -> None:
+        if not self.unlimited:
+            self.level = min(self.capacity, self.level + amount)
+
+
+class ProviderAdmission:
+    """Request and token budgets of one provider, shared by all callers in a priority queue.
+
+    The budgets are per process — not shared across workers — so each worker
+    should get its share of the provider plan (``LLM_REQUESTS_PER_MINUTE`` etc.).
+
+    Only the head of the queue (highest priority, then arrival order) may
+    take from the buckets, and each class may only use the part of a bucket
+    above its ``LLM_ADMISSION_RESERVE`` — so when a provider runs short,
+    admin and memory calls wait first. A call is shed with ``LLMOverloaded``
+    once it would wait longer than its class's
+    ``LLM_ADMISSION_MAX_WAIT_SECONDS`` — or, when another provider can take
+    it (``failover``), longer than ``LLM_ADMISSION_FAILOVER_WAIT_SECONDS``,
+    whatever its class, so the fallback or hedge serves it instead.
+    """
+
+    def __init__(self, name: str, requests_per_minute: int = 0, tokens_per_minute: int = 0):
+        self.name = name
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self._queue: List[Tuple[int, int]] = []
+        self._seq = itertools.count()
+        self.admitted = {priority: 0 for priority in LLM_PRIORITIES}
+        self.shed = {priority: 0 for priority in LLM_PRIORITIES}
+        self.failed_over = {priority: 0 for priority in LLM_PRIORITIES}
+        self.waited = {priority: 0.0 for priority in LLM_PRIORITIES}
+
+    def _wait_time(self, tokens: int, reserve: float, now: float) -> float:
+        return max(self.requests.wait_time(1, reserve, now), self.tokens.wait_time(tokens, reserve, now))
+
+    async def acquire(self, priority: str, tokens: int, failover: bool = False) -> None:
+        """Wait until a call of ``priority`` costing ``tokens`` may go out (or raise ``LLMOverloaded``).
+
+        ``failover``: another provider can serve the call, so only queue briefly.
+        """
+        reserve = Config.LLM_ADMISSION_RESERVE.get(priority, 0.0)
+        if failover:
+            max_wait = Config.LLM_ADMISSION_FAILOVER_WAIT_SECONDS
+        else:
+            max_wait = Config.LLM_ADMISSION_MAX_WAIT_SECONDS.get(priority)
+        entry = (LLM_PRIORITIES.index(priority), next(self._seq))
+        heapq.heappush(self._queue, entry)
+        started = time.monotonic()
+        try:
+            while True:
+                now = time.monotonic()
+                head = self._queue[0] == entry
+                wait = self._wait_time(tokens, reserve, now) if head else Config.LLM_ADMISSION_POLL_SECONDS
+                if head and wait <= 0:
+                    self.requests.take(1)
+                    self.tokens.take(tokens)
+                    self.admitted[priority] += 1
+                    self.waited[priority] += now - started
+                    return
+                if max_wait is not None and (now - started) + (wait if head else 0.0) > max_wait:
+                    (self.failed_over if failover else self.shed)[priority] += 1
+                    raise LLMOverloaded(
+                        f"LLM provider {self.name} is at its rate budget — "
+                        f"{'failing over' if failover else 'shed'} {priority} call after {now - started:.2f}s"
+                    )
+                await asyncio.sleep(min(wait, Config.LLM_ADMISSION_POLL_SECONDS))
+        finally:
+            if entry in self._queue:
+                self._queue.remove(entry)
+                heapq.heapify(self._queue)
+
+    def settle(self, estimated: int, actual: Optional[int]) -> None:
+        """Correct the token bucket once the provider reported the real usage."""
+        if actual is not None:
+            self.tokens.take(actual - estimated)
+
+    def refund(self, tokens: int) -> None:
+        """Return the budget of a call that never reached the provider."""
+        self.requests.give_back(1)
+        self.tokens.give_back(tokens)
+
+    def stats(self) -> Dict[str, float]:
+        now = time.monotonic()
+        self.requests.wait_time(0, 0.0, now)  # refill before reporting the levels
+        self.tokens.wait_time(0, 0.0, now)
+        out = {
+            "queued": len(self._queue),
+            "requests_available": round(self.requests.level, 2) if not self.requests.unlimited else -1,
+            "tokens_available": round(self.tokens.level) if not self.tokens.unlimited else -1,
+        }
+        for priority in LLM_PRIORITIES:
+            admitted = self.admitted[priority]
+            out[f"{priority}_admitted"] = admitted
+            out[f"{priority}_shed"] = self.shed[priority]
+            out[f"{priority}_failed_over"] = self.failed_over[priority]
+            out[f"{priority}_avg_wait_ms"] = round(self.waited[priority] / admitted * 1000, 1) if admitted else 0.0
+        return out
+
+
+_provider_admission: Dict[str, ProviderAdmission] = {}
+_provider_admission_lock = threading.Lock()
+
+
+def get_provider_admission(name: str) -> ProviderAdmission:
+    if name not in _provider_admission:
+        with _provider_admission_lock:
+            _provider_admission.setdefault(name, ProviderAdmission(
+                name,
+                requests_per_minute=Config.LLM_REQUESTS_PER_MINUTE.get(name, 0),
+                tokens_per_minute=Config.LLM_TOKENS_PER_MINUTE.get(name, 0),
+            ))
+    return _provider_admission[name]
+
+
+def _usage_tokens(message) -> Optional[int]:
+    usage = getattr(message, "usage_metadata", None)
+    return usage.get("total_tokens") if usage else None
+
+
+class _AdmissionMixin:
+    """Admit every provider call through ``ProviderAdmission`` before it is sent.
+
+    Sits above the circuit breaker: time spent queued is not provider latency,
+    and a call the breaker rejects gets its budget back. Models built with
+    ``admission_failover=True`` (a field ``_provider_class`` adds) have another
+    provider behind them and give up on a full budget quickly instead of queueing.
+    """
+
+    provider: ClassVar[str] = "llm"
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        generate = super()._agenerate
+        if not Config.LLM_ADMISSION_ENABLED:
+            return await generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+
+        admission = get_provider_admission(self.provider)
+        estimate = _estimate_tokens(messages, kwargs)
+        await admission.acquire(_resolve_priority(run_manager), estimate, failover=self.admission_failover)
+        try:
+            result = await generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+        except ProviderUnavailable:
+            admission.refund(estimate)
+            raise
+        admission.settle(estimate, _usage_tokens(result.generations[0].message) if result.generations else None)
+        return result
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        stream = super()._astream
+        if not Config.LLM_ADMISSION_ENABLED:
+            async for chunk in stream(messages, stop=stop, run_manager=run_manager, **kwargs):
+                yield chunk
+            return
+
+        admission = get_provider_admission(self.provider)
+        estimate = _estimate_tokens(messages, kwargs)
+        await admission.acquire(_resolve_priority(run_manager), estimate, failover=self.admission_failover)
+        used = None
+        try:
+            async for chunk in stream(messages, stop=stop, run_manager=run_manager, **kwargs):
+                tokens = _usage_tokens(chunk.message)
+                if tokens is not None:
+                    used = (used or 0) + tokens
+                yield chunk
+        except ProviderUnavailable:
+            admission.refund(estimate)
+            raise
+        admission.settle(estimate, used)
+
+
+def get_llm_admission_stats() -> Dict[str, float]:
+    """Queue depth, remaining budget and per-priority admitted / shed counts, per provider."""
+    stats: Dict[str, float] = {}
+    for name, admission in list(_provider_admission.items()):
+        stats.update({f"{name}_{key}": value for key, value in admission.stats().items()})
+    return stats
+
+
+_provider_classes: Dict[Tuple[type, str], type] = {}
+
+
+def _provider_class(cls, provider: str):
+    """``cls`` with single-flight coalescing, admission control and the ``provider`` circuit breaker.
+
+    Non chat-model factories are returned as-is.
+    """
+    if not (isinstance(cls, type) and issubclass(cls, BaseChatModel)):
+        return cls
+    key = (cls, provider)
+    if key not in _provider_classes:
+        namespace = {
+            "__annotations__": {"provider": ClassVar[str], "admission_failover": bool},
+            "provider": provider,
+            "admission_failover": False,
+        }
+        if cls._astream is BaseChatModel._astream and cls._stream is BaseChatModel._stream:
+            # Keep LangChain's "streaming not implemented" check true for non-streaming models
+            namespace["_astream"] = BaseChatModel._astream
+        _provider_classes[key] = type(
+            f"Managed{cls.__name__}",
+            (_SingleFlightMixin, _AdmissionMixin, _CircuitBreakerMixin, cls),
+            namespace,
+        )
+    return _provider_classes[key]
+
+
+# ============================================================
+# LLM Request Hedging (primary vs. secondary provider)
+# ============================================================
+
+class ProviderLatency:
+    """Rolling latency samples and call counters of one LLM provider.
+
+    Two windows are kept: time to the first chunk of streamed calls and total
+    time of non-streamed calls — they hedge against different thresholds.
+    """
+
+    KINDS = ("first_token", "complete")
+
+    def __init__(self, name: str, window: int = None):
+        self.name = name
+        window = window or Config.LLM_LATENCY_WINDOW
+        self._samples = {kind: deque(maxlen=window) for kind in self.KINDS}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.errors = 0
+        self.hedge_wins = 0
+
+    def observe(self, kind: str, seconds: float) -> None:
+        with self._lock:
+            self._samples[kind].append(seconds)
+
+    def record_call(self, ok: bool, hedge_win: bool = False) -> None:
+        with self._lock:
+            self.calls += 1
+            self.errors += 0 if ok else 1
+            self.hedge_wins += 1 if hedge_win else 0
+
+    def quantile(self, kind: str, q: float, min_samples: int = None) -> Optional[float]:
+        """``q`` quantile of the ``kind`` window, or None below ``min_samples``."""
+        with self._lock:
+            samples = sorted(self._samples[kind])
+        needed = Config.LLM_HEDGE_MIN_SAMPLES if min_samples is None else min_samples
+        if not samples or len(samples) < needed:
+            return None
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+    def stats(self) -> Dict[str, float]:
+        out = {"calls": self.calls, "errors": self.errors, "hedge_wins": self.hedge_wins}
+        for kind in self.KINDS:
+            for q in (0.5, 0.9):
+                value = self.quantile(kind, q, min_samples=1)
+                out[f"{kind}_p{int(q * 100)}_ms"] = round(value * 1000, 1) if value is not None else 0.0
+        return out
+
+
+class HedgeBudget:
+    """Caps the share of calls that fire a hedge over the last ``window`` calls."""
+
+    def __init__(self, max_rate: float = None, window: int = None):
+        self.max_rate = max_rate if max_rate is not None else Config.LLM_HEDGE_MAX_RATE
+        self._recent = deque(maxlen=window or Config.LLM_LATENCY_WINDOW)
+        self._lock = threading.Lock()
+        self.hedged = 0
+        self.denied = 0
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            allowed = sum(self._recent) + 1 <= self.max_rate * (len(self._recent) + 1)
+            if allowed:
+                self.hedged += 1
+            else:
+                self.denied += 1
+            return allowed
+
+    def record(self, hedged: bool) -> None:
+        with self._lock:
+            self._recent.append(hedged)
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "hedged": self.hedged,
+                "denied": self.denied,
+                "hedge_rate": round(sum(self._recent) / len(self._recent), 4) if self._recent else 0.0,
+            }
+
+
+_provider_latency: Dict[str, ProviderLatency] = {}
+_provider_latency_lock = threading.Lock()
+_hedge_budget = HedgeBudget()
+
+
+def get_provider_latency(name: str) -> ProviderLatency:
+    if name not in _provider_latency:
+        with _provider_latency_lock:
+            _provider_latency.setdefault(name, ProviderLatency(name))
+    return _provider_latency[name]
+
+
+def _hedge_delay(provider: ProviderLatency, kind: str) -> float:
+    """Seconds to wait on the primary before hedging: its tracked quantile, floored."""
+    threshold = provider.quantile(kind, Config.LLM_HEDGE_QUANTILE)
+    if threshold is None:
+        return Config.LLM_HEDGE_INITIAL_DELAY_SECONDS
+    return max(threshold, Config.LLM_HEDGE_MIN_DELAY_SECONDS)
+
+
+def _retrieve(task: asyncio.Task) -> None:
+    if not task.cancelled():
+        task.exception()  # losers may fail after the race is decided
+
+
+class HedgedChatModel(BaseChatModel):
+    """A primary chat model raced against a secondary once the primary runs slow.
+
+    The secondary fires only when the primary has not answered — or, when
+    streaming, produced its first chunk — within its tracked p90 (see
+    ``_hedge_delay``), and only while ``HedgeBudget`` allows. The first to
+    finish wins and the other is cancelled. A failing primary falls back to
+    the secondary, as ``with_fallbacks`` did.
+    """
+
+    primary: BaseChatModel
+    secondary: BaseChatModel
+    primary_name: str = "primary"
+    secondary_name: str = "secondary"
+
+    @property
+    def _llm_type(self) -> str:
+        return "hedged"
+
+    @property
+    def _identifying_params(self) -> Dict:
+        return {
+            self.primary_name: self.primary._identifying_params,
+            self.secondary_name: self.secondary._identifying_params,
+        }
+
+    def bind_tools(self, tools, **kwargs):
+        # The primary formats the tools; both providers take the OpenAI tool schema
+        return self.bind(**self.primary.bind_tools(tools, **kwargs).kwargs)
+
+    async def _race(self, kind: str, start) -> Tuple[str, object]:
+        """Await ``start(model)`` on the primary, hedging onto the secondary when it runs slow.
+
+        While the primary's breaker is open the secondary goes first instead.
+        Returns the winning provider's name and result.
+        """
+        models = {self.primary_name: self.primary, self.secondary_name: self.secondary}
+        tasks: Dict[asyncio.Task, Tuple[str, float]] = {}
+
+        def launch(name: str) -> None:
+            task = asyncio.ensure_future(start(models[name]))
+            task.add_done_callback(_retrieve)
+            tasks[task] = (name, time.monotonic())
+
+        first, second = self.primary_name, self.secondary_name
+        if not get_circuit_breaker(first).available() and get_circuit_breaker(second).available():
+            first, second = second, first  # prefer the healthy provider; no hedging onto an open breaker
+
+        delay = _hedge_delay(get_provider_latency(first), kind)
+        hedged, error = False, None
+        launch(first)
+        try:
+            done, _ = await asyncio.wait(set(tasks), timeout=delay)
+            if not done and get_circuit_breaker(second).available() and _hedge_budget.try_acquire():
+                hedged = True
+                logger.info(f"Hedging LLM call: {first} slower than {delay:.2f}s, firing {second}")
+                launch(second)
+
+            while tasks:
+                done, _ = await asyncio.wait(set(tasks), return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    name, started = tasks.pop(task)
+                    provider = get_provider_latency(name)
+                    if task.exception() is None:
+                        provider.observe(kind, time.monotonic() - started)
+                        provider.record_call(True, hedge_win=hedged)
+                        return name, task.result()
+                    provider.record_call(False)
+                    error = error or task.exception()
+                    logger.warning(f"LLM provider {name} failed: {task.exception()}")
+                    if name == first and not hedged:
+                        launch(second)  # plain fallback, not counted as a hedge
+            raise error
+        finally:
+            for task, (name, started) in tasks.items():
+                if not task.done():
+                    task.cancel()
+                    # Censored sample: the loser took at least this long
+                    get_provider_latency(name).observe(kind, time.monotonic() - started)
+            _hedge_budget.record(hedged)
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        # Inner calls get no run manager — only the outer run reports to callbacks —
+        # so their admission priority travels in a context variable
+        token = _call_priority.set(_resolve_priority(run_manager))
+        try:
+            _, result = await self._race(
+                "complete", lambda model: model._agenerate(messages, stop=stop, **kwargs)
+            )
+        finally:
+            _call_priority.reset(token)
+        return result
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        async def first_chunk(model):
+            stream = model._astream(messages, stop=stop, **kwargs)
+            try:
+                return stream, await stream.__anext__()
+            except StopAsyncIteration:
+                return stream, None
+
+        token = _call_priority.set(_resolve_priority(run_manager))
+        try:
+            _, (stream, chunk) = await self._race("first_token", first_chunk)
+        finally:
+            _call_priority.reset(token)
+        if chunk is None:
+            return
+        yield chunk
+        async for chunk in stream:
+            yield chunk
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        # Sync callers get plain fallback; hedging needs the event loop
+        try:
+            return self.primary._generate(messages, stop=stop, **kwargs)
+        except Exception as e:
+            logger.warning(f"LLM provider {self.primary_name} failed: {e}")
+            return self.secondary._generate(messages, stop=stop, **kwargs)
+
+
+def get_llm_hedging_stats() -> Dict[str, float]:
+    """Hedge counters and per-provider latency quantiles (flat, for the gauges)."""
+    stats = dict(_hedge_budget.stats())
+    for name, provider in list(_provider_latency.items()):
+        stats.update({f"{name}_{key}": value for key, value in provider.stats().items()})
+    return stats
+
+
 # ============================================================
 # LLM Configuration (with connection pooling)
 # ============================================================
@@ -148,15 +1134,17 @@ class LLMPool:
 
                     # Option A: Groq as Primary (Preferred for speed/limits)
                     if has_groq:
-                        groq_llm = ChatGroq(
+                        groq_llm = _provider_class(ChatGroq, "groq")(
                             model=Config.GROQ_MODEL,
                             groq_api_key=Config.GROQ_API_KEY,
                             temperature=temperature,
-                            timeout=Config.LLM_TIMEOUT_SECONDS
+                            timeout=Config.LLM_TIMEOUT_SECONDS,
+                            # Over Groq's budget, hand the call to OpenRouter rather than queue
+                            admission_failover=has_openrouter,
                         )
                         # OpenRouter as Fallback for Groq
                         if has_openrouter:
-                            or_fallback = ChatOpenAI(
+                            or_fallback = _provider_class(ChatOpenAI, "openrouter")(
                                 model=model_name,
                                 openai_api_key=Config.OPENROUTER_API_KEY,
                                 openai_api_base=Config.OPENROUTER_BASE_URL,
@@ -164,13 +1152,19 @@ class LLMPool:
                                 timeout=Config.LLM_TIMEOUT_SECONDS,
                                 default_headers={"HTTP-Referer": Config.APP_URL, "X-Title": Config.APP_NAME}
                             )
-                            LLMPool._models[key] = groq_llm.with_fallbacks([or_fallback])
+                            if Config.LLM_HEDGING_ENABLED:
+                                LLMPool._models[key] = HedgedChatModel(
+                                    primary=groq_llm, secondary=or_fallback,
+                                    primary_name="groq", secondary_name="openrouter",
+                                )
+                            else:
+                                LLMPool._models[key] = groq_llm.with_fallbacks([or_fallback])
                         else:
                             LLMPool._models[key] = groq_llm
                     
                     # Option B: OpenRouter as Primary (Fallback if no Groq key)
                     elif has_openrouter:
-                        LLMPool._models[key] = ChatOpenAI(
+                        LLMPool._models[key] = _provider_class(ChatOpenAI, "openrouter")(
                             model=model_name,
                             openai_api_key=Config.OPENROUTER_API_KEY,
                             openai_api_base=Config.OPENROUTER_BASE_URL,
@@ -212,16 +1206,297 @@ llm = get_model()  # Default large instance
 small_llm = get_small_model() # Default small instance
 
 
+# Chains whose tokens are the user-facing answer carry this tag; /chat/stream
+# forwards only their chunks (structured-output and routing calls stay hidden).
+FINAL_ANSWER_TAG = "final_answer"
+
+
+def final_answer(runnable):
+    """Tag ``runnable`` (and the chat model inside it) as producing the final answer."""
+    return runnable.with_config(tags=[FINAL_ANSWER_TAG])
+
+
+# ============================================================
+# Embedding Vector Cache (LRU + TTL, optional on-disk tier)
+# ============================================================
+
+_WS_RE = re.compile(r"\s+")
+
+
+def normalize_embedding_text(text: str) -> str:
+    """Cache key normalisation — case-fold and collapse whitespace."""
+    return _WS_RE.sub(" ", (text or "").casefold()).strip()
+
+
+class EmbeddingCache:
+    """Bounded in-memory LRU of embedding vectors keyed by (model, normalised text).
+
+    Vectors are stored as packed float32 arrays; the LRU evicts by total byte
+    size rather than entry count. Entries expire after ``ttl_seconds``. When
+    ``persist_path`` is set, vectors are also written to a SQLite file and
+    promoted back into memory on a cold hit (survives restarts / --reload).
+    The file runs in WAL mode and writes are committed in batches (every
+    ``COMMIT_EVERY`` writes or ``COMMIT_INTERVAL_SECONDS``, and at exit); a
+    crash loses at most the last batch. ``aget`` / ``aput`` do the SQLite work
+    in a worker thread so the event loop never waits on disk.
+    """
+
+    COMMIT_EVERY = 32
+    COMMIT_INTERVAL_SECONDS = 5.0
+
+    def __init__(self, max_bytes: int = None, ttl_seconds: int = None, persist_path: str = None):
+        self.max_bytes = max_bytes if max_bytes is not None else Config.EMBEDDING_CACHE_MAX_BYTES
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else Config.EMBEDDING_CACHE_TTL_SECONDS
+        self.persist_path = persist_path if persist_path is not None else Config.EMBEDDING_CACHE_PATH
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[array, float]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()  # disk tier only — memory hits never wait on it
+        self._pending = 0
+        self._committed_at = time.monotonic()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if self.persist_path:
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(self.persist_path)), exist_ok=True)
+                self._db = sqlite3.connect(self.persist_path, check_same_thread=False)
+                self._db.execute("PRAGMA journal_mode=WAL")
+                self._db.execute("PRAGMA synchronous=NORMAL")
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS embeddings ("
+                    "model TEXT NOT NULL, text TEXT NOT NULL, vector BLOB NOT NULL, "
+                    "created_at REAL NOT NULL, PRIMARY KEY (model, text))"
+                )
+                self._db.commit()
+                atexit.register(self.flush)
+                logger.info(f"Embedding cache disk tier enabled at {self.persist_path}")
+            except Exception as e:
+                logger.warning(f"Embedding cache disk tier unavailable ({e}) — memory only")
+                self._db = None
+
+    @staticmethod
+    def _entry_size(key: Tuple[str, str], vector: array) -> int:
+        return len(vector) * vector.itemsize + len(key[0]) + len(key[1])
+
+    def _expired(self, created_at: float) -> bool:
+        return bool(self.ttl_seconds) and (time.time() - created_at) > self.ttl_seconds
+
+    def _store(self, key: Tuple[str, str], vector: array, created_at: float) -> None:
+        """Insert into the memory tier and evict LRU entries over budget. Caller holds the lock."""
+        if key in self._entries:
+            self._bytes -= self._entry_size(key, self._entries.pop(key)[0])
+        size = self._entry_size(key, vector)
+        if size > self.max_bytes:
+            return
+        self._entries[key] = (vector, created_at)
+        self._bytes += size
+        while self._bytes > self.max_bytes and self._entries:
+            old_key, (old_vec, _) = self._entries.popitem(last=False)
+            self._bytes -= self._entry_size(old_key, old_vec)
+            self.evictions += 1
+
+    def _get_memory(self, key: Tuple[str, str]) -> Optional[List[float]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            vector, created_at = entry
+            if not self._expired(created_at):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return vector.tolist()
+            self._bytes -= self._entry_size(key, vector)
+            del self._entries[key]
+            return None
+
+    def _get_disk(self, key: Tuple[str, str]) -> Optional[List[float]]:
+        """Read ``key`` from the disk tier and promote it into memory (blocking)."""
+        try:
+            with self._db_lock:
+                row = self._db.execute(
+                    "SELECT vector, created_at FROM embeddings WHERE model = ? AND text = ?", key
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Embedding cache disk read failed: {e}")
+            return None
+        if row is None or self._expired(row[1]):
+            return None
+        vector = array("f")
+        vector.frombytes(row[0])
+        with self._lock:
+            self._store(key, vector, row[1])
+            self.disk_hits += 1
+        return vector.tolist()
+
+    def _miss(self) -> None:
+        with self._lock:
+            self.misses += 1
+
+    def get(self, model: str, text: str) -> Optional[List[float]]:
+        key = (model, normalize_embedding_text(text))
+        vector = self._get_memory(key)
+        if vector is None and self._db is not None:
+            vector = self._get_disk(key)
+        if vector is None:
+            self._miss()
+        return vector
+
+    async def aget(self, model: str, text: str) -> Optional[List[float]]:
+        """``get`` with the disk read (memory misses only) off the event loop."""
+        return (await self.aget_many(model, [text]))[0]
+
+    async def aget_many(self, model: str, texts: List[str]) -> List[Optional[List[float]]]:
+        """``aget`` for a batch: memory misses are read from disk in one worker-thread hop."""
+        keys = [(model, normalize_embedding_text(t)) for t in texts]
+        vectors = [self._get_memory(key) for key in keys]
+        cold = [i for i, v in enumerate(vectors) if v is None]
+        if cold and self._db is not None:
+            found = await asyncio.to_thread(lambda: [self._get_disk(keys[i]) for i in cold])
+            for i, vector in zip(cold, found):
+                vectors[i] = vector
+        for vector in vectors:
+            if vector is None:
+                self._miss()
+        return vectors
+
+    def _write_disk(self, key: Tuple[str, str], packed: array, created_at: float) -> None:
+        """Write one vector to the disk tier, committing once a batch is due (blocking)."""
+        try:
+            with self._db_lock:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO embeddings (model, text, vector, created_at) VALUES (?, ?, ?, ?)",
+                    (key[0], key[1], packed.tobytes(), created_at),
+                )
+                self._pending += 1
+                if (
+                    self._pending >= self.COMMIT_EVERY
+                    or time.monotonic() - self._committed_at >= self.COMMIT_INTERVAL_SECONDS
+                ):
+                    self._commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Embedding cache disk write failed: {e}")
+
+    def _commit(self) -> None:
+        """Commit pending disk writes. Caller holds the disk lock."""
+        self._db.commit()
+        self._pending = 0
+        self._committed_at = time.monotonic()
+
+    def flush(self) -> None:
+        """Commit any pending disk writes."""
+        if self._db is None:
+            return
+        try:
+            with self._db_lock:
+                if self._pending:
+                    self._commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Embedding cache disk flush failed: {e}")
+
+    def _put_memory(self, model: str, text: str, vector: List[float]) -> Tuple[Tuple[str, str], array, float]:
+        key = (model, normalize_embedding_text(text))
+        packed = array("f", vector)
+        now = time.time()
+        with self._lock:
+            self._store(key, packed, now)
+        return key, packed, now
+
+    def put(self, model: str, text: str, vector: List[float]) -> None:
+        entry = self._put_memory(model, text, vector)
+        if self._db is not None:
+            self._write_disk(*entry)
+
+    async def aput(self, model: str, text: str, vector: List[float]) -> None:
+        """``put`` with the disk write off the event loop."""
+        entry = self._put_memory(model, text, vector)
+        if self._db is not None:
+            await asyncio.to_thread(self._write_disk, *entry)
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+            }
+
+    def clear(self) -> None:
+        """Drop the memory tier (the disk tier is kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+class CachedEmbeddings(Embeddings):
+    """Embeddings wrapper that serves repeated texts from an EmbeddingCache.
+
+    Batches only send the cache misses to the underlying model, in one call.
+    """
+
+    def __init__(self, model: Embeddings, model_name: str, cache: EmbeddingCache):
+        self.model = model
+        self.model_name = model_name
+        self.cache = cache
+
+    def embed_query(self, text: str) -> List[float]:
+        vector = self.cache.get(self.model_name, text)
+        if vector is None:
+            vector = self.model.embed_query(text)
+            self.cache.put(self.model_name, text, vector)
+        return vector
+
+    async def aembed_query(self, text: str) -> List[float]:
+        vector = await self.cache.aget(self.model_name, text)
+        if vector is None:
+            vector = await self.model.aembed_query(text)
+            await self.cache.aput(self.model_name, text, vector)
+        return vector
+
+    def _split(self, texts: List[str]) -> Tuple[List[Optional[List[float]]], List[int]]:
+        vectors = [self.cache.get(self.model_name, t) for t in texts]
+        return vectors, [i for i, v in enumerate(vectors) if v is None]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        vectors, missing = self._split(texts)
+        if missing:
+            fresh = self.model.embed_documents([texts[i] for i in missing])
+            for i, vector in zip(missing, fresh):
+                vectors[i] = vector
+                self.cache.put(self.model_name, texts[i], vector)
+        return vectors
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        vectors = await self.cache.aget_many(self.model_name, texts)
+        missing = [i for i, v in enumerate(vectors) if v is None]
+        if missing:
+            fresh = await self.model.aembed_documents([texts[i] for i in missing])
+            for i, vector in zip(missing, fresh):
+                vectors[i] = vector
+                await self.cache.aput(self.model_name, texts[i], vector)
+        return vectors
+
+
 # ============================================================
 # Embedding Model Configuration (with caching)
 # ============================================================
 
 class EmbeddingPool:
-    """Cached embedding model instances."""
+    """Cached embedding model instances, each fronted by a shared vector cache."""
 
     _instance = None
     _lock = threading.Lock()
     _models = {}
+    _cache: Optional[EmbeddingCache] = None
 
     def __new__(cls):
         if cls._instance is None:
@@ -238,21 +1513,31 @@ class EmbeddingPool:
         self._initialized = True
         logger.info("EmbeddingPool initialized")
 
-    def get_model(self, model_name: str = None) -> HuggingFaceEndpointEmbeddings:
-        """Get or create embedding model (cached)."""
+    @property
+    def cache(self) -> EmbeddingCache:
+        if EmbeddingPool._cache is None:
+            with self._lock:
+                if EmbeddingPool._cache is None:
+                    EmbeddingPool._cache = EmbeddingCache()
+        return EmbeddingPool._cache
+
+    def get_model(self, model_name: str = None) -> CachedEmbeddings:
+        """Get or create embedding model (cached). Backend chosen by EMBEDDING_BACKEND."""
         model_name = model_name or Config.EMBEDDING_MODEL
 
         if model_name in EmbeddingPool._models:
             logger.debug(f"Reusing cached embedding model: {model_name}")
             return EmbeddingPool._models[model_name]
 
+        cache = self.cache
         with self._lock:
             if model_name not in EmbeddingPool._models:
                 try:
                     logger.info(f"Creating embedding model: {model_name}")
-                    EmbeddingPool._models[model_name] = HuggingFaceEndpointEmbeddings(
-                        model=model_name,
-                        huggingfacehub_api_token=Config.HF_API_KEY
+                    EmbeddingPool._models[model_name] = CachedEmbeddings(
+                        create_embedder(model_name),
+                        model_name=embedder_cache_key(model_name),
+                        cache=cache,
                     )
                 except Exception as e:
                     logger.error(f"Failed to create embedding model {model_name}: {str(e)}")
@@ -262,19 +1547,26 @@ class EmbeddingPool:
 
     @classmethod
     def clear_cache(cls):
-        """Clear all cached embedding models."""
+        """Clear all cached embedding models and in-memory vectors."""
         cls._models.clear()
+        if cls._cache is not None:
+            cls._cache.clear()
         logger.info("Embedding cache cleared")
 
 
 _embedding_pool = EmbeddingPool()
 
 
-def get_embedding_model(model_name: str = None) -> HuggingFaceEndpointEmbeddings:
+def get_embedding_model(model_name: str = None) -> CachedEmbeddings:
     """Get embedding model from pool."""
     return _embedding_pool.get_model(model_name=model_name)
 
 
+def get_embedding_cache_stats() -> Dict[str, float]:
+    """Hit/miss counters and memory usage of the query-embedding cache."""
+    return _embedding_pool.cache.stats()
+
+
 # embedding_model is intentionally NOT initialised here.
 # Call get_embedding_model() at the point of use — lazy init on first request.
 # This prevents HuggingFace API latency / outages from blocking server startup.
@@ -125,3 +125,35 @@ create policy "Users can update own sessions"
   using (auth.jwt() ->> 'email' = user_email);
 
 
+-- ── Catalog version ───────────────────────────────────────────────────────────
+-- Bumped by scripts/seed_products.py and scripts/reseed_prices.py; API servers
+-- poll it and reload their in-memory catalog (and drop cached search results).
+
+create table if not exists coffee_shop_catalog_meta (
+  id          text         primary key,
+  version     bigint       not null default 0,
+  updated_at  timestamptz  not null default now()
+);
+
+insert into coffee_shop_catalog_meta (id, version)
+  values ('products', 0)
+  on conflict (id) do nothing;
+
+alter table coffee_shop_catalog_meta enable row level security;
+
+create policy "Public can read catalog version"
+  on coffee_shop_catalog_meta for select
+  using (true);
+
+create or replace function bump_coffee_catalog_version()
+returns bigint
+language sql
+as $$
+  insert into coffee_shop_catalog_meta (id, version, updated_at)
+    values ('products', 1, now())
+    on conflict (id) do update
+      set version = coffee_shop_catalog_meta.version + 1,
+          updated_at = now()
+  returning version;
+$$;
+
@@ -309,6 +309,14 @@ const Chatbot = () => {
                       return newMessages;
                     });
                   }
+                } else if (data.type === "replace") {
+                  // Final answer differs from the streamed tokens — overwrite the bubble
+                  setMessages((prev) => {
+                    const newMessages = [...prev];
+                    const lastMsgIndex = newMessages.length - 1;
+                    newMessages[lastMsgIndex] = { ...newMessages[lastMsgIndex], content: data.content };
+                    return newMessages;
+                  });
                 } else if (data.type === "interrupt") {
                   if (data.payload?.action === "order_confirmation" || data.payload?.action === "memory_validation") {
                     setIsTyping(false);